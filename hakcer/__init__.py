@@ -5,17 +5,52 @@ A pip-installable module for adding eye-catching animated banners to any Python
 Features 23+ different effects with customizable themes including Tokyo Night, Neon, and Cyberpunk.
 """
 
-from .banner import show_banner, list_effects, get_effects_by_speed, set_theme, list_themes, get_current_theme
+from .banner import (
+    show_banner,
+    show_banner_async,
+    start_banner,
+    BannerHandle,
+    list_effects,
+    get_effects_by_speed,
+    set_theme,
+    list_themes,
+    get_current_theme,
+    invalidate_effect_configs,
+    render_final,
+    estimate_duration,
+)
+from .art import preload_banners
+from .stats import BannerStats, LatencyHistogram
 from .themes import THEMES
 
 __version__ = "1.2.4"
 __author__ = "haKCer"
 __all__ = [
     "show_banner",
+    "show_banner_async",
+    "start_banner",
+    "BannerHandle",
     "list_effects",
     "get_effects_by_speed",
     "set_theme",
     "list_themes",
     "get_current_theme",
+    "invalidate_effect_configs",
+    "render_final",
+    "estimate_duration",
+    "record_banner",
+    "play_recording",
+    "preload_banners",
+    "BannerStats",
+    "LatencyHistogram",
     "THEMES",
 ]
+
+
+def __getattr__(name):
+    # Recording pulls in the benchmark harness, so it is only imported when used
+    if name in ("record_banner", "play_recording"):
+        from . import recording
+
+        return getattr(recording, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
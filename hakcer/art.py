@@ -0,0 +1,486 @@
+"""
+Loading, measuring and centering of banner art.
+
+Tools that show a banner repeatedly (on every REPL reset, say) would otherwise
+re-read the art file each time, which is slow on network home directories.
+Files are read once, normalized and kept in memory; later loads only stat the
+file and re-read it when its modification time or size changed.
+
+Art that does not fit the terminal, or a budget of characters, is cropped or
+downsampled before it reaches an effect, since effect cost grows with every
+character. Art is centered by its display width, so CJK and emoji lines (two cells per
+character) are centered correctly. Line widths are measured once per art and
+the centered result is kept per terminal width, which is itself cached until
+the terminal is resized. Effects only get the bounding box of the visible
+characters (see trim_art()); the centering offset is applied when drawing.
+"""
+
+import bisect
+import functools
+import math
+import mmap
+import os
+import re
+import shutil
+import signal
+import threading
+from pathlib import Path
+from typing import Optional, Sequence, Union
+
+# Files at least this large are read through mmap instead of read()
+MMAP_THRESHOLD = 64 * 1024
+
+# Absolute path -> (mtime in ns, size, normalized text)
+_art_cache: dict[str, tuple[int, int, str]] = {}
+
+# East Asian Wide and Fullwidth characters, which take two cells (Unicode 14,
+# with unassigned code points between wide ones folded into the ranges)
+_WIDE_RANGES = (
+    (0x1100, 0x115F), (0x231A, 0x231B), (0x2329, 0x232A), (0x23E9, 0x23EC),
+    (0x23F0, 0x23F0), (0x23F3, 0x23F3), (0x25FD, 0x25FE), (0x2614, 0x2615),
+    (0x2648, 0x2653), (0x267F, 0x267F), (0x2693, 0x2693), (0x26A1, 0x26A1),
+    (0x26AA, 0x26AB), (0x26BD, 0x26BE), (0x26C4, 0x26C5), (0x26CE, 0x26CE),
+    (0x26D4, 0x26D4), (0x26EA, 0x26EA), (0x26F2, 0x26F3), (0x26F5, 0x26F5),
+    (0x26FA, 0x26FA), (0x26FD, 0x26FD), (0x2705, 0x2705), (0x270A, 0x270B),
+    (0x2728, 0x2728), (0x274C, 0x274C), (0x274E, 0x274E), (0x2753, 0x2755),
+    (0x2757, 0x2757), (0x2795, 0x2797), (0x27B0, 0x27B0), (0x27BF, 0x27BF),
+    (0x2B1B, 0x2B1C), (0x2B50, 0x2B50), (0x2B55, 0x2B55), (0x2E80, 0x3029),
+    (0x302E, 0x303E), (0x3041, 0x3096), (0x309B, 0x3247), (0x3250, 0x4DBF),
+    (0x4E00, 0xA4C6), (0xA960, 0xA97C), (0xAC00, 0xD7A3), (0xF900, 0xFAD9),
+    (0xFE10, 0xFE19), (0xFE30, 0xFE6B), (0xFF01, 0xFF60), (0xFFE0, 0xFFE6),
+    (0x16FE0, 0x16FE3), (0x16FF0, 0x1B2FB), (0x1F004, 0x1F004), (0x1F0CF, 0x1F0CF),
+    (0x1F18E, 0x1F18E), (0x1F191, 0x1F19A), (0x1F200, 0x1F320), (0x1F32D, 0x1F335),
+    (0x1F337, 0x1F37C), (0x1F37E, 0x1F393), (0x1F3A0, 0x1F3CA), (0x1F3CF, 0x1F3D3),
+    (0x1F3E0, 0x1F3F0), (0x1F3F4, 0x1F3F4), (0x1F3F8, 0x1F43E), (0x1F440, 0x1F440),
+    (0x1F442, 0x1F4FC), (0x1F4FF, 0x1F53D), (0x1F54B, 0x1F54E), (0x1F550, 0x1F567),
+    (0x1F57A, 0x1F57A), (0x1F595, 0x1F596), (0x1F5A4, 0x1F5A4), (0x1F5FB, 0x1F64F),
+    (0x1F680, 0x1F6C5), (0x1F6CC, 0x1F6CC), (0x1F6D0, 0x1F6D2), (0x1F6D5, 0x1F6DF),
+    (0x1F6EB, 0x1F6EC), (0x1F6F4, 0x1F6FC), (0x1F7E0, 0x1F7F0), (0x1F90C, 0x1F93A),
+    (0x1F93C, 0x1F945), (0x1F947, 0x1F9FF), (0x1FA70, 0x1FAF6), (0x20000, 0x3134A),
+)
+
+# Combining marks, zero-width spaces, joiners and variation selectors, which take none
+_ZERO_WIDTH_RANGES = (
+    (0x0300, 0x036F), (0x0483, 0x0489), (0x0591, 0x05BD), (0x0610, 0x061A),
+    (0x064B, 0x065F), (0x1160, 0x11FF), (0x1AB0, 0x1AFF), (0x1DC0, 0x1DFF),
+    (0x200B, 0x200F), (0x202A, 0x202E), (0x2060, 0x2064), (0x20D0, 0x20FF),
+    (0xFE00, 0xFE0F), (0xFE20, 0xFE2F), (0xFEFF, 0xFEFF), (0xE0100, 0xE01EF),
+)
+
+_WIDTH_RANGES = sorted(
+    [(start, end, 2) for start, end in _WIDE_RANGES]
+    + [(start, end, 0) for start, end in _ZERO_WIDTH_RANGES]
+)
+_RANGE_STARTS = [start for start, _, _ in _WIDTH_RANGES]
+# Matches the characters that may not be one cell wide. Everything outside the
+# Basic Multilingual Plane is included so the class stays a fast lookup
+_UNEVEN_PATTERN = re.compile(
+    "["
+    + "".join(
+        f"{re.escape(chr(start))}-{re.escape(chr(end))}"
+        for start, end, _ in _WIDTH_RANGES
+        if end <= 0xFFFF
+    )
+    + "\U00010000-\U0010FFFF]"
+)
+
+FIT_MODES = ("crop", "downsample", "none")
+
+# Approximate ink coverage of glyphs, averaged when downsampling
+_DENSITY = {
+    " ": 0.0, "░": 0.25, "▒": 0.5, "▓": 0.75, "█": 1.0,
+    "▀": 0.5, "▄": 0.5, "▌": 0.5, "▐": 0.5,
+    ".": 0.15, ",": 0.15, "'": 0.1, "`": 0.1, "-": 0.2, "_": 0.2,
+    ":": 0.25, ";": 0.3, "=": 0.35, "+": 0.35, "*": 0.4,
+    "#": 0.8, "@": 0.85, "%": 0.7, "&": 0.7, "$": 0.7, "M": 0.75, "W": 0.75,
+}
+_DEFAULT_DENSITY = 0.5
+# Downsampled cells by increasing density
+_SHADES = " ░▒▓█"
+
+# Terminal size, valid until the next SIGWINCH
+_geometry: Optional[os.terminal_size] = None
+# SIGWINCH handler that was installed before ours, called after it
+_previous_handler = None
+
+
+def _normalize(text: str) -> str:
+    """Normalize line endings and strip trailing whitespace from each line."""
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return "\n".join(line.rstrip() for line in text.split("\n"))
+
+
+@functools.lru_cache(maxsize=4096)
+def char_width(char: str) -> int:
+    """
+    Get the number of terminal cells a character takes.
+
+    Args:
+        char: A single character.
+
+    Returns:
+        2 for wide characters, 0 for combining and zero-width ones, otherwise 1.
+    """
+    code = ord(char)
+    index = bisect.bisect_right(_RANGE_STARTS, code) - 1
+    if index >= 0:
+        _, end, width = _WIDTH_RANGES[index]
+        if code <= end:
+            return width
+    return 1
+
+
+def display_width(text: str) -> int:
+    """
+    Get the number of terminal cells a line of text takes.
+
+    Args:
+        text: Text without newlines.
+
+    Returns:
+        Display width in cells.
+    """
+    if text.isascii():
+        return len(text)
+    return len(text) + sum(char_width(char) - 1 for char in _UNEVEN_PATTERN.findall(text))
+
+
+@functools.lru_cache(maxsize=16)
+def _measure(text: str) -> tuple[tuple[str, ...], int]:
+    """Split art into rstripped lines and measure the widest."""
+    lines = tuple(line.rstrip() for line in text.split("\n"))
+    if text.isascii() or not _UNEVEN_PATTERN.search(text):
+        # Block art like the haKCer banner is one cell per character throughout
+        widths = map(len, lines)
+    else:
+        widths = map(display_width, lines)
+    return lines, max(widths, default=0)
+
+
+@functools.lru_cache(maxsize=16)
+def center_art(text: str, columns: int) -> str:
+    """
+    Center art horizontally.
+
+    Every line gets the same left padding, so the art keeps its shape while
+    its widest line is centered. Results are cached per art and width.
+
+    Args:
+        text: Art to center.
+        columns: Terminal width in cells.
+
+    Returns:
+        The art with trailing whitespace stripped and each line padded.
+    """
+    lines, _ = _measure(text)
+    padding = " " * center_offset(text, columns)
+    return "\n".join(padding + line for line in lines)
+
+
+def center_offset(text: str, columns: int, indent: int = 0) -> int:
+    """
+    Get the left padding that centers art.
+
+    Args:
+        text: Art to center.
+        columns: Terminal width in cells.
+        indent: Indentation trimmed off the art (see trim_art()). It is
+            centered along with the art, as long as the art stays on screen.
+
+    Returns:
+        Cells to the left of the art, 0 if it is as wide as the terminal or wider.
+    """
+    width = _measure(text)[1]
+    padding = max(0, (columns - indent - width) // 2) + indent
+    return min(padding, max(0, columns - width))
+
+
+@functools.lru_cache(maxsize=16)
+def trim_art(text: str) -> tuple[str, int, int]:
+    """
+    Cut art down to the bounding box of its visible characters.
+
+    Leading and trailing blank lines and the indentation all lines share
+    would otherwise become part of the effect's canvas, making every frame
+    larger. The offsets of the box are returned so the art can be put back
+    in place when it is drawn.
+
+    Args:
+        text: Art to trim.
+
+    Returns:
+        Tuple of (trimmed art, blank lines above it, columns of indentation).
+        Art without visible characters trims to ("", 0, 0).
+    """
+    # Tabs are expanded the way terminaltexteffects expands them
+    lines, _ = _measure(text.replace("\t", " " * 4))
+    visible = [index for index, line in enumerate(lines) if line]
+    if not visible:
+        return "", 0, 0
+    top, bottom = visible[0], visible[-1] + 1
+    lines = lines[top:bottom]
+    indent = min(len(line) - len(line.lstrip(" ")) for line in lines if line)
+    return "\n".join(line[indent:] for line in lines), top, indent
+
+
+def _ink(lines: Sequence[str]) -> int:
+    """Count the non-space characters, which is what effect cost grows with."""
+    return sum(len(line) - line.count(" ") for line in lines)
+
+
+def _cells(line: str) -> list[str]:
+    """
+    Split a line into what each terminal cell shows.
+
+    A wide character is followed by an empty string for its second cell, and
+    zero-width characters stay with the cell before them.
+    """
+    if line.isascii():
+        return list(line)
+    cells: list[str] = []
+    for char in line:
+        width = char_width(char)
+        if width == 0 and cells:
+            cells[-1] += char
+        else:
+            cells.append(char)
+            if width == 2:
+                cells.append("")
+    return cells
+
+
+def _crop(lines: Sequence[str], width: int, columns: int, rows: int) -> list[str]:
+    """Cut a centered window of columns x rows cells out of the art."""
+    left = (width - columns) // 2
+    top = (len(lines) - rows) // 2
+    cropped = []
+    for line in lines[top:top + rows]:
+        cells = _cells(line)
+        window = cells[left:left + columns]
+        # Wide characters cut in half by either edge become spaces
+        if window and window[0] == "":
+            window[0] = " "
+        if len(cells) > left + columns and cells[left + columns] == "":
+            window[-1] = " "
+        cropped.append("".join(window).rstrip())
+    return cropped
+
+
+def _densities(line: str, width: int) -> list[float]:
+    """Get the glyph density of each cell of a line, padded to width cells."""
+    densities = []
+    for cell in _cells(line):
+        if cell:
+            densities.append(_DENSITY.get(cell[0], _DEFAULT_DENSITY))
+        else:
+            # Both cells of a wide character are covered by it
+            densities.append(densities[-1])
+    return densities + [0.0] * (width - len(densities))
+
+
+def _downsample(lines: Sequence[str], width: int, columns: int, rows: int) -> list[str]:
+    """Shrink the art to columns x rows, shading each cell by the average density of its block."""
+    density = [_densities(line, width) for line in lines]
+    height = len(lines)
+    output = []
+    for row in range(rows):
+        top = row * height // rows
+        bottom = max((row + 1) * height // rows, top + 1)
+        block_rows = density[top:bottom]
+        cells = []
+        for column in range(columns):
+            left = column * width // columns
+            right = max((column + 1) * width // columns, left + 1)
+            total = sum(sum(values[left:right]) for values in block_rows)
+            average = total / ((right - left) * len(block_rows))
+            # Any visible ink keeps at least the lightest shade
+            cells.append(_SHADES[min(4, max(0, math.ceil(average * 4 - 0.3)))])
+        output.append("".join(cells).rstrip())
+    return output
+
+
+@functools.lru_cache(maxsize=16)
+def fit_art(
+    text: str,
+    columns: int,
+    rows: Optional[int] = None,
+    max_characters: Optional[int] = None,
+    mode: str = "crop",
+) -> str:
+    """
+    Make art fit the terminal and a character budget.
+
+    "crop" keeps the centered part that fits, so art a few columns too wide
+    only loses its edges. "downsample" shrinks the art by the same factor in
+    both directions, so it keeps its proportions, and draws each cell as a
+    shade (░▒▓█) of the average glyph density of the block it replaces. Both
+    work in display cells, so wide characters are never split. Effect cost
+    grows with the number of characters, so max_characters bounds how long an
+    effect can take on any art.
+
+    Args:
+        text: Art to fit.
+        columns: Terminal width in cells.
+        rows: Terminal height available to the art. Unbounded if None.
+        max_characters: Most non-space characters the art may have. Unbounded if None.
+        mode: "crop", "downsample", or "none" to leave the art as it is.
+
+    Returns:
+        The art itself when it already fits, otherwise the fitted art.
+
+    Raises:
+        ValueError: If mode is not recognized or max_characters is not positive.
+    """
+    if mode not in FIT_MODES:
+        raise ValueError(f"Unknown fit mode: {mode}. Use: {', '.join(FIT_MODES)}")
+    if max_characters is not None and max_characters <= 0:
+        raise ValueError(f"max_characters must be positive, got {max_characters}")
+
+    lines, width = _measure(text)
+    lines = list(lines)
+    while lines and not lines[-1]:
+        lines.pop()
+    height = len(lines)
+    rows = rows if rows is not None else height
+    characters = _ink(lines)
+    budget = max_characters if max_characters is not None else characters
+    if mode == "none" or (width <= columns and height <= rows and characters <= budget):
+        return text
+
+    columns, rows = max(1, columns), max(1, rows)
+    grid_width = width
+    if mode == "crop":
+        # Cropping to the terminal keeps the rest of the art at full size, so
+        # only the character budget scales the window
+        width, height = min(width, columns), min(height, rows)
+        scale = max(math.sqrt(characters / budget), 1.0)
+    else:
+        # Area, and with it the character count, shrinks with the square of the scale
+        scale = max(width / columns, height / rows, math.sqrt(characters / budget), 1.0)
+    while True:
+        target_columns = min(columns, max(1, int(width / scale)))
+        target_rows = min(rows, max(1, int(height / scale)))
+        if mode == "crop":
+            fitted = _crop(lines, grid_width, target_columns, target_rows)
+        else:
+            fitted = _downsample(lines, grid_width, target_columns, target_rows)
+        count = _ink(fitted)
+        if count <= budget or target_columns == target_rows == 1:
+            return "\n".join(fitted)
+        scale *= max(1.05, math.sqrt(count / budget))
+
+
+def _on_resize(signum, frame) -> None:
+    """SIGWINCH handler: forget the terminal size, then run the previous handler."""
+    global _geometry
+    _geometry = None
+    if callable(_previous_handler):
+        _previous_handler(signum, frame)
+
+
+def _watching_resizes() -> bool:
+    """Install the SIGWINCH handler if possible, and check it is still the installed one."""
+    global _geometry, _previous_handler
+    if not hasattr(signal, "SIGWINCH"):
+        return False
+    current = signal.getsignal(signal.SIGWINCH)
+    if current is _on_resize:
+        return True
+    # Signal handlers can only be set from the main thread
+    if threading.current_thread() is not threading.main_thread():
+        return False
+    try:
+        signal.signal(signal.SIGWINCH, _on_resize)
+    except (ValueError, OSError):
+        return False
+    # A resize may have gone unseen while another handler was installed
+    _geometry = None
+    _previous_handler = current
+    return True
+
+
+def terminal_size() -> os.terminal_size:
+    """
+    Get the terminal size, as shutil.get_terminal_size() would.
+
+    The size is cached and dropped on SIGWINCH. It is not cached where no
+    resize can be seen: off the main thread before the handler is installed,
+    on platforms without SIGWINCH, or after another handler replaced ours.
+    COLUMNS and LINES in the environment always take precedence.
+
+    Returns:
+        The terminal size.
+    """
+    global _geometry
+    if "COLUMNS" in os.environ or "LINES" in os.environ or not _watching_resizes():
+        return shutil.get_terminal_size()
+    if _geometry is None:
+        _geometry = shutil.get_terminal_size()
+    return _geometry
+
+
+def _read(path: str, size: int) -> str:
+    """Read and decode a file, mapping it into memory if it is large."""
+    with open(path, "rb") as f:
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return str(mapped, "utf-8")
+        return f.read().decode("utf-8")
+
+
+def load_art(path: Union[str, os.PathLike]) -> str:
+    """
+    Load an art file, from memory if it has not changed since the last load.
+
+    Args:
+        path: Art file to load.
+
+    Returns:
+        The art with line endings normalized to "\\n" and trailing whitespace
+        stripped from each line.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        UnicodeDecodeError: If the file is not valid UTF-8.
+    """
+    key = os.path.abspath(path)
+    stat = os.stat(key)
+    cached = _art_cache.get(key)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+
+    text = _normalize(_read(key, stat.st_size))
+    _art_cache[key] = (stat.st_mtime_ns, stat.st_size, text)
+    return text
+
+
+def preload_banners(directory: Union[str, os.PathLike], pattern: str = "*.txt") -> list[str]:
+    """
+    Load every art file in a directory into memory ahead of time.
+
+    Usage:
+        banners = preload_banners("custom_banners")
+        show_banner(custom_file=random.choice(banners))  # no file read
+
+    Args:
+        directory: Directory holding the art files.
+        pattern: Glob pattern of the files to load.
+
+    Returns:
+        Sorted paths of the loaded files, usable as custom_file.
+
+    Raises:
+        FileNotFoundError: If the directory does not exist.
+    """
+    directory = Path(directory)
+    if not directory.is_dir():
+        raise FileNotFoundError(f"Banner directory not found: {directory}")
+    paths = sorted(str(path) for path in directory.glob(pattern) if path.is_file())
+    for path in paths:
+        load_art(path)
+    return paths
+
+
+def clear_art_cache() -> None:
+    """Drop all loaded art, e.g. to free memory after showing the banners."""
+    _art_cache.clear()
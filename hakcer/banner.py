@@ -13,43 +13,31 @@ Usage:
     show_banner(hold_time=3.0)  # Hold for 3 seconds after animation
 """
 
+import atexit
+import functools
+import os
 import random
+import sys
+import threading
 import time
-import shutil
-from typing import Optional
-
-from terminaltexteffects.effects import (
-    effect_beams,
-    effect_binarypath,
-    effect_blackhole,
-    effect_bouncyballs,
-    effect_burn,
-    effect_colorshift,
-    effect_crumble,
-    effect_decrypt,
-    effect_errorcorrect,
-    effect_expand,
-    effect_fireworks,
-    effect_matrix,
-    effect_orbittingvolley,
-    effect_overflow,
-    effect_pour,
-    effect_print,
-    effect_rain,
-    effect_random_sequence,
-    effect_rings,
-    effect_scattered,
-    effect_slide,
-    effect_spotlights,
-    effect_spray,
-    effect_swarm,
-    effect_synthgrid,
-    effect_unstable,
-    effect_vhstape,
-    effect_waves,
-    effect_wipe,
+from typing import Callable, Iterable, Optional, Union
+
+from .art import center_offset, fit_art, load_art, terminal_size, trim_art
+from .cache import frame_cache_key, load_frames, store_frames
+from .colors import quantize_frame, quantize_frames, resolve_color_depth
+from .costs import SPEED_TIERS, effects_by_tier, estimate_effects
+from .effects import EFFECT_REGISTRY, build_effect_config, effect_settings, load_effect
+from .playback import (
+    AdaptiveFrameRate,
+    collect_frames,
+    fit_frames_to_duration,
+    iter_effect_frames,
+    play_frames,
+    play_frames_async,
+    watch_keypress,
 )
-from terminaltexteffects.utils.graphics import Color
+from .render import final_frame, place_frame
+from .stats import BannerStats, FrameCallback
 
 from .themes import get_theme, set_current_theme, get_current_theme_name, list_available_themes
 
@@ -79,333 +67,116 @@ _ __ \\/ /\\____________________██_____________ ███________ _________
 """
 
 
-def _is_hex_color(s: str) -> bool:
-    """Check if string is a valid hex color code."""
-    return bool(len(s) == 6 and all(c in '0123456789abcdefABCDEF' for c in s))
-
-
-def _convert_value(val: str):
-    """Convert string value to appropriate type."""
-    # Try hex color first
-    if _is_hex_color(val):
-        return Color(val)
-    # Try integer
-    try:
-        return int(val)
-    except ValueError:
-        pass
-    # Try float
-    try:
-        return float(val)
-    except ValueError:
-        pass
-    # Return as string
-    return val
-
-
-def _parse_args_to_kwargs(args: list[str]) -> dict:
-    """Convert command-line style args list to kwargs dict."""
-    kwargs = {}
-    i = 0
-    while i < len(args):
-        if args[i].startswith("--"):
-            key = args[i][2:].replace("-", "_")
-            # Check if next item is a value or another flag
-            if i + 1 < len(args) and not args[i + 1].startswith("--"):
-                # Collect all values until next flag
-                values = []
-                i += 1
-                while i < len(args) and not args[i].startswith("--"):
-                    values.append(_convert_value(args[i]))
-                    i += 1
-                # Store as single value or list
-                kwargs[key] = values if len(values) > 1 else values[0]
-            else:
-                kwargs[key] = True
-                i += 1
-        else:
-            i += 1
-    return kwargs
-
-
-def _get_effect_config(effect_name: str, theme: dict) -> dict:
-    """Generate effect configuration with theme colors."""
-    colors = theme["colors"]
-
-    configs = {
-        "beams": {
-            "module": effect_beams,
-            "class_name": "Beams",
-            "args": [
-                "--beam-row-symbols", "▂ ▁ _ ⎽",
-                "--beam-column-symbols", "▌ ▍ ▎ ▏",
-                "--final-gradient-stops"] + colors["primary"] + [
-                "--beam-gradient-stops"] + colors["beam_colors"],
-        },
-        "binarypath": {
-            "module": effect_binarypath,
-            "class_name": "BinaryPath",
-            "args": [
-                "--final-gradient-stops"] + colors["primary"] + [
-                "--binary-colors"] + colors["accent"],
-        },
-        "blackhole": {
-            "module": effect_blackhole,
-            "class_name": "Blackhole",
-            "args": ["--star-colors"] + colors["primary"] + colors["accent"],
-        },
-        "bouncyballs": {
-            "module": effect_bouncyballs,
-            "class_name": "BouncyBalls",
-            "args": ["--ball-colors"] + colors["primary"] + colors["accent"],
-        },
-        "burn": {
-            "module": effect_burn,
-            "class_name": "Burn",
-            "args": [
-                "--starting-color", colors["accent"][0],
-                "--burn-colors"] + colors["accent"] + [colors["primary"][2]],
-        },
-        "colorshift": {
-            "module": effect_colorshift,
-            "class_name": "ColorShift",
-            "args": [
-                "--gradient-stops"] + colors["gradient_stops"] + [colors["accent"][0]],
-        },
-        "crumble": {
-            "module": effect_crumble,
-            "class_name": "Crumble",
-            "args": ["--final-gradient-stops"] + colors["primary"],
-        },
-        "decrypt": {
-            "module": effect_decrypt,
-            "class_name": "Decrypt",
-            "args": [
-                "--typing-speed", "2",
-                "--ciphertext-colors"] + colors["accent"] + [
-                "--final-gradient-stops"] + colors["gradient_stops"],
-        },
-        "errorcorrect": {
-            "module": effect_errorcorrect,
-            "class_name": "ErrorCorrect",
-            "args": [
-                "--error-pairs", "20",
-                "--error-color", colors["error"][0],
-                "--correct-color", colors["primary"][0]],
-        },
-        "expand": {
-            "module": effect_expand,
-            "class_name": "Expand",
-            "args": [
-                "--final-gradient-stops"] + colors["primary"] + [
-                "--movement-speed", "0.5"],
-        },
-        "fireworks": {
-            "module": effect_fireworks,
-            "class_name": "Fireworks",
-            "args": [
-                "--firework-colors"] + colors["primary"] + colors["accent"] + [
-                "--firework-symbol", "●"],
-        },
-        "matrix": {
-            "module": effect_matrix,
-            "class_name": "Matrix",
-            "args": [
-                "--final-gradient-stops"] + colors["primary"][:2],
-        },
-        "orbittingvolley": {
-            "module": effect_orbittingvolley,
-            "class_name": "OrbittingVolley",
-            "args": [
-                "--top-launcher-symbol", "▲",
-                "--right-launcher-symbol", "▶",
-                "--bottom-launcher-symbol", "▼",
-                "--left-launcher-symbol", "◀",
-                "--volley-colors"] + colors["primary"],
-        },
-        "overflow": {
-            "module": effect_overflow,
-            "class_name": "Overflow",
-            "args": [
-                "--overflow-gradient-stops"] + colors["accent"] + [
-                "--final-gradient-stops", colors["primary"][0], colors["primary"][2]],
-        },
-        "pour": {
-            "module": effect_pour,
-            "class_name": "Pour",
-            "args": [
-                "--pour-direction", "down",
-                "--pour-speed", "2",
-                "--gap", "1",
-                "--final-gradient-stops"] + colors["primary"],
-        },
-        "print": {
-            "module": effect_print,
-            "class_name": "Print",
-            "args": [
-                "--final-gradient-stops"] + colors["primary"] + [
-                "--print-head-return-speed", "1.5"],
-        },
-        "rain": {
-            "module": effect_rain,
-            "class_name": "Rain",
-            "args": ["--rain-colors"] + colors["primary"] + [colors["accent"][0]],
-        },
-        "random_sequence": {
-            "module": effect_random_sequence,
-            "class_name": "RandomSequence",
-            "args": [
-                "--starting-color", colors["primary"][1],
-                "--final-gradient-stops", colors["primary"][0], colors["primary"][2]],
-        },
-        "rings": {
-            "module": effect_rings,
-            "class_name": "Rings",
-            "args": ["--ring-colors"] + colors["primary"] + [colors["accent"][0]],
-        },
-        "scattered": {
-            "module": effect_scattered,
-            "class_name": "Scattered",
-            "args": [
-                "--final-gradient-stops"] + colors["primary"] + [
-                "--movement-speed", "0.5"],
-        },
-        "slide": {
-            "module": effect_slide,
-            "class_name": "Slide",
-            "args": [
-                "--final-gradient-stops"] + colors["primary"],
-        },
-        "spotlights": {
-            "module": effect_spotlights,
-            "class_name": "Spotlights",
-            "args": [
-                "--beam-width-ratio", "2.0",
-                "--search-duration", "750",
-                "--final-gradient-stops"] + colors["primary"][:2],
-        },
-        "spray": {
-            "module": effect_spray,
-            "class_name": "Spray",
-            "args": [
-                "--final-gradient-stops"] + colors["primary"][:2],
-        },
-        "swarm": {
-            "module": effect_swarm,
-            "class_name": "Swarm",
-            "args": [
-                "--swarm-colors"] + colors["primary"] + [colors["accent"][0]] + [
-                "--final-gradient-stops", colors["primary"][0], colors["primary"][2]],
-        },
-        "synthgrid": {
-            "module": effect_synthgrid,
-            "class_name": "SynthGrid",
-            "args": [
-                "--grid-gradient-stops", colors["primary"][1], colors["primary"][0],
-                "--text-gradient-stops"] + colors["gradient_stops"],
-        },
-        "unstable": {
-            "module": effect_unstable,
-            "class_name": "Unstable",
-            "args": [
-                "--unstable-color", colors["error"][0],
-                "--final-gradient-stops"] + colors["primary"],
-        },
-        "vhstape": {
-            "module": effect_vhstape,
-            "class_name": "VHSTape",
-            "args": [
-                "--final-gradient-stops"] + colors["primary"] + [
-                "--glitch-line-colors"] + colors["accent"],
-        },
-        "waves": {
-            "module": effect_waves,
-            "class_name": "Waves",
-            "args": [
-                "--wave-symbols", "▁ ▂ ▃ ▄ ▅ ▆ ▇ █ ▇ ▆ ▅ ▄ ▃ ▂ ▁",
-                "--wave-gradient-stops"] + colors["primary"] + [
-                "--final-gradient-stops", colors["primary"][0], colors["primary"][2]],
-        },
-        "wipe": {
-            "module": effect_wipe,
-            "class_name": "Wipe",
-            "args": [
-                "--wipe-direction", "diagonal_top_left_to_bottom_right",
-                "--final-gradient-stops"] + colors["primary"],
-        },
-    }
-
-    return configs.get(effect_name)
-
-
-FAST_EFFECTS = [
-    "decrypt", "expand", "print", "slide", "wipe", "colorshift",
-    "scattered", "random_sequence", "pour", "errorcorrect"
-]
-
-MEDIUM_EFFECTS = [
-    "beams", "binarypath", "burn", "crumble", "overflow",
-    "rain", "spray", "unstable", "vhstape", "waves"
-]
-
-SLOW_EFFECTS = [
-    "blackhole", "bouncyballs", "fireworks", "matrix",
-    "orbittingvolley", "rings", "spotlights", "swarm", "synthgrid"
-]
-
-ALL_EFFECTS = FAST_EFFECTS + MEDIUM_EFFECTS + SLOW_EFFECTS
-
-
-def _center_text(text: str) -> str:
-    """Center text based on terminal width."""
-    terminal_width = shutil.get_terminal_size().columns
-    lines = text.split('\n')
-
-    # Strip leading/trailing whitespace from each line to normalize
-    stripped_lines = [line.rstrip() for line in lines]
-
-    # Find the maximum line length after stripping
-    max_line_length = max(len(line) for line in stripped_lines) if stripped_lines else 0
-
-    # Calculate padding needed to center the widest line
-    padding = max(0, (terminal_width - max_line_length) // 2)
-
-    # Add padding to each line
-    centered_lines = [' ' * padding + line for line in stripped_lines]
-
-    return '\n'.join(centered_lines)
+# (theme name, effect name) -> terminaltexteffects config object, built on first use
+_compiled_configs: dict[tuple[str, str], object] = {}
 
 
-def show_banner(
-    effect_name: Optional[str] = None,
-    speed_preference: str = "fast",
-    hold_time: float = 1.5,
-    clear_after: bool = False,
-    theme: Optional[str] = None,
-    custom_text: Optional[str] = None,
-    custom_file: Optional[str] = None,
-) -> None:
+def _effect_config_object(effect_name: str, theme_name: str):
+    """Build the terminaltexteffects config for an effect and theme once and reuse it."""
+    key = (theme_name, effect_name)
+    compiled = _compiled_configs.get(key)
+    if compiled is None:
+        # Effects deep-copy their config when iterated, so one instance can be shared
+        compiled = build_effect_config(effect_name, get_theme(theme_name)["colors"])
+        _compiled_configs[key] = compiled
+    return compiled
+
+
+def invalidate_effect_configs(theme_name: Optional[str] = None) -> None:
     """
-    Display the haKCer ASCII banner with a randomized terminal effect.
+    Discard compiled effect configurations.
+
+    Effect configurations are compiled once per theme and effect. Call this after
+    changing THEMES at runtime so the new colors are picked up.
 
     Args:
-        effect_name: Specific effect to use. If None, randomly selects based on speed_preference.
-        speed_preference: Speed category for random selection ("fast", "medium", "slow", "any").
-        hold_time: Seconds to hold the final frame before returning.
-        clear_after: Whether to clear the terminal after the effect completes.
-        theme: Theme name to use. If None, uses current global theme.
-        custom_text: Custom ASCII art text to display instead of default banner.
-        custom_file: Path to file containing custom ASCII art. Overrides custom_text.
+        theme_name: Only discard configurations for this theme. All themes if None.
+    """
+    if theme_name is None:
+        _compiled_configs.clear()
+        return
+    for key in [key for key in _compiled_configs if key[0] == theme_name]:
+        _compiled_configs.pop(key, None)
+
+
+ALL_EFFECTS = list(EFFECT_REGISTRY)
+
+
+def _select_effect(
+    ascii_art: str, speed_preference: str, budget_seconds: Optional[float] = None
+) -> str:
+    """
+    Pick a random effect whose estimated duration for this art fits the speed tier.
+
+    If the tier is empty for this art, the next faster tier is used, and if no
+    effect is fast enough the cheapest one is picked. "budget" picks from the
+    effects estimated to finish within budget_seconds, again falling back to
+    the cheapest.
+    """
+    if speed_preference == "budget":
+        estimates = estimate_effects(ALL_EFFECTS, ascii_art)
+        within = [name for seconds, name in estimates if seconds <= budget_seconds]
+        return random.choice(within) if within else estimates[0][1]
+    if speed_preference not in SPEED_TIERS:
+        return random.choice(ALL_EFFECTS)
+
+    tiers = effects_by_tier(ALL_EFFECTS, ascii_art)
+    for tier in reversed(SPEED_TIERS[: SPEED_TIERS.index(speed_preference) + 1]):
+        if tiers[tier]:
+            return random.choice(tiers[tier])[1]
+    return min(entry for entries in tiers.values() for entry in entries)[1]
+
+
+def _layout_art(
+    ascii_art: str, fit: str = "crop", max_characters: Optional[int] = None
+) -> tuple[str, tuple[int, int]]:
+    """
+    Trim art to its visible characters, fit it to the terminal (see fit_art()) and place it.
+
+    Returns:
+        Tuple of (trimmed art, (blank lines above it, left padding that centers it)).
+    """
+    size = terminal_size()
+    trimmed, top, indent = trim_art(ascii_art)
+    # Leave a row below the banner for the cursor
+    rows = max(1, size.lines - 1)
+    ascii_art = fit_art(trimmed, size.columns, rows, max_characters, fit)
+    if ascii_art is not trimmed:
+        # Fitted art fills the terminal and is centered on its own
+        return ascii_art, (0, center_offset(ascii_art, size.columns))
+    top = min(top, max(0, rows - ascii_art.count("\n") - 1))
+    return ascii_art, (top, center_offset(ascii_art, size.columns, indent))
+
+
+def _prepare_banner(
+    effect_name: Optional[str],
+    speed_preference: str,
+    theme: Optional[str],
+    custom_text: Optional[str],
+    custom_file: Optional[str],
+    fit: str = "crop",
+    max_characters: Optional[int] = None,
+    budget_seconds: Optional[float] = None,
+) -> tuple[str, str, str, dict, tuple[int, int]]:
+    """
+    Load, trim and fit the art, resolve the theme and select the effect.
+
+    Returns:
+        Tuple of (trimmed art, effect name, theme name, theme config,
+        (top, left) placement of the art), see _layout_art().
 
     Raises:
-        ValueError: If effect_name or theme is not recognized.
-        FileNotFoundError: If custom_file is specified but not found.
+        ValueError: If effect_name or theme is not recognized, or
+            speed_preference is "budget" without a positive budget_seconds.
     """
+    if speed_preference == "budget" and (budget_seconds is None or budget_seconds <= 0):
+        raise ValueError(
+            f'speed_preference="budget" needs a positive budget_seconds, got {budget_seconds}'
+        )
     # Determine which ASCII art to use
     if custom_file:
         try:
-            with open(custom_file, 'r', encoding='utf-8') as f:
-                ascii_art = f.read()
+            ascii_art = load_art(custom_file)
         except FileNotFoundError:
             raise FileNotFoundError(f"Custom ASCII art file not found: {custom_file}")
     elif custom_text:
@@ -413,11 +184,12 @@ def show_banner(
     else:
         ascii_art = HAKCER_ASCII
 
-    # Center the ASCII art based on terminal width
-    ascii_art = _center_text(ascii_art)
+    # Effects only get the visible part of the art; centering is applied when drawing
+    ascii_art, placement = _layout_art(ascii_art, fit, max_characters)
 
     # Get theme configuration
-    theme_config = get_theme(theme)
+    theme_name = theme if theme is not None else get_current_theme_name()
+    theme_config = get_theme(theme_name)
 
     # Select effect
     if effect_name:
@@ -428,40 +200,645 @@ def show_banner(
             )
         selected_effect = effect_name
     else:
-        if speed_preference == "fast":
-            selected_effect = random.choice(FAST_EFFECTS)
-        elif speed_preference == "medium":
-            selected_effect = random.choice(MEDIUM_EFFECTS)
-        elif speed_preference == "slow":
-            selected_effect = random.choice(SLOW_EFFECTS)
-        else:
-            selected_effect = random.choice(ALL_EFFECTS)
+        selected_effect = _select_effect(ascii_art, speed_preference, budget_seconds)
 
-    # Get effect configuration with theme colors
-    config = _get_effect_config(selected_effect, theme_config)
-    if not config:
+    if selected_effect not in EFFECT_REGISTRY:
         raise ValueError(f"Effect {selected_effect} not properly configured")
 
-    # Get the effect class and config class
-    effect_class, config_class = config["module"].get_effect_and_args()
+    return ascii_art, selected_effect, theme_name, theme_config, placement
+
 
-    # Parse args to kwargs and create config
-    kwargs = _parse_args_to_kwargs(config["args"])
-    effect_config = config_class(**kwargs)
+def _banner_cache_key(ascii_art: str, selected_effect: str, theme_config: dict) -> str:
+    """Get the frame cache key of a prepared banner."""
+    colors = theme_config["colors"]
+    settings = effect_settings(selected_effect, colors)
+    return frame_cache_key(ascii_art, selected_effect, colors, settings)
+
+
+def _banner_frames(
+    ascii_art: str,
+    selected_effect: str,
+    theme_name: str,
+    theme_config: dict,
+    use_cache: bool,
+    stats: Optional[BannerStats] = None,
+) -> Iterable[str]:
+    """
+    Get the banner's frames from the frame cache or a freshly built effect.
+
+    With stats, the effect is set up right away and the time that takes is
+    recorded along with the time spent on its config.
+    """
+    cache_key = None
+    if use_cache:
+        cache_key = _banner_cache_key(ascii_art, selected_effect, theme_config)
+        frames = load_frames(cache_key)
+        if frames is not None:
+            if stats is not None:
+                stats.cached = True
+            return frames
+
+    started = time.perf_counter()
+    # Get the effect class (imports the effect module on first use)
+    effect_class, _ = load_effect(selected_effect)
 
     # Create effect instance with custom or default ASCII art and set config
     effect = effect_class(ascii_art)
-    effect.effect_config = effect_config
+    constructed = time.perf_counter()
+    effect.effect_config = _effect_config_object(selected_effect, theme_name)
+    configured = time.perf_counter()
+
+    frames = iter_effect_frames(effect, setup=stats is not None)
+    if stats is not None:
+        stats.config_seconds = configured - constructed
+        stats.construction_seconds = constructed - started + time.perf_counter() - configured
+    if cache_key:
+        frames = store_frames(cache_key, frames)
+    return frames
+
+
+BANNER_MODES = ("auto", "animate", "static", "plain")
 
-    with effect.terminal_output() as terminal:
-        for frame in effect:
-            terminal.print(frame)
+
+def _resolve_mode(mode: str) -> str:
+    """
+    Resolve a banner mode, turning "auto" into a concrete one.
+
+    "auto" animates only when stdout is an interactive terminal. Anywhere else
+    (CI logs, pipes, journald) the banner is written once as static output, in
+    plain text if NO_COLOR is set.
+
+    Raises:
+        ValueError: If mode is not recognized.
+    """
+    if mode not in BANNER_MODES:
+        raise ValueError(f"Unknown mode: {mode}. Use: {', '.join(BANNER_MODES)}")
+    if mode != "auto":
+        return mode
+
+    isatty = getattr(sys.stdout, "isatty", None)
+    if isatty is not None and isatty() and os.environ.get("TERM") != "dumb":
+        return "animate"
+    return "plain" if "NO_COLOR" in os.environ else "static"
+
+
+def _frame_rate(
+    fps: Union[int, str], min_fps: float, max_fps: Optional[float]
+) -> AdaptiveFrameRate:
+    """
+    Build the frame rate controller for a banner.
+
+    Raises:
+        ValueError: If fps is neither "auto" nor a positive integer, or the caps are invalid.
+    """
+    if fps == "auto":
+        return AdaptiveFrameRate(min_fps=min_fps, max_fps=max_fps)
+    if isinstance(fps, bool) or not isinstance(fps, int) or fps <= 0:
+        raise ValueError(f'fps must be a positive integer or "auto", got {fps!r}')
+    return AdaptiveFrameRate(min_fps=fps, max_fps=fps)
+
+
+def _final_frame(ascii_art: str, effect_name: Optional[str], theme_name: str) -> str:
+    """Render the frame an effect ends on, using the theme's gradient if the effect has none."""
+    config = _effect_config_object(effect_name, theme_name) if effect_name else None
+    if getattr(config, "final_gradient_stops", None):
+        return final_frame(
+            ascii_art,
+            config.final_gradient_stops,
+            config.final_gradient_steps,
+            config.final_gradient_direction,
+        )
+
+    from terminaltexteffects.utils.graphics import Color
+
+    gradient_stops = get_theme(theme_name)["colors"]["gradient_stops"]
+    stops = tuple(Color(hex_color) for hex_color in gradient_stops)
+    return final_frame(ascii_art, stops)
+
+
+def render_final(
+    ascii_art: Optional[str] = None,
+    theme: Optional[str] = None,
+    effect_name: Optional[str] = None,
+    color_depth: str = "truecolor",
+    fit: str = "crop",
+) -> str:
+    """
+    Render the final frame of a banner without running its effect.
+
+    The art is centered as show_banner() would center it and colored with the
+    effect's final gradient in a single pass, which takes milliseconds instead
+    of the seconds the animation needs. Useful for MOTD files, logs and other
+    static output.
+
+    Args:
+        ascii_art: Art to render. The haKCer banner if None.
+        theme: Theme name. If None, uses current global theme.
+        effect_name: Effect whose final gradient and direction to use. If None,
+            the theme's gradient_stops are applied vertically.
+        color_depth: "truecolor", "256" or "16" colors, or "auto" to detect
+            what the current terminal supports.
+        fit: "crop", "downsample" or "none", for art that is larger than the
+            terminal, as for show_banner().
+
+    Returns:
+        The colored banner as a string of ANSI escape sequences, without a
+        trailing newline.
+
+    Raises:
+        ValueError: If theme, effect_name, color_depth or fit is not recognized.
+    """
+    color_depth = resolve_color_depth(color_depth)
+    theme_name = theme if theme is not None else get_current_theme_name()
+    get_theme(theme_name)
+    if effect_name is not None and effect_name not in EFFECT_REGISTRY:
+        available = ", ".join(sorted(ALL_EFFECTS))
+        raise ValueError(f"Unknown effect: {effect_name}. Available: {available}")
+
+    art, placement = _layout_art(ascii_art if ascii_art is not None else HAKCER_ASCII, fit)
+    final = quantize_frame(_final_frame(art, effect_name, theme_name), color_depth)
+    return place_frame(final, *placement)
+
+
+def _static_banner(
+    prepared: tuple[str, str, str, dict, tuple[int, int]], mode: str, color_depth: str = "truecolor"
+) -> str:
+    """Get the output of a static banner: the final frame, or the uncolored art for "plain"."""
+    ascii_art, selected_effect, theme_name, _, placement = prepared
+    if mode == "plain":
+        return place_frame(ascii_art, *placement) + "\n"
+    frame = quantize_frame(_final_frame(ascii_art, selected_effect, theme_name), color_depth)
+    return place_frame(frame, *placement) + "\n"
+
+
+def _run_banner(
+    prepared: tuple[str, str, str, dict, tuple[int, int]],
+    hold_time: float,
+    clear_after: bool,
+    use_cache: bool,
+    max_duration: Optional[float],
+    started: float,
+    mode: str = "animate",
+    rate: Optional[AdaptiveFrameRate] = None,
+    color_depth: str = "truecolor",
+    skip: Optional[threading.Event] = None,
+    release: Optional[threading.Event] = None,
+    stats: Optional[BannerStats] = None,
+    on_frame: Optional[FrameCallback] = None,
+    on_finish: Optional[Callable[[BannerStats], None]] = None,
+) -> None:
+    """
+    Play a prepared banner, hold the final frame and optionally clear.
+
+    Static modes write the banner once and return without holding or clearing.
+
+    Args:
+        prepared: Result of _prepare_banner().
+        hold_time: Seconds to hold the final frame.
+        clear_after: Whether to clear the terminal afterwards.
+        use_cache: Whether to use the on-disk frame cache.
+        max_duration: Animation time budget in seconds, or None.
+        started: time.monotonic() value the budget is measured from.
+        mode: Resolved banner mode, see _resolve_mode().
+        rate: Frame rate controller, see _frame_rate(). Every frame is shown if None.
+        color_depth: Resolved color depth, see resolve_color_depth().
+        skip: When set, the animation jumps to its final frame.
+        release: When set, the hold on the final frame ends early.
+        stats: Measurements to fill in. Nothing is measured if None.
+        on_frame: Called after each frame is written, see show_banner().
+        on_finish: Called with the complete stats before returning.
+    """
+    if mode != "animate":
+        rendering = time.perf_counter()
+        output = _static_banner(prepared, mode, color_depth)
+        writing = time.perf_counter()
+        sys.stdout.write(output)
+        sys.stdout.flush()
+        if stats is not None:
+            write_seconds = time.perf_counter() - writing
+            stats.record_frame(writing - rendering, write_seconds, len(output.encode()), on_frame)
+            _finish_stats(stats, started, on_finish)
+        return
+
+    # Frames are cached in 24-bit color and quantized on the way out
+    frames = _banner_frames(*prepared[:4], use_cache=use_cache, stats=stats)
+    frames = quantize_frames(frames, color_depth)
+
+    deadline = None
+    if max_duration is not None:
+        # Count frames in advance, then thin them out to fit the time left
+        deadline = started + max_duration
+        frames = collect_frames(frames, deadline)
+        frames = fit_frames_to_duration(frames, deadline - time.monotonic())
+
+    # Skipping or running out of time lands on the final frame without generating the rest
+    final = None
+    if deadline is not None or skip is not None:
+        final = quantize_frame(_final_frame(*prepared[:3]), color_depth)
+
+    record = None if stats is None else functools.partial(stats.record_frame, on_frame=on_frame)
+    top, left = prepared[4]
+    play_frames(
+        frames, deadline=deadline, stop=skip, final=final, rate=rate, top=top, left=left,
+        on_frame=record, on_skip=None if stats is None else stats.record_skip,
+    )
 
     if hold_time > 0:
-        time.sleep(hold_time)
+        if release is not None:
+            release.wait(hold_time)
+        else:
+            time.sleep(hold_time)
+
+    if clear_after:
+        print("\033[2J\033[H", end="", flush=True)
+    if stats is not None:
+        _finish_stats(stats, started, on_finish)
+
+
+def _finish_stats(
+    stats: BannerStats, started: float, on_finish: Optional[Callable[[BannerStats], None]]
+) -> None:
+    """Record the total time of a banner and report its stats."""
+    stats.wall_seconds = time.monotonic() - started
+    if on_finish is not None:
+        on_finish(stats)
+
+
+def show_banner(
+    effect_name: Optional[str] = None,
+    speed_preference: str = "fast",
+    hold_time: float = 1.5,
+    clear_after: bool = False,
+    theme: Optional[str] = None,
+    custom_text: Optional[str] = None,
+    custom_file: Optional[str] = None,
+    use_cache: bool = False,
+    max_duration: Optional[float] = None,
+    mode: str = "auto",
+    fps: Union[int, str] = "auto",
+    min_fps: float = 10,
+    max_fps: Optional[float] = None,
+    color_depth: str = "auto",
+    fit: str = "crop",
+    max_characters: Optional[int] = None,
+    budget_seconds: Optional[float] = None,
+    skip_on_key: bool = True,
+    on_start: Optional[Callable[[BannerStats], None]] = None,
+    on_frame: Optional[FrameCallback] = None,
+    on_finish: Optional[Callable[[BannerStats], None]] = None,
+) -> BannerStats:
+    """
+    Display the haKCer ASCII banner with a randomized terminal effect.
+
+    Args:
+        effect_name: Specific effect to use. If None, randomly selects based on speed_preference.
+        speed_preference: Speed category for random selection ("fast", "medium", "slow", "any"),
+            judged by the estimated duration for the art being shown. "budget" picks
+            from the effects estimated to finish within budget_seconds.
+        hold_time: Seconds to hold the final frame before returning.
+        clear_after: Whether to clear the terminal after the effect completes.
+        theme: Theme name to use. If None, uses current global theme.
+        custom_text: Custom ASCII art text to display instead of default banner.
+        custom_file: Path to file containing custom ASCII art. Overrides custom_text.
+        use_cache: Play frames from the on-disk frame cache when available, and store
+            them there after the first run. The cache key covers the art, effect,
+            theme colors, effect settings, terminaltexteffects version and terminal size.
+        max_duration: Maximum seconds the animation may take, not counting hold_time.
+            Frames are generated up front and evenly thinned out so playback ends
+            within the budget on the effect's final frame.
+        mode: "animate" plays the effect. "static" writes the themed final frame
+            once and "plain" writes the uncolored art once; both return immediately,
+            without cursor control, hold_time or clear_after. "auto" animates when
+            stdout is a terminal and falls back to "static" ("plain" if NO_COLOR
+            is set) when it is not, e.g. in CI logs or pipes.
+        fps: Frames per second to show, or "auto" to measure how long writes to
+            the terminal take and lower the rate while they are slow, e.g. over
+            SSH. Lower rates show every n-th frame, so the animation keeps its
+            length.
+        min_fps: Lowest rate "auto" may drop to.
+        max_fps: Highest rate "auto" may show. If None, 100, the rate effects are made for.
+        color_depth: "truecolor", "256" or "16" colors. "auto" uses 24-bit color
+            when COLORTERM says the terminal supports it and otherwise goes by
+            TERM. Lower depths map each color to the nearest palette color,
+            which also shortens the output. Truecolor terminals that do not
+            set COLORTERM get 256 colors; pass "truecolor" to keep 24-bit.
+        fit: What to do with art that is wider or taller than the terminal, or
+            has more than max_characters characters: "crop" keeps the centered
+            part that fits, "downsample" shrinks it into shaded blocks and
+            "none" leaves it as it is. Art that fits is never changed.
+        max_characters: Most non-space characters to animate. Effect cost grows
+            with the character count, so this bounds the time large art takes.
+        budget_seconds: Longest estimated animation, for speed_preference="budget"
+            (see estimate_duration()). If no effect fits, the fastest one is used.
+        skip_on_key: When stdin is a terminal, any key press jumps to the final
+            frame and ends hold_time early. Keys are read in cbreak mode, and the
+            terminal's settings are restored afterwards, also on Ctrl-C.
+        on_start: Called with the BannerStats once the effect is chosen, before
+            anything is drawn.
+        on_frame: Called after each frame is written with its index, the
+            seconds spent generating it and the seconds spent writing it.
+        on_finish: Called with the complete BannerStats before returning.
+
+    Returns:
+        BannerStats with the effect and theme shown and where the time went:
+        config and effect setup, per-frame generate and write latencies, bytes
+        written and total wall time.
+
+    Raises:
+        ValueError: If effect_name, theme, mode, fps, color_depth or fit is not recognized,
+            max_duration or max_characters is not positive, or speed_preference is
+            "budget" without a positive budget_seconds.
+        FileNotFoundError: If custom_file is specified but not found.
+    """
+    if max_duration is not None and max_duration <= 0:
+        raise ValueError(f"max_duration must be positive, got {max_duration}")
+    mode = _resolve_mode(mode)
+    rate = _frame_rate(fps, min_fps, max_fps)
+    color_depth = resolve_color_depth(color_depth)
+    started = time.monotonic()
+
+    prepared = _prepare_banner(
+        effect_name, speed_preference, theme, custom_text, custom_file,
+        fit, max_characters, budget_seconds,
+    )
+    stats = BannerStats(prepared[1], prepared[2], mode)
+    if on_start is not None:
+        on_start(stats)
+    with watch_keypress(skip_on_key and mode == "animate") as pressed:
+        _run_banner(
+            prepared, hold_time, clear_after, use_cache, max_duration,
+            started, mode, rate, color_depth,
+            skip=pressed, release=pressed, stats=stats, on_frame=on_frame, on_finish=on_finish,
+        )
+    return stats
+
+
+class BannerHandle:
+    """
+    Handle to a banner playing in a background thread.
+
+    Returned by start_banner(). The host application should not write to the
+    terminal until wait() or finish() has returned.
+
+    Attributes:
+        stats: BannerStats of the banner, complete once it is done().
+    """
+
+    def __init__(self, stats: BannerStats) -> None:
+        self.stats = stats
+        self._skip = threading.Event()
+        self._release = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self, *args, skip_on_key: bool = False, **kwargs) -> None:
+        try:
+            with watch_keypress(skip_on_key, on_press=self._end_early):
+                _run_banner(*args, skip=self._skip, release=self._release, **kwargs)
+        except BaseException as e:
+            self._error = e
+        finally:
+            atexit.unregister(self._shutdown)
+
+    def _start(self, *args, **kwargs) -> None:
+        self._thread = threading.Thread(
+            target=self._run, args=args, kwargs=kwargs, name="hakcer-banner", daemon=True
+        )
+        atexit.register(self._shutdown)
+        self._thread.start()
+
+    def _end_early(self) -> None:
+        self._skip.set()
+        self._release.set()
+
+    def _shutdown(self) -> None:
+        # Interpreter exit while the banner is still running: snap to the end
+        # so the cursor is restored before the daemon thread is torn down
+        self._end_early()
+        if self._thread is not None:
+            self._thread.join(2.0)
+
+    def done(self) -> bool:
+        """Check whether the banner has finished, including its hold time."""
+        return self._thread is None or not self._thread.is_alive()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the animation and hold time to complete.
+
+        Args:
+            timeout: Maximum seconds to wait. None waits indefinitely.
+
+        Returns:
+            True if the banner finished, False if the timeout expired.
+
+        Raises:
+            Exception: Any error raised while playing the banner.
+        """
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if not self.done():
+            return False
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+        return True
+
+    def finish(self, fast_forward: bool = True, timeout: Optional[float] = None) -> bool:
+        """
+        End the banner early and wait for the terminal to be restored.
+
+        Args:
+            fast_forward: Jump straight to the final frame. If False the animation
+                plays out, but any remaining hold time is skipped.
+            timeout: Maximum seconds to wait. None waits indefinitely.
+
+        Returns:
+            True if the banner finished, False if the timeout expired.
+
+        Raises:
+            Exception: Any error raised while playing the banner.
+        """
+        if fast_forward:
+            self._skip.set()
+        self._release.set()
+        return self.wait(timeout)
+
+
+def start_banner(
+    effect_name: Optional[str] = None,
+    speed_preference: str = "fast",
+    hold_time: float = 1.5,
+    clear_after: bool = False,
+    theme: Optional[str] = None,
+    custom_text: Optional[str] = None,
+    custom_file: Optional[str] = None,
+    use_cache: bool = False,
+    max_duration: Optional[float] = None,
+    mode: str = "auto",
+    fps: Union[int, str] = "auto",
+    min_fps: float = 10,
+    max_fps: Optional[float] = None,
+    color_depth: str = "auto",
+    fit: str = "crop",
+    max_characters: Optional[int] = None,
+    budget_seconds: Optional[float] = None,
+    skip_on_key: bool = True,
+    on_start: Optional[Callable[[BannerStats], None]] = None,
+    on_frame: Optional[FrameCallback] = None,
+    on_finish: Optional[Callable[[BannerStats], None]] = None,
+) -> BannerHandle:
+    """
+    Start the banner in a background thread and return immediately.
+
+    Lets the host application do its own startup work (imports, config loading)
+    while the banner plays. Arguments are the same as show_banner(); they are
+    validated before this function returns. on_frame and on_finish are called
+    from the banner's thread. With skip_on_key, a key press acts like finish()
+    and the terminal stays in cbreak mode until the banner is done, so the
+    host should not read stdin before then.
+
+    Usage:
+        handle = start_banner(effect_name="decrypt")
+        config = load_config()  # runs while the banner animates
+        handle.finish()  # snap to the final frame and restore the terminal
+
+    Returns:
+        BannerHandle used to wait for or end the banner.
+
+    Raises:
+        ValueError: If effect_name, theme, mode, fps, color_depth or fit is not recognized,
+            max_duration or max_characters is not positive, or speed_preference is
+            "budget" without a positive budget_seconds.
+        FileNotFoundError: If custom_file is specified but not found.
+    """
+    if max_duration is not None and max_duration <= 0:
+        raise ValueError(f"max_duration must be positive, got {max_duration}")
+    mode = _resolve_mode(mode)
+    rate = _frame_rate(fps, min_fps, max_fps)
+    color_depth = resolve_color_depth(color_depth)
+    started = time.monotonic()
+
+    prepared = _prepare_banner(
+        effect_name, speed_preference, theme, custom_text, custom_file,
+        fit, max_characters, budget_seconds,
+    )
+    handle = BannerHandle(BannerStats(prepared[1], prepared[2], mode))
+    if on_start is not None:
+        on_start(handle.stats)
+    handle._start(
+        prepared, hold_time, clear_after, use_cache, max_duration, started, mode, rate, color_depth,
+        stats=handle.stats, on_frame=on_frame, on_finish=on_finish,
+        skip_on_key=skip_on_key and mode == "animate",
+    )
+    return handle
+
+
+async def show_banner_async(
+    effect_name: Optional[str] = None,
+    speed_preference: str = "fast",
+    hold_time: float = 1.5,
+    clear_after: bool = False,
+    theme: Optional[str] = None,
+    custom_text: Optional[str] = None,
+    custom_file: Optional[str] = None,
+    use_cache: bool = False,
+    max_duration: Optional[float] = None,
+    mode: str = "auto",
+    fps: Union[int, str] = "auto",
+    min_fps: float = 10,
+    max_fps: Optional[float] = None,
+    color_depth: str = "auto",
+    fit: str = "crop",
+    max_characters: Optional[int] = None,
+    budget_seconds: Optional[float] = None,
+    skip_on_key: bool = True,
+    on_start: Optional[Callable[[BannerStats], None]] = None,
+    on_frame: Optional[FrameCallback] = None,
+    on_finish: Optional[Callable[[BannerStats], None]] = None,
+) -> BannerStats:
+    """
+    Display the banner from a coroutine without blocking the event loop.
+
+    Arguments are the same as show_banner() and use the same effect config.
+    Frames are generated in the loop's default executor and paced with
+    asyncio.sleep(). Cancelling the task snaps the banner to its final frame and
+    restores the terminal before CancelledError propagates.
+
+    Usage:
+        await show_banner_async(effect_name="decrypt")
+
+    Returns:
+        BannerStats, as for show_banner().
+
+    Raises:
+        ValueError: If effect_name, theme, mode, fps, color_depth or fit is not recognized,
+            max_duration or max_characters is not positive, or speed_preference is
+            "budget" without a positive budget_seconds.
+        FileNotFoundError: If custom_file is specified but not found.
+    """
+    # Imported here so importing hakcer does not pay for asyncio
+    import asyncio
+
+    if max_duration is not None and max_duration <= 0:
+        raise ValueError(f"max_duration must be positive, got {max_duration}")
+    mode = _resolve_mode(mode)
+    rate = _frame_rate(fps, min_fps, max_fps)
+    color_depth = resolve_color_depth(color_depth)
+    started = time.monotonic()
+    loop = asyncio.get_running_loop()
+
+    prepared = _prepare_banner(
+        effect_name, speed_preference, theme, custom_text, custom_file,
+        fit, max_characters, budget_seconds,
+    )
+    stats = BannerStats(prepared[1], prepared[2], mode)
+    if on_start is not None:
+        on_start(stats)
+    if mode != "animate":
+        rendering = time.perf_counter()
+        output = await loop.run_in_executor(None, _static_banner, prepared, mode, color_depth)
+        writing = time.perf_counter()
+        sys.stdout.write(output)
+        sys.stdout.flush()
+        write_seconds = time.perf_counter() - writing
+        stats.record_frame(writing - rendering, write_seconds, len(output.encode()), on_frame)
+        _finish_stats(stats, started, on_finish)
+        return stats
+
+    record = functools.partial(stats.record_frame, on_frame=on_frame)
+    with watch_keypress(skip_on_key) as pressed:
+        frames = await loop.run_in_executor(None, _banner_frames, *prepared[:4], use_cache, stats)
+        frames = quantize_frames(frames, color_depth)
+
+        deadline = None
+        if max_duration is not None:
+            # Count frames in advance, then thin them out to fit the time left
+            deadline = started + max_duration
+            frames = await loop.run_in_executor(None, collect_frames, frames, deadline)
+            frames = fit_frames_to_duration(frames, deadline - time.monotonic())
+
+        # Cancelling the task lands on the final frame without generating the rest
+        final = await loop.run_in_executor(None, _final_frame, *prepared[:3])
+        final = quantize_frame(final, color_depth)
+        top, left = prepared[4]
+        await play_frames_async(
+            frames, deadline=deadline, final=final, rate=rate, top=top, left=left,
+            stop=pressed, on_frame=record, on_skip=stats.record_skip,
+        )
+
+        if hold_time > 0 and pressed is None:
+            await asyncio.sleep(hold_time)
+        elif hold_time > 0:
+            held_until = time.monotonic() + hold_time
+            # A key press ends the hold; the event is polled since it can't be awaited
+            while not pressed.is_set() and time.monotonic() < held_until:
+                await asyncio.sleep(min(0.05, max(0.0, held_until - time.monotonic())))
 
     if clear_after:
         print("\033[2J\033[H", end="", flush=True)
+    _finish_stats(stats, started, on_finish)
+    return stats
 
 
 def list_effects() -> list[str]:
@@ -474,29 +851,65 @@ def list_effects() -> list[str]:
     return sorted(ALL_EFFECTS)
 
 
-def get_effects_by_speed(speed: str) -> list[str]:
+def get_effects_by_speed(speed: str, ascii_art: Optional[str] = None) -> list[str]:
     """
     Get effects filtered by speed category.
 
+    Categories come from the calibrated cost model, so they depend on the art
+    and the terminal size: an effect that is fast for a small logo can be slow
+    for a large one.
+
     Args:
         speed: Speed category ("fast", "medium", "slow").
+        ascii_art: Art to categorize for. The haKCer banner if None.
 
     Returns:
-        List of effect names in the specified speed category.
+        List of effect names in the specified speed category, fastest first.
 
     Raises:
         ValueError: If speed is not recognized.
     """
-    speed_map = {
-        "fast": FAST_EFFECTS,
-        "medium": MEDIUM_EFFECTS,
-        "slow": SLOW_EFFECTS,
-    }
-
-    if speed not in speed_map:
+    if speed not in SPEED_TIERS:
         raise ValueError(f"Unknown speed: {speed}. Use: fast, medium, slow")
 
-    return speed_map[speed]
+    art, _ = _layout_art(ascii_art if ascii_art is not None else HAKCER_ASCII)
+    return [name for _, name in effects_by_tier(ALL_EFFECTS, art)[speed]]
+
+
+def estimate_duration(
+    effect_name: str,
+    ascii_art: Optional[str] = None,
+    theme: Optional[str] = None,
+) -> Optional[float]:
+    """
+    Estimate how long an effect's animation takes, without running it.
+
+    Uses the calibrated cost model (see `hakcer calibrate`), which predicts
+    setup time, frame count and per-frame work from the art's character count
+    and canvas size. The art is laid out for the current terminal as
+    show_banner() would lay it out. Themes only change colors, so they do not
+    change the estimate.
+
+    Args:
+        effect_name: Effect to estimate.
+        ascii_art: Art to estimate for. The haKCer banner if None.
+        theme: Theme name. If None, uses current global theme.
+
+    Returns:
+        Estimated seconds, not counting hold_time, or None if the effect has
+        not been calibrated.
+
+    Raises:
+        ValueError: If effect_name or theme is not recognized.
+    """
+    if effect_name not in EFFECT_REGISTRY:
+        available = ", ".join(sorted(ALL_EFFECTS))
+        raise ValueError(f"Unknown effect: {effect_name}. Available: {available}")
+    get_theme(theme if theme is not None else get_current_theme_name())
+
+    art, _ = _layout_art(ascii_art if ascii_art is not None else HAKCER_ASCII)
+    seconds, _ = estimate_effects([effect_name], art)[0]
+    return None if seconds == float("inf") else seconds
 
 
 def set_theme(theme_name: str) -> None:
@@ -532,29 +945,76 @@ def get_current_theme() -> str:
     return get_current_theme_name()
 
 
-if __name__ == "__main__":
-    import sys
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    Command line entry point.
+
+    Usage:
+        hakcer                  # Random effect
+        hakcer <effect>         # Specific effect
+        hakcer list             # List effects
+        hakcer themes           # List themes
+        hakcer fast|medium|slow # List effects by speed
+        hakcer bench [...]      # Benchmark effects, see hakcer bench --help
+        hakcer calibrate [...]  # Measure effect costs on this machine
+        hakcer record <file>    # Record a banner, see hakcer record --help
+        hakcer play <file>      # Replay a recording
+        hakcer prerender [...]  # Render banners into the cache on all cores
+
+    Args:
+        argv: Arguments, without the program name. sys.argv[1:] if None.
 
-    if len(sys.argv) > 1:
-        if sys.argv[1] == "list":
+    Returns:
+        Process exit code.
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+
+    if len(argv) > 0:
+        if argv[0] == "list":
             print("Available effects:")
             for effect in list_effects():
                 print(f"  - {effect}")
-        elif sys.argv[1] == "themes":
+        elif argv[0] == "themes":
             print("Available themes:")
             from .themes import THEMES
             for theme_name, theme_data in sorted(THEMES.items()):
                 current = " (current)" if theme_name == get_current_theme() else ""
                 print(f"  - {theme_name}: {theme_data['description']}{current}")
-        elif sys.argv[1] in ["fast", "medium", "slow"]:
-            print(f"\n{sys.argv[1].upper()} effects:")
-            for effect in get_effects_by_speed(sys.argv[1]):
+        elif argv[0] in ["fast", "medium", "slow"]:
+            print(f"\n{argv[0].upper()} effects:")
+            for effect in get_effects_by_speed(argv[0]):
                 print(f"  - {effect}")
+        elif argv[0] == "bench":
+            from .bench import main as bench_main
+
+            return bench_main(argv[1:])
+        elif argv[0] == "calibrate":
+            from .costs import main as calibrate_main
+
+            return calibrate_main(argv[1:])
+        elif argv[0] == "record":
+            from .recording import main as record_main
+
+            return record_main(argv[1:])
+        elif argv[0] == "play":
+            from .recording import play_main
+
+            return play_main(argv[1:])
+        elif argv[0] == "prerender":
+            from .prerender import main as prerender_main
+
+            return prerender_main(argv[1:])
         else:
             try:
-                show_banner(effect_name=sys.argv[1])
+                show_banner(effect_name=argv[0])
             except ValueError as e:
                 print(f"Error: {e}")
-                sys.exit(1)
+                return 1
     else:
         show_banner()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
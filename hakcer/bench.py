@@ -0,0 +1,457 @@
+"""
+Headless benchmarks for haKCer banner effects.
+
+Runs effects against the built-in banner, the art files in custom_banners/
+and synthetic art of growing sizes without writing to the terminal, and
+records what each combination costs: frame count, generation and render time,
+bytes of escape output, peak memory and playback time at the default frame
+rate. Results can be written as JSON or CSV.
+
+Usage:
+    python -m hakcer.bench --effects decrypt wipe --json bench.json
+    hakcer bench --themes all --csv bench.csv
+"""
+
+import argparse
+import contextlib
+import csv
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Callable, Iterator, Optional, Sequence
+
+from .banner import HAKCER_ASCII, _banner_frames, _layout_art, list_effects
+from .cache import _tte_version
+from .playback import DEFAULT_FRAME_RATE, FramePlayer
+from .themes import THEMES, get_current_theme_name
+
+# (width, height) of the synthetic art blocks
+DEFAULT_SYNTHETIC_SIZES = ((20, 5), (40, 10), (80, 20))
+
+_SYNTHETIC_CHARS = "█▓▒░#@%*+=-:."
+
+
+@dataclass
+class BenchResult:
+    """
+    Measured cost of one effect, theme and art combination.
+
+    Attributes:
+        effect: Effect name.
+        theme: Theme name.
+        art: Name of the art source.
+        characters: Non-whitespace characters in the art.
+        art_width: Width of the widest line of the art, trimmed (see trim_art()).
+        art_height: Number of lines in the trimmed art.
+        columns: Terminal columns the effect was run with.
+        rows: Terminal rows the effect was run with.
+        frames: Number of frames generated.
+        first_frame_seconds: Time until the first frame (effect setup).
+        generation_seconds: Total time spent generating frames.
+        render_seconds: Time spent turning frames into terminal output.
+        output_bytes: Bytes of terminal output hakcer would write.
+        full_repaint_bytes: Bytes a full repaint of every frame would cost.
+        peak_memory_bytes: Peak traced memory while generating, or None if not measured.
+        playback_seconds: Animation length at the default frame rate.
+        truncated: Whether generation was cut short by the timeout.
+    """
+
+    effect: str
+    theme: str
+    art: str
+    characters: int
+    art_width: int
+    art_height: int
+    columns: int
+    rows: int
+    frames: int
+    first_frame_seconds: float
+    generation_seconds: float
+    render_seconds: float
+    output_bytes: int
+    full_repaint_bytes: int
+    peak_memory_bytes: Optional[int]
+    playback_seconds: float
+    truncated: bool
+
+
+def synthetic_art(width: int, height: int, seed: int = 0) -> str:
+    """
+    Generate a block of pseudo-random art.
+
+    Args:
+        width: Characters per line.
+        height: Number of lines.
+        seed: Random seed, so the same size always yields the same art.
+
+    Returns:
+        The generated art.
+    """
+    rng = random.Random(seed)
+    return "\n".join(
+        "".join(rng.choice(_SYNTHETIC_CHARS) for _ in range(width)) for _ in range(height)
+    )
+
+
+def default_art_sources(
+    art_dir: Optional[str] = None,
+    synthetic_sizes: Sequence[tuple[int, int]] = DEFAULT_SYNTHETIC_SIZES,
+) -> dict[str, str]:
+    """
+    Collect the art to benchmark.
+
+    Args:
+        art_dir: Directory of .txt art files. Defaults to ./custom_banners, or
+            the custom_banners directory of a source checkout.
+        synthetic_sizes: (width, height) of synthetic art blocks to add.
+
+    Returns:
+        Mapping of art name to art.
+    """
+    arts = {"hakcer": HAKCER_ASCII}
+
+    if art_dir is None:
+        bundled = Path(__file__).resolve().parent.parent / "custom_banners"
+        for candidate in (Path("custom_banners"), bundled):
+            if candidate.is_dir():
+                art_dir = str(candidate)
+                break
+    if art_dir is not None:
+        for path in sorted(Path(art_dir).glob("*.txt")):
+            arts[path.stem] = path.read_text(encoding="utf-8")
+
+    for width, height in synthetic_sizes:
+        arts[f"synthetic-{width}x{height}"] = synthetic_art(width, height)
+    return arts
+
+
+@contextlib.contextmanager
+def _terminal_size(columns: Optional[int], rows: Optional[int]) -> Iterator[tuple[int, int]]:
+    """Make shutil.get_terminal_size() report a fixed size for the duration."""
+    saved = {name: os.environ.get(name) for name in ("COLUMNS", "LINES")}
+    size = shutil.get_terminal_size()
+    columns = columns or size.columns
+    rows = rows or size.lines
+    os.environ["COLUMNS"] = str(columns)
+    os.environ["LINES"] = str(rows)
+    try:
+        yield columns, rows
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def _generate(frames, timeout: Optional[float], on_frame: Optional[Callable[[str], None]] = None):
+    """Consume frames, returning (count, first frame, generation and render seconds, truncated)."""
+    count = 0
+    first_frame = 0.0
+    render_time = 0.0
+    started = time.perf_counter()
+    truncated = False
+    for frame in frames:
+        count += 1
+        if count == 1:
+            first_frame = time.perf_counter() - started
+        if on_frame is not None:
+            render_started = time.perf_counter()
+            on_frame(frame)
+            render_time += time.perf_counter() - render_started
+        if timeout is not None and time.perf_counter() - started >= timeout:
+            truncated = True
+            close = getattr(frames, "close", None)
+            if close is not None:
+                close()
+            break
+    elapsed = time.perf_counter() - started - render_time
+    return count, first_frame, elapsed, render_time, truncated
+
+
+def bench_effect(
+    effect_name: str,
+    art: str,
+    theme_name: Optional[str] = None,
+    art_name: str = "custom",
+    columns: Optional[int] = None,
+    rows: Optional[int] = None,
+    timeout: Optional[float] = None,
+    measure_memory: bool = True,
+) -> BenchResult:
+    """
+    Run one effect headlessly and measure it.
+
+    The art is trimmed and placed for the terminal size as show_banner() would,
+    but never fitted to it (fit="none"): calibration measures art wider than
+    the terminal on purpose, and the cost model accounts for the clipping.
+    Peak memory is measured in a second run under tracemalloc, since tracing
+    slows generation down several times.
+
+    Args:
+        effect_name: Effect to run.
+        art: Art to animate.
+        theme_name: Theme to use. Current theme if None.
+        art_name: Name recorded for the art.
+        columns: Terminal columns to simulate. Current terminal if None.
+        rows: Terminal rows to simulate. Current terminal if None.
+        timeout: Stop generating after this many seconds and mark the result truncated.
+        measure_memory: Whether to measure peak memory.
+
+    Returns:
+        The measurements.
+
+    Raises:
+        ValueError: If effect_name or theme_name is not recognized.
+    """
+    if theme_name is None:
+        theme_name = get_current_theme_name()
+    if theme_name not in THEMES:
+        available = ", ".join(sorted(THEMES.keys()))
+        raise ValueError(f"Unknown theme: {theme_name}. Available: {available}")
+    if effect_name not in list_effects():
+        available = ", ".join(list_effects())
+        raise ValueError(f"Unknown effect: {effect_name}. Available: {available}")
+    theme_config = THEMES[theme_name]
+
+    with _terminal_size(columns, rows) as (columns, rows):
+        trimmed, (top, left) = _layout_art(art, "none")
+        player = FramePlayer(frame_rate=0, top=top, left=left)
+        output_bytes = 0
+
+        def render(frame: str) -> None:
+            nonlocal output_bytes
+            output_bytes += len(player.draw(frame).encode("utf-8"))
+
+        frames = _banner_frames(trimmed, effect_name, theme_name, theme_config, use_cache=False)
+        count, first_frame, generation, render_time, truncated = _generate(frames, timeout, render)
+        output_bytes += len(player.close().encode("utf-8"))
+
+        peak_memory = None
+        if measure_memory:
+            tracemalloc.start()
+            try:
+                frames = _banner_frames(
+                    trimmed, effect_name, theme_name, theme_config, use_cache=False
+                )
+                _generate(frames, timeout)
+                peak_memory = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+    lines = trimmed.split("\n")
+    return BenchResult(
+        effect=effect_name,
+        theme=theme_name,
+        art=art_name,
+        characters=sum(1 for char in art if not char.isspace()),
+        art_width=max((len(line.rstrip()) for line in lines), default=0),
+        art_height=len(lines),
+        columns=columns,
+        rows=rows,
+        frames=count,
+        first_frame_seconds=round(first_frame, 6),
+        generation_seconds=round(generation, 6),
+        render_seconds=round(render_time, 6),
+        output_bytes=output_bytes,
+        full_repaint_bytes=sum(player.renderer.full_frame_bytes),
+        peak_memory_bytes=peak_memory,
+        playback_seconds=round(count / DEFAULT_FRAME_RATE, 3),
+        truncated=truncated,
+    )
+
+
+def run_benchmarks(
+    effects: Optional[Sequence[str]] = None,
+    themes: Optional[Sequence[str]] = None,
+    arts: Optional[dict[str, str]] = None,
+    columns: Optional[int] = None,
+    rows: Optional[int] = None,
+    timeout: Optional[float] = None,
+    measure_memory: bool = True,
+    progress: Optional[Callable[[BenchResult], None]] = None,
+) -> list[BenchResult]:
+    """
+    Benchmark every combination of effect, theme and art.
+
+    Args:
+        effects: Effects to run. All effects if None.
+        themes: Themes to run. Current theme if None.
+        arts: Mapping of art name to art. default_art_sources() if None.
+        columns: Terminal columns to simulate. Current terminal if None.
+        rows: Terminal rows to simulate. Current terminal if None.
+        timeout: Per-run generation limit in seconds.
+        measure_memory: Whether to measure peak memory.
+        progress: Called with each result as soon as it is measured.
+
+    Returns:
+        One result per combination.
+    """
+    effects = list(effects) if effects else list_effects()
+    themes = list(themes) if themes else [get_current_theme_name()]
+    arts = arts if arts is not None else default_art_sources()
+
+    results = []
+    for theme_name in themes:
+        for art_name, art in arts.items():
+            for effect_name in effects:
+                result = bench_effect(
+                    effect_name,
+                    art,
+                    theme_name=theme_name,
+                    art_name=art_name,
+                    columns=columns,
+                    rows=rows,
+                    timeout=timeout,
+                    measure_memory=measure_memory,
+                )
+                results.append(result)
+                if progress is not None:
+                    progress(result)
+    return results
+
+
+def _report_metadata() -> dict:
+    from . import __version__
+
+    return {
+        "hakcer": __version__,
+        "terminaltexteffects": _tte_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "frame_rate": DEFAULT_FRAME_RATE,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def write_json(results: Sequence[BenchResult], path: str) -> None:
+    """
+    Write results as a JSON report.
+
+    Args:
+        results: Results from run_benchmarks().
+        path: Output file path.
+    """
+    report = {"meta": _report_metadata(), "results": [asdict(result) for result in results]}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
+
+
+def write_csv(results: Sequence[BenchResult], path: str) -> None:
+    """
+    Write results as CSV, one row per result.
+
+    Args:
+        results: Results from run_benchmarks().
+        path: Output file path.
+    """
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=[field.name for field in fields(BenchResult)])
+        writer.writeheader()
+        for result in results:
+            writer.writerow(asdict(result))
+
+
+def _print_result(result: BenchResult) -> None:
+    memory = "      -  "
+    if result.peak_memory_bytes is not None:
+        memory = f"{result.peak_memory_bytes / 1_000_000:7.1f}MB"
+    truncated = " (truncated)" if result.truncated else ""
+    print(
+        f"{result.effect:<16} {result.theme:<18} {result.art:<20} "
+        f"{result.frames:>6} frames {result.generation_seconds:>8.2f}s gen "
+        f"{result.output_bytes / 1_000_000:>8.2f}MB out {memory} "
+        f"{result.playback_seconds:>7.2f}s play{truncated}",
+        flush=True,
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Command line entry point for the benchmarks.
+
+    Args:
+        argv: Arguments, without the program name. sys.argv[1:] if None.
+
+    Returns:
+        Process exit code.
+    """
+    parser = argparse.ArgumentParser(
+        prog="hakcer bench", description="Benchmark haKCer effects without drawing them."
+    )
+    parser.add_argument(
+        "--effects", nargs="+", metavar="EFFECT", help="effects to run (default: all)"
+    )
+    parser.add_argument(
+        "--themes",
+        nargs="+",
+        metavar="THEME",
+        help='themes to run, or "all" (default: current theme)',
+    )
+    parser.add_argument("--art-dir", help="directory of .txt art files (default: custom_banners/)")
+    parser.add_argument(
+        "--sizes",
+        nargs="*",
+        metavar="COLSxROWS",
+        help="synthetic art sizes (default: %s)"
+        % " ".join(f"{w}x{h}" for w, h in DEFAULT_SYNTHETIC_SIZES),
+    )
+    parser.add_argument(
+        "--columns", type=int, help="terminal columns to simulate (default: current)"
+    )
+    parser.add_argument("--rows", type=int, help="terminal rows to simulate (default: current)")
+    parser.add_argument("--timeout", type=float, help="stop each run after this many seconds")
+    parser.add_argument("--no-memory", action="store_true", help="skip the peak memory measurement")
+    parser.add_argument("--json", metavar="PATH", help="write a JSON report")
+    parser.add_argument("--csv", metavar="PATH", help="write a CSV report")
+    args = parser.parse_args(argv)
+
+    themes = args.themes
+    if themes == ["all"]:
+        themes = sorted(THEMES.keys())
+
+    sizes = DEFAULT_SYNTHETIC_SIZES
+    if args.sizes is not None:
+        sizes = []
+        for size in args.sizes:
+            parts = size.lower().split("x")
+            try:
+                width, height = (int(part) for part in parts)
+            except ValueError:
+                width = height = 0
+            if width < 1 or height < 1:
+                parser.error(f"--sizes expects COLSxROWS, got {size!r}")
+            sizes.append((width, height))
+
+    try:
+        results = run_benchmarks(
+            effects=args.effects,
+            themes=themes,
+            arts=default_art_sources(args.art_dir, sizes),
+            columns=args.columns,
+            rows=args.rows,
+            timeout=args.timeout,
+            measure_memory=not args.no_memory,
+            progress=_print_result,
+        )
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        write_json(results, args.json)
+    if args.csv:
+        write_csv(results, args.csv)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+"""
+On-disk frame cache for haKCer banners.
+
+Rendering an effect is deterministic enough for a given art, effect, theme and
+terminal size that the resulting frames can be stored once and played back on
+later runs instead of being recomputed. The cache is opt-in (see
+show_banner(use_cache=True)) and lives under the user cache directory.
+
+Each entry is a gzip file holding one JSON-encoded frame per line, so frames
+can be written while the banner is playing and streamed back on a hit without
+holding the whole animation in memory.
+"""
+
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+# Bump when the on-disk format or the meaning of the key changes
+CACHE_FORMAT_VERSION = 2
+
+_FRAME_FILE_SUFFIX = ".frames.gz"
+
+
+def get_cache_dir() -> Path:
+    """
+    Get the directory used for cached banner frames.
+
+    Uses $HAKCER_CACHE_DIR if set, otherwise the platform user cache directory.
+
+    Returns:
+        Path to the frame cache directory (not created).
+    """
+    override = os.environ.get("HAKCER_CACHE_DIR")
+    if override:
+        return Path(override).expanduser()
+
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "hakcer" / "frames"
+
+
+def _tte_version() -> str:
+    """Get the installed terminaltexteffects version without importing it."""
+    try:
+        from importlib.metadata import version
+
+        return version("terminaltexteffects")
+    except Exception:
+        return "unknown"
+
+
+def frame_cache_key(ascii_art: str, effect_name: str, theme_colors: dict, effect_config) -> str:
+    """
+    Build the cache key for a rendered banner.
+
+    Args:
+        ascii_art: The centered art passed to the effect.
+        effect_name: Name of the effect.
+        theme_colors: The theme's "colors" mapping.
+        effect_config: JSON-serializable description of the effect settings.
+
+    Returns:
+        Hex digest identifying the rendered frames.
+    """
+    import hashlib
+
+    size = shutil.get_terminal_size()
+    payload = json.dumps(
+        {
+            "format": CACHE_FORMAT_VERSION,
+            "tte": _tte_version(),
+            "art": ascii_art,
+            "effect": effect_name,
+            "colors": theme_colors,
+            "config": effect_config,
+            "columns": size.columns,
+            "rows": size.lines,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _frame_file(key: str) -> Path:
+    return get_cache_dir() / f"{key}{_FRAME_FILE_SUFFIX}"
+
+
+def load_frames(key: str) -> Optional[Iterator[str]]:
+    """
+    Open cached frames for a key.
+
+    Args:
+        key: Key from frame_cache_key().
+
+    Returns:
+        Iterator over the cached frames, or None on a cache miss.
+    """
+    import gzip
+
+    path = _frame_file(key)
+    try:
+        handle = gzip.open(path, "rt", encoding="utf-8")
+    except OSError:
+        return None
+    return _read_frames(path, handle)
+
+
+def _read_frames(path: Path, handle) -> Iterator[str]:
+    corrupt = False
+    with handle:
+        try:
+            for line in handle:
+                yield json.loads(line)
+        except (OSError, EOFError, ValueError):
+            corrupt = True
+    if corrupt:
+        # Drop the entry so the next run regenerates it
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+def store_frames(key: str, frames: Iterable[str]) -> Iterator[str]:
+    """
+    Pass frames through while writing them to the cache.
+
+    The entry only becomes visible once every frame has been consumed, so an
+    interrupted banner never leaves a truncated entry behind. Cache write
+    failures are ignored; the frames are still yielded.
+
+    Args:
+        key: Key from frame_cache_key().
+        frames: Frames to cache.
+
+    Yields:
+        The same frames, unchanged.
+    """
+    import gzip
+    import tempfile
+
+    path = _frame_file(key)
+    tmp_name = None
+    writer = None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        os.close(fd)
+        writer = gzip.open(tmp_name, "wt", compresslevel=1, encoding="utf-8")
+    except OSError:
+        pass
+
+    completed = False
+    try:
+        for frame in frames:
+            if writer is not None:
+                try:
+                    writer.write(json.dumps(frame) + "\n")
+                except OSError:
+                    writer.close()
+                    writer = None
+            yield frame
+        completed = writer is not None
+    finally:
+        try:
+            if writer is not None:
+                writer.close()
+            if tmp_name:
+                if completed:
+                    os.replace(tmp_name, path)
+                else:
+                    os.unlink(tmp_name)
+        except OSError:
+            pass
+
+
+def clear_frame_cache() -> int:
+    """
+    Delete all cached banner frames.
+
+    Returns:
+        Number of cache entries removed.
+    """
+    removed = 0
+    cache_dir = get_cache_dir()
+    if not cache_dir.is_dir():
+        return 0
+    for entry in cache_dir.glob(f"*{_FRAME_FILE_SUFFIX}"):
+        try:
+            entry.unlink()
+            removed += 1
+        except OSError:
+            pass
+    return removed
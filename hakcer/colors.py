@@ -0,0 +1,175 @@
+"""
+Terminal color depth detection and color quantization.
+
+terminaltexteffects writes every color as a 24-bit SGR sequence. Terminals
+without truecolor support show those wrongly or not at all, and the sequences
+are long. Frames can be rewritten to use the nearest color of the xterm
+256-color or the 16-color ANSI palette instead.
+"""
+
+import os
+import re
+from typing import Iterable, Mapping, Optional
+
+COLOR_DEPTHS = ("auto", "truecolor", "256", "16")
+
+# xterm's default RGB values for the 16 ANSI colors
+ANSI_16_PALETTE = (
+    (0, 0, 0), (205, 0, 0), (0, 205, 0), (205, 205, 0),
+    (0, 0, 238), (205, 0, 205), (0, 205, 205), (229, 229, 229),
+    (127, 127, 127), (255, 0, 0), (0, 255, 0), (255, 255, 0),
+    (92, 92, 255), (255, 0, 255), (0, 255, 255), (255, 255, 255),
+)
+
+# Channel levels of the xterm 6x6x6 color cube (indices 16-231)
+_CUBE_LEVELS = (0, 95, 135, 175, 215, 255)
+
+# Foreground (38) or background (48) 24-bit color
+_TRUECOLOR_SGR = re.compile(r"\x1b\[([34])8;2;(\d+);(\d+);(\d+)m")
+
+# Depth -> {24-bit sequence: quantized sequence}, shared by all themes and
+# filled as colors are first seen; a banner only uses a few dozen colors
+_tables: dict[str, dict[str, str]] = {"256": {}, "16": {}}
+
+
+def detect_color_depth(environ: Optional[Mapping[str, str]] = None) -> str:
+    """
+    Detect the color depth of the terminal.
+
+    COLORTERM=truecolor (or 24bit) and TERM=*-direct mean 24-bit color,
+    TERM=*256color* means the xterm 256-color palette, and any other TERM
+    the 16 ANSI colors.
+
+    Args:
+        environ: Environment to inspect. os.environ if None.
+
+    Returns:
+        "truecolor", "256" or "16".
+    """
+    if environ is None:
+        environ = os.environ
+    if environ.get("COLORTERM", "").lower() in ("truecolor", "24bit"):
+        return "truecolor"
+    term = environ.get("TERM", "").lower()
+    if term.endswith("-direct"):
+        return "truecolor"
+    if "256color" in term:
+        return "256"
+    if term:
+        return "16"
+    # No TERM: Windows consoles have supported 24-bit color since Windows 10
+    return "truecolor" if os.name == "nt" else "16"
+
+
+def resolve_color_depth(color_depth: str) -> str:
+    """
+    Resolve a color depth, turning "auto" into the detected one.
+
+    Raises:
+        ValueError: If color_depth is not recognized.
+    """
+    if color_depth not in COLOR_DEPTHS:
+        raise ValueError(f"Unknown color depth: {color_depth}. Use: {', '.join(COLOR_DEPTHS)}")
+    if color_depth == "auto":
+        return detect_color_depth()
+    return color_depth
+
+
+def _distance(a: tuple[int, int, int], b: tuple[int, int, int]) -> int:
+    """Perceptually weighted squared distance between two RGB colors ("redmean")."""
+    red_mean = (a[0] + b[0]) // 2
+    dr, dg, db = a[0] - b[0], a[1] - b[1], a[2] - b[2]
+    return (((512 + red_mean) * dr * dr) >> 8) + 4 * dg * dg + (((767 - red_mean) * db * db) >> 8)
+
+
+def xterm_256_index(rgb: tuple[int, int, int]) -> int:
+    """
+    Find the nearest color of the xterm 256-color palette.
+
+    Only the color cube and the grayscale ramp are considered; the first 16
+    entries are left out because terminals customize them.
+
+    Args:
+        rgb: Color as (red, green, blue).
+
+    Returns:
+        Palette index between 16 and 255.
+    """
+    levels = [
+        min(range(6), key=lambda level: abs(_CUBE_LEVELS[level] - channel)) for channel in rgb
+    ]
+    cube = tuple(_CUBE_LEVELS[level] for level in levels)
+    cube_index = 16 + 36 * levels[0] + 6 * levels[1] + levels[2]
+
+    gray_step = min(23, max(0, round((sum(rgb) / 3 - 8) / 10)))
+    gray = (8 + 10 * gray_step,) * 3
+    if _distance(rgb, gray) < _distance(rgb, cube):
+        return 232 + gray_step
+    return cube_index
+
+
+def ansi_16_index(rgb: tuple[int, int, int]) -> int:
+    """
+    Find the nearest of the 16 ANSI colors.
+
+    Args:
+        rgb: Color as (red, green, blue).
+
+    Returns:
+        Color index between 0 and 15.
+    """
+    return min(range(16), key=lambda index: _distance(rgb, ANSI_16_PALETTE[index]))
+
+
+def _quantized_sequence(match: re.Match, depth: str) -> str:
+    """Build the replacement for one 24-bit color sequence."""
+    layer = match.group(1)
+    rgb = (int(match.group(2)), int(match.group(3)), int(match.group(4)))
+    if depth == "256":
+        return f"\x1b[{layer}8;5;{xterm_256_index(rgb)}m"
+    index = ansi_16_index(rgb)
+    # 30-37/40-47 for the normal colors, 90-97/100-107 for the bright ones
+    base = (30 if layer == "3" else 40) if index < 8 else (90 if layer == "3" else 100)
+    return f"\x1b[{base + index % 8}m"
+
+
+def quantize_frame(frame: str, color_depth: str) -> str:
+    """
+    Rewrite the 24-bit colors in a frame for a lower color depth.
+
+    Args:
+        frame: Frame or other output with 24-bit SGR color sequences.
+        color_depth: "truecolor", "256" or "16".
+
+    Returns:
+        The frame with each color replaced by its nearest palette color.
+        Unchanged for "truecolor".
+    """
+    if color_depth == "truecolor":
+        return frame
+    table = _tables[color_depth]
+
+    def replace(match: re.Match) -> str:
+        sequence = match.group(0)
+        quantized = table.get(sequence)
+        if quantized is None:
+            quantized = table[sequence] = _quantized_sequence(match, color_depth)
+        return quantized
+
+    return _TRUECOLOR_SGR.sub(replace, frame)
+
+
+def quantize_frames(frames: Iterable[str], color_depth: str) -> Iterable[str]:
+    """
+    Rewrite the colors of a stream of frames, see quantize_frame().
+
+    Args:
+        frames: Frames to rewrite.
+        color_depth: "truecolor", "256" or "16".
+
+    Returns:
+        The frames, rewritten lazily. The input itself for "truecolor".
+    """
+    if color_depth == "truecolor":
+        return frames
+    return (quantize_frame(frame, color_depth) for frame in frames)
@@ -0,0 +1,477 @@
+"""
+Cost model for haKCer banner effects.
+
+How long a banner takes depends on the effect, the art and the terminal. An
+effect's setup time, the number of frames it produces and the cost of each
+frame all grow with the number of characters in the art and with the size of
+the canvas they are drawn on. The model fits each of those per effect as
+
+    value = base + per_char * characters + per_cell * cells
+
+from headless benchmark runs (see hakcer.bench), and is stored as a
+calibration file. A calibration measured by the maintainers ships with the
+package; `hakcer calibrate` measures the local machine and saves its own, which
+then takes precedence.
+"""
+
+import json
+import os
+import shutil
+import sys
+from pathlib import Path
+from typing import Callable, Optional, Sequence
+
+from .art import trim_art
+from .playback import DEFAULT_FRAME_RATE
+
+CALIBRATION_VERSION = 1
+
+SHIPPED_CALIBRATION = Path(__file__).with_name("calibration.json")
+
+# Terminal widths and synthetic art sizes (width, height) measured by calibrate()
+CALIBRATION_COLUMNS = (80, 160)
+CALIBRATION_SIZES = ((20, 5), (40, 10), (80, 20))
+
+SPEED_TIERS = ("fast", "medium", "slow")
+
+# Longest estimated banner, in seconds, that still counts as each tier
+TIER_LIMITS = {"fast": 3.0, "medium": 10.0}
+
+_calibration: Optional[dict] = None
+
+
+def get_local_calibration_path() -> Path:
+    """
+    Get the path of the calibration measured on this machine.
+
+    Uses $HAKCER_CALIBRATION if set, otherwise the platform user config directory.
+
+    Returns:
+        Path to the local calibration file (may not exist).
+    """
+    override = os.environ.get("HAKCER_CALIBRATION")
+    if override:
+        return Path(override).expanduser()
+
+    if os.name == "nt":
+        base = os.environ.get("APPDATA") or Path.home() / "AppData" / "Roaming"
+    else:
+        base = os.environ.get("XDG_CONFIG_HOME") or Path.home() / ".config"
+    return Path(base) / "hakcer" / "calibration.json"
+
+
+def _read_calibration(path: Path) -> Optional[dict]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != CALIBRATION_VERSION:
+        return None
+    return data
+
+
+def load_calibration() -> dict:
+    """
+    Load the cost model.
+
+    The shipped calibration is loaded first, and effects measured locally
+    replace their shipped entries. The result is cached; call
+    reload_calibration() after recalibrating.
+
+    Returns:
+        Calibration data with an "effects" mapping of effect name to model.
+    """
+    global _calibration
+    if _calibration is None:
+        calibration = _read_calibration(SHIPPED_CALIBRATION) or {"version": CALIBRATION_VERSION}
+        effects = dict(calibration.get("effects", {}))
+        local = _read_calibration(get_local_calibration_path())
+        if local is not None:
+            effects.update(local.get("effects", {}))
+            calibration = dict(local)
+        calibration["effects"] = effects
+        _calibration = calibration
+    return _calibration
+
+
+def reload_calibration() -> dict:
+    """Discard the cached cost model and load it again."""
+    global _calibration
+    _calibration = None
+    return load_calibration()
+
+
+def canvas_cells(columns: int, width: int, height: int) -> int:
+    """
+    Get the number of canvas cells an art block occupies.
+
+    Effects get the art trimmed to its visible characters and the centering
+    is applied when drawing (see trim_art()), so the canvas is the art's
+    bounding box, clipped to the terminal.
+
+    Args:
+        columns: Terminal columns.
+        width: Width of the trimmed art.
+        height: Number of lines of the trimmed art.
+
+    Returns:
+        Cells of the canvas terminaltexteffects draws.
+    """
+    return min(columns, width) * height
+
+
+def art_metrics(ascii_art: str, columns: Optional[int] = None) -> tuple[int, int]:
+    """
+    Measure art for the cost model.
+
+    Args:
+        ascii_art: The art, before or after centering.
+        columns: Terminal columns. Current terminal if None.
+
+    Returns:
+        Tuple of (non-whitespace characters, canvas cells).
+    """
+    if columns is None:
+        columns = shutil.get_terminal_size().columns
+    lines = trim_art(ascii_art)[0].split("\n")
+    width = max(len(line) for line in lines)
+    characters = sum(1 for char in ascii_art if not char.isspace())
+    return characters, canvas_cells(columns, width, len(lines))
+
+
+def _predict(coefficients: Sequence[float], characters: int, cells: int) -> float:
+    base, per_char, per_cell = coefficients
+    return base + per_char * characters + per_cell * cells
+
+
+def estimate_seconds(
+    effect_name: str, characters: int, cells: int, frame_rate: int = DEFAULT_FRAME_RATE
+) -> Optional[float]:
+    """
+    Estimate how long an effect takes to play.
+
+    Frames are paced at frame_rate, but a frame can't be shown before it has
+    been generated, so each frame takes the longer of the two.
+
+    Args:
+        effect_name: Effect to estimate.
+        characters: Non-whitespace characters in the art.
+        cells: Canvas cells, see canvas_cells().
+        frame_rate: Playback frames per second.
+
+    Returns:
+        Estimated seconds, or None if the effect has not been calibrated.
+    """
+    model = load_calibration()["effects"].get(effect_name)
+    if model is None:
+        return None
+    setup = max(0.0, _predict(model["setup"], characters, cells))
+    frames = max(1.0, _predict(model["frames"], characters, cells))
+    frame_cost = max(0.0, _predict(model["frame_cost"], characters, cells))
+    frame_delay = 1 / frame_rate if frame_rate > 0 else 0.0
+    return setup + frames * max(frame_delay, frame_cost)
+
+
+def speed_tier(seconds: Optional[float]) -> str:
+    """
+    Get the speed tier of an estimated duration.
+
+    Args:
+        seconds: Estimated seconds. None (not calibrated) counts as slow.
+
+    Returns:
+        "fast", "medium" or "slow".
+    """
+    if seconds is None:
+        return "slow"
+    for tier in ("fast", "medium"):
+        if seconds <= TIER_LIMITS[tier]:
+            return tier
+    return "slow"
+
+
+def estimate_effects(
+    effects: Sequence[str], ascii_art: str, columns: Optional[int] = None
+) -> list[tuple[float, str]]:
+    """
+    Estimate how long each effect takes to play a particular art.
+
+    Args:
+        effects: Effects to estimate.
+        ascii_art: The art the banner will show.
+        columns: Terminal columns. Current terminal if None.
+
+    Returns:
+        (estimated seconds, effect name) pairs, cheapest first. Uncalibrated
+        effects have an estimate of infinity.
+    """
+    characters, cells = art_metrics(ascii_art, columns)
+    estimates = []
+    for effect_name in effects:
+        seconds = estimate_seconds(effect_name, characters, cells)
+        estimates.append((float("inf") if seconds is None else seconds, effect_name))
+    estimates.sort()
+    return estimates
+
+
+def effects_by_tier(
+    effects: Sequence[str], ascii_art: str, columns: Optional[int] = None
+) -> dict[str, list[tuple[float, str]]]:
+    """
+    Sort effects into speed tiers for a particular art.
+
+    Args:
+        effects: Effects to sort.
+        ascii_art: The art the banner will show.
+        columns: Terminal columns. Current terminal if None.
+
+    Returns:
+        Mapping of tier to (estimated seconds, effect name) pairs, cheapest
+        first. Uncalibrated effects are slow, with an estimate of infinity.
+    """
+    tiers = {tier: [] for tier in SPEED_TIERS}
+    for seconds, effect_name in estimate_effects(effects, ascii_art, columns):
+        tiers[speed_tier(seconds)].append((seconds, effect_name))
+    return tiers
+
+
+def _solve(matrix: list[list[float]], vector: list[float]) -> Optional[list[float]]:
+    """Solve a small linear system by Gaussian elimination, or None if singular."""
+    size = len(vector)
+    rows = [matrix[i][:] + [vector[i]] for i in range(size)]
+    for col in range(size):
+        pivot = max(range(col, size), key=lambda row: abs(rows[row][col]))
+        if abs(rows[pivot][col]) < 1e-12:
+            return None
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        for row in range(size):
+            if row != col:
+                factor = rows[row][col] / rows[col][col]
+                rows[row] = [a - factor * b for a, b in zip(rows[row], rows[col])]
+    return [rows[i][size] / rows[i][i] for i in range(size)]
+
+
+def fit_linear(points: Sequence[tuple[int, int, float]]) -> list[float]:
+    """
+    Least-squares fit of value = base + per_char * characters + per_cell * cells.
+
+    Costs never shrink as art grows, so fits with a negative per_char or
+    per_cell term are rejected in favour of fits with fewer terms, as are fits
+    the points can't determine.
+
+    Args:
+        points: (characters, cells, value) measurements.
+
+    Returns:
+        [base, per_char, per_cell].
+    """
+    if not points:
+        return [0.0, 0.0, 0.0]
+    # Try all terms, then characters only, then cells only, then a constant
+    for terms in ((0, 1, 2), (0, 1), (0, 2), (0,)):
+        features = [
+            [(1.0, float(chars), float(cells))[term] for term in terms]
+            for chars, cells, _ in points
+        ]
+        if len(points) < len(terms):
+            continue
+        size = range(len(terms))
+        normal = [[sum(f[i] * f[j] for f in features) for j in size] for i in size]
+        rhs = [sum(f[i] * value for f, (_, _, value) in zip(features, points)) for i in size]
+        solution = _solve(normal, rhs)
+        if solution is not None and all(value >= 0 for value in solution[1:]):
+            coefficients = [0.0, 0.0, 0.0]
+            for term, value in zip(terms, solution):
+                coefficients[term] = value
+            return coefficients
+    return [0.0, 0.0, 0.0]
+
+
+def fit_effect_model(results) -> dict:
+    """
+    Fit an effect's cost model from its benchmark results.
+
+    Args:
+        results: BenchResult objects for a single effect.
+
+    Returns:
+        Model with "setup", "frames" and "frame_cost" coefficients.
+    """
+    setup, frames, frame_cost = [], [], []
+    complete = [result for result in results if not result.truncated]
+    for result in results:
+        cells = canvas_cells(result.columns, result.art_width, result.art_height)
+        setup.append((result.characters, cells, result.first_frame_seconds))
+        if result.frames > 1:
+            work = result.generation_seconds - result.first_frame_seconds + result.render_seconds
+            frame_cost.append((result.characters, cells, work / (result.frames - 1)))
+        # Truncated runs only give a lower bound on the frame count
+        if result in complete or not complete:
+            frames.append((result.characters, cells, float(result.frames)))
+
+    return {
+        "setup": fit_linear(setup),
+        "frames": fit_linear(frames),
+        "frame_cost": fit_linear(frame_cost),
+        "truncated": not complete,
+    }
+
+
+def calibrate(
+    effects: Optional[Sequence[str]] = None,
+    columns: Sequence[int] = CALIBRATION_COLUMNS,
+    sizes: Sequence[tuple[int, int]] = CALIBRATION_SIZES,
+    timeout: Optional[float] = 20.0,
+    progress: Optional[Callable] = None,
+    on_error: Optional[Callable] = None,
+) -> dict:
+    """
+    Measure effects on this machine and fit their cost models.
+
+    A run that raises is left out of the fit, so one effect failing on one
+    art size does not lose the whole calibration. An effect with no
+    successful runs is left out of the result.
+
+    Args:
+        effects: Effects to measure. All effects if None.
+        columns: Terminal widths to measure at.
+        sizes: (width, height) of the synthetic art to measure with.
+        timeout: Per-run generation limit in seconds.
+        progress: Called with each BenchResult as it is measured.
+        on_error: Called with (effect, art name, columns, exception) for each
+            run that raised.
+
+    Returns:
+        Calibration data, ready for save_calibration().
+
+    Raises:
+        ValueError: If an effect name is not recognized.
+    """
+    from .banner import list_effects
+    from .bench import _report_metadata, bench_effect, synthetic_art
+
+    effects = list(effects) if effects else list_effects()
+    unknown = [name for name in effects if name not in list_effects()]
+    if unknown:
+        available = ", ".join(list_effects())
+        raise ValueError(f"Unknown effect: {', '.join(unknown)}. Available: {available}")
+
+    arts = {f"synthetic-{width}x{height}": synthetic_art(width, height) for width, height in sizes}
+    rows = max(height for _, height in sizes) + 2
+    results = []
+    for width in columns:
+        for art_name, art in arts.items():
+            for effect_name in effects:
+                try:
+                    result = bench_effect(
+                        effect_name,
+                        art,
+                        art_name=art_name,
+                        columns=width,
+                        rows=rows,
+                        timeout=timeout,
+                        measure_memory=False,
+                    )
+                except Exception as e:
+                    if on_error is not None:
+                        on_error(effect_name, art_name, width, e)
+                    continue
+                results.append(result)
+                if progress is not None:
+                    progress(result)
+
+    by_effect = {}
+    for result in results:
+        by_effect.setdefault(result.effect, []).append(result)
+
+    return {
+        "version": CALIBRATION_VERSION,
+        "machine": _report_metadata(),
+        "effects": {name: fit_effect_model(runs) for name, runs in sorted(by_effect.items())},
+    }
+
+
+def save_calibration(calibration: dict, path: Optional[Path] = None) -> Path:
+    """
+    Write calibration data and make it the active cost model.
+
+    Effects already in the file that were not measured this time are kept.
+
+    Args:
+        calibration: Result of calibrate().
+        path: Destination. get_local_calibration_path() if None.
+
+    Returns:
+        The path written.
+    """
+    if path is None:
+        path = get_local_calibration_path()
+    path = Path(path)
+    existing = _read_calibration(path)
+    if existing is not None:
+        effects = {**existing.get("effects", {}), **calibration["effects"]}
+        calibration = dict(calibration, effects=effects)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(calibration, f, indent=2, sort_keys=True)
+        f.write("\n")
+    reload_calibration()
+    return path
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Command line entry point for recalibrating the cost model.
+
+    Args:
+        argv: Arguments, without the program name. sys.argv[1:] if None.
+
+    Returns:
+        Process exit code.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="hakcer calibrate", description="Measure effect costs on this machine."
+    )
+    parser.add_argument(
+        "--effects", nargs="+", metavar="EFFECT", help="effects to measure (default: all)"
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=20.0, help="per-run limit in seconds (default: 20)"
+    )
+    parser.add_argument(
+        "--output",
+        metavar="PATH",
+        help=f"where to save (default: {get_local_calibration_path()})",
+    )
+    args = parser.parse_args(argv)
+
+    from .bench import _print_result
+
+    def report_error(effect_name: str, art_name: str, columns: int, error: Exception) -> None:
+        print(
+            f"Skipped {effect_name} on {art_name} at {columns} columns: "
+            f"{type(error).__name__}: {error}",
+            file=sys.stderr,
+        )
+
+    try:
+        calibration = calibrate(
+            effects=args.effects,
+            timeout=args.timeout,
+            progress=_print_result,
+            on_error=report_error,
+        )
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    path = save_calibration(calibration, Path(args.output) if args.output else None)
+    print(f"Saved calibration to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
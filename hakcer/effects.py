@@ -0,0 +1,402 @@
+"""
+Effect registry for haKCer banner effects.
+
+Each effect is registered with a declarative spec: the module path and class
+name of its terminaltexteffects implementation, plus the settings applied to
+its config class. Settings are typed values or references to theme colors, and
+are validated once when the effect is registered. Modules are imported the
+first time an effect is actually run, so listing or categorizing effects never
+imports terminaltexteffects.
+"""
+
+import dataclasses
+import importlib
+from dataclasses import dataclass
+from typing import Optional, Union
+
+# Color roles every theme defines under "colors"
+THEME_COLOR_ROLES = ("primary", "accent", "error", "gradient_stops", "beam_colors")
+
+
+@dataclass(frozen=True)
+class ThemeColors:
+    """
+    Reference to colors of the active theme.
+
+    Attributes:
+        sources: (role, index) pairs, in order. An index of None takes every
+            color of the role.
+        single: Resolve to one color instead of a tuple of colors.
+    """
+
+    sources: tuple[tuple[str, Optional[int]], ...]
+    single: bool = False
+
+    def resolve(self, colors: dict) -> Union[str, tuple[str, ...]]:
+        """
+        Look up the referenced colors in a theme.
+
+        Args:
+            colors: The theme's "colors" mapping.
+
+        Returns:
+            A hex color if single, otherwise a tuple of hex colors.
+        """
+        hex_colors = []
+        for role, index in self.sources:
+            if index is None:
+                hex_colors.extend(colors[role])
+            else:
+                hex_colors.append(colors[role][index])
+        return hex_colors[0] if self.single else tuple(hex_colors)
+
+
+def palette(*sources: Union[str, tuple[str, int]]) -> ThemeColors:
+    """
+    Reference a sequence of theme colors.
+
+    Args:
+        *sources: Role names (every color of the role) or (role, index) pairs.
+
+    Returns:
+        Reference resolving to a tuple of colors.
+    """
+    return ThemeColors(
+        tuple((source, None) if isinstance(source, str) else source for source in sources)
+    )
+
+
+def color(role: str, index: int = 0) -> ThemeColors:
+    """
+    Reference a single theme color.
+
+    Args:
+        role: Color role, e.g. "primary".
+        index: Position of the color within the role.
+
+    Returns:
+        Reference resolving to one color.
+    """
+    return ThemeColors(((role, index),), single=True)
+
+
+@dataclass(frozen=True)
+class EffectSpec:
+    """
+    Declarative description of how an effect is configured.
+
+    Attributes:
+        module: Module path of the terminaltexteffects implementation.
+        class_name: Effect class name. The config class is f"{class_name}Config".
+        settings: (config field, value) pairs. Values are ints, floats,
+            strings, tuples of strings or ThemeColors references.
+    """
+
+    module: str
+    class_name: str
+    settings: tuple[tuple[str, object], ...] = ()
+
+
+def _validate_setting(effect_name: str, field: str, value) -> None:
+    """Check a single setting of an effect spec."""
+    if not field.isidentifier():
+        raise ValueError(f"Invalid config field for effect {effect_name}: {field!r}")
+
+    if isinstance(value, ThemeColors):
+        if not value.sources or (value.single and len(value.sources) != 1):
+            raise ValueError(f"Invalid theme colors for {effect_name}.{field}: {value}")
+        for role, index in value.sources:
+            if role not in THEME_COLOR_ROLES:
+                available = ", ".join(THEME_COLOR_ROLES)
+                raise ValueError(
+                    f"Unknown color role for {effect_name}.{field}: {role}. Available: {available}"
+                )
+            valid_index = isinstance(index, int) and not isinstance(index, bool) and index >= 0
+            if index is not None and not valid_index:
+                raise ValueError(f"Invalid color index for {effect_name}.{field}: {index!r}")
+    elif isinstance(value, tuple):
+        if not value or not all(isinstance(item, str) for item in value):
+            raise ValueError(
+                f"Invalid value for {effect_name}.{field}: expected a tuple of strings"
+            )
+    elif isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError(
+            f"Invalid value for {effect_name}.{field}: {type(value).__name__} is not supported"
+        )
+
+
+EFFECT_REGISTRY: dict[str, EffectSpec] = {}
+
+
+def register_effect(effect_name: str, module: str, class_name: str, **settings) -> EffectSpec:
+    """
+    Register an effect and validate its settings.
+
+    Args:
+        effect_name: Name the effect is selected by.
+        module: Module path of the terminaltexteffects implementation.
+        class_name: Effect class name within the module.
+        **settings: Config fields to set, see EffectSpec.
+
+    Returns:
+        The registered spec.
+
+    Raises:
+        ValueError: If a setting is malformed.
+    """
+    for field, value in settings.items():
+        _validate_setting(effect_name, field, value)
+
+    spec = EffectSpec(module, class_name, tuple(settings.items()))
+    EFFECT_REGISTRY[effect_name] = spec
+    _loaded_effects.pop(effect_name, None)
+    return spec
+
+
+# Effect name -> (effect class, config class), filled in on first use
+_loaded_effects = {}
+
+_EFFECTS_PACKAGE = "terminaltexteffects.effects"
+
+register_effect(
+    "beams", f"{_EFFECTS_PACKAGE}.effect_beams", "Beams",
+    beam_row_symbols=("▂", "▁", "_", "⎽"),
+    beam_column_symbols=("▌", "▍", "▎", "▏"),
+    final_gradient_stops=palette("primary"),
+    beam_gradient_stops=palette("beam_colors"),
+)
+register_effect(
+    "binarypath", f"{_EFFECTS_PACKAGE}.effect_binarypath", "BinaryPath",
+    final_gradient_stops=palette("primary"),
+    binary_colors=palette("accent"),
+)
+register_effect(
+    "blackhole", f"{_EFFECTS_PACKAGE}.effect_blackhole", "Blackhole",
+    star_colors=palette("primary", "accent"),
+)
+register_effect(
+    "bouncyballs", f"{_EFFECTS_PACKAGE}.effect_bouncyballs", "BouncyBalls",
+    ball_colors=palette("primary", "accent"),
+)
+register_effect(
+    "burn", f"{_EFFECTS_PACKAGE}.effect_burn", "Burn",
+    starting_color=color("accent", 0),
+    burn_colors=palette("accent", ("primary", 2)),
+)
+register_effect(
+    "colorshift", f"{_EFFECTS_PACKAGE}.effect_colorshift", "ColorShift",
+    gradient_stops=palette("gradient_stops", ("accent", 0)),
+)
+register_effect(
+    "crumble", f"{_EFFECTS_PACKAGE}.effect_crumble", "Crumble",
+    final_gradient_stops=palette("primary"),
+)
+register_effect(
+    "decrypt", f"{_EFFECTS_PACKAGE}.effect_decrypt", "Decrypt",
+    typing_speed=2,
+    ciphertext_colors=palette("accent"),
+    final_gradient_stops=palette("gradient_stops"),
+)
+register_effect(
+    "errorcorrect", f"{_EFFECTS_PACKAGE}.effect_errorcorrect", "ErrorCorrect",
+    error_pairs=20,
+    error_color=color("error", 0),
+    correct_color=color("primary", 0),
+)
+register_effect(
+    "expand", f"{_EFFECTS_PACKAGE}.effect_expand", "Expand",
+    final_gradient_stops=palette("primary"),
+    movement_speed=0.5,
+)
+register_effect(
+    "fireworks", f"{_EFFECTS_PACKAGE}.effect_fireworks", "Fireworks",
+    firework_colors=palette("primary", "accent"),
+    firework_symbol="●",
+)
+register_effect(
+    "matrix", f"{_EFFECTS_PACKAGE}.effect_matrix", "Matrix",
+    final_gradient_stops=palette(("primary", 0), ("primary", 1)),
+)
+register_effect(
+    "orbittingvolley", f"{_EFFECTS_PACKAGE}.effect_orbittingvolley", "OrbittingVolley",
+    top_launcher_symbol="▲",
+    right_launcher_symbol="▶",
+    bottom_launcher_symbol="▼",
+    left_launcher_symbol="◀",
+    final_gradient_stops=palette("primary"),
+)
+register_effect(
+    "overflow", f"{_EFFECTS_PACKAGE}.effect_overflow", "Overflow",
+    overflow_gradient_stops=palette("accent"),
+    final_gradient_stops=palette(("primary", 0), ("primary", 2)),
+)
+register_effect(
+    "pour", f"{_EFFECTS_PACKAGE}.effect_pour", "Pour",
+    pour_direction="down",
+    pour_speed=2,
+    gap=1,
+    final_gradient_stops=palette("primary"),
+)
+register_effect(
+    "print", f"{_EFFECTS_PACKAGE}.effect_print", "Print",
+    final_gradient_stops=palette("primary"),
+    print_head_return_speed=1.5,
+)
+register_effect(
+    "rain", f"{_EFFECTS_PACKAGE}.effect_rain", "Rain",
+    rain_colors=palette("primary", ("accent", 0)),
+)
+register_effect(
+    "random_sequence", f"{_EFFECTS_PACKAGE}.effect_random_sequence", "RandomSequence",
+    starting_color=color("primary", 1),
+    final_gradient_stops=palette(("primary", 0), ("primary", 2)),
+)
+register_effect(
+    "rings", f"{_EFFECTS_PACKAGE}.effect_rings", "Rings",
+    ring_colors=palette("primary", ("accent", 0)),
+)
+register_effect(
+    "scattered", f"{_EFFECTS_PACKAGE}.effect_scattered", "Scattered",
+    final_gradient_stops=palette("primary"),
+    movement_speed=0.5,
+)
+register_effect(
+    "slide", f"{_EFFECTS_PACKAGE}.effect_slide", "Slide",
+    final_gradient_stops=palette("primary"),
+)
+register_effect(
+    "spotlights", f"{_EFFECTS_PACKAGE}.effect_spotlights", "Spotlights",
+    beam_width_ratio=2.0,
+    search_duration=750,
+    final_gradient_stops=palette(("primary", 0), ("primary", 1)),
+)
+register_effect(
+    "spray", f"{_EFFECTS_PACKAGE}.effect_spray", "Spray",
+    final_gradient_stops=palette(("primary", 0), ("primary", 1)),
+)
+register_effect(
+    "swarm", f"{_EFFECTS_PACKAGE}.effect_swarm", "Swarm",
+    base_color=palette("primary", ("accent", 0)),
+    final_gradient_stops=palette(("primary", 0), ("primary", 2)),
+)
+register_effect(
+    "synthgrid", f"{_EFFECTS_PACKAGE}.effect_synthgrid", "SynthGrid",
+    grid_gradient_stops=palette(("primary", 1), ("primary", 0)),
+    text_gradient_stops=palette("gradient_stops"),
+)
+register_effect(
+    "unstable", f"{_EFFECTS_PACKAGE}.effect_unstable", "Unstable",
+    unstable_color=color("error", 0),
+    final_gradient_stops=palette("primary"),
+)
+register_effect(
+    "vhstape", f"{_EFFECTS_PACKAGE}.effect_vhstape", "VHSTape",
+    final_gradient_stops=palette("primary"),
+    glitch_line_colors=palette("accent"),
+)
+register_effect(
+    "waves", f"{_EFFECTS_PACKAGE}.effect_waves", "Waves",
+    wave_symbols=("▁", "▂", "▃", "▄", "▅", "▆", "▇", "█", "▇", "▆", "▅", "▄", "▃", "▂", "▁"),
+    wave_gradient_stops=palette("primary"),
+    final_gradient_stops=palette(("primary", 0), ("primary", 2)),
+)
+register_effect(
+    "wipe", f"{_EFFECTS_PACKAGE}.effect_wipe", "Wipe",
+    wipe_direction="diagonal_top_left_to_bottom_right",
+    final_gradient_stops=palette("primary"),
+)
+
+
+def get_effect_spec(effect_name: str) -> EffectSpec:
+    """
+    Get the registered spec of an effect.
+
+    Raises:
+        ValueError: If effect_name is not registered.
+    """
+    spec = EFFECT_REGISTRY.get(effect_name)
+    if spec is None:
+        available = ", ".join(sorted(EFFECT_REGISTRY.keys()))
+        raise ValueError(f"Unknown effect: {effect_name}. Available: {available}")
+    return spec
+
+
+def load_effect(effect_name: str) -> tuple[type, type]:
+    """
+    Import an effect's module on first use and return its classes.
+
+    The spec's settings are checked against the config class's fields at
+    this point, once per effect.
+
+    Args:
+        effect_name: Name of a registered effect.
+
+    Returns:
+        Tuple of (effect class, effect config class).
+
+    Raises:
+        ValueError: If effect_name is not registered, or its spec sets a field
+            the config class does not have.
+    """
+    if effect_name in _loaded_effects:
+        return _loaded_effects[effect_name]
+
+    spec = get_effect_spec(effect_name)
+    module = importlib.import_module(spec.module)
+    effect_class = getattr(module, spec.class_name)
+    config_class = getattr(module, f"{spec.class_name}Config")
+
+    if dataclasses.is_dataclass(config_class):
+        known_fields = {field.name for field in dataclasses.fields(config_class)}
+        unknown = [field for field, _ in spec.settings if field not in known_fields]
+        if unknown:
+            raise ValueError(
+                f"Effect {effect_name} sets unknown {config_class.__name__} fields: "
+                f"{', '.join(unknown)}"
+            )
+
+    _loaded_effects[effect_name] = (effect_class, config_class)
+    return effect_class, config_class
+
+
+def effect_settings(effect_name: str, colors: dict) -> dict:
+    """
+    Resolve an effect's settings for a theme into plain values.
+
+    Args:
+        effect_name: Name of a registered effect.
+        colors: The theme's "colors" mapping.
+
+    Returns:
+        Mapping of config field to value, with theme colors as hex strings.
+    """
+    return {
+        field: value.resolve(colors) if isinstance(value, ThemeColors) else value
+        for field, value in get_effect_spec(effect_name).settings
+    }
+
+
+def build_effect_config(effect_name: str, colors: dict):
+    """
+    Build an effect's terminaltexteffects config object for a theme.
+
+    Args:
+        effect_name: Name of a registered effect.
+        colors: The theme's "colors" mapping.
+
+    Returns:
+        Instance of the effect's config class.
+    """
+    from terminaltexteffects.utils.graphics import Color
+
+    _, config_class = load_effect(effect_name)
+    kwargs = {}
+    for field, value in get_effect_spec(effect_name).settings:
+        if isinstance(value, ThemeColors):
+            resolved = value.resolve(colors)
+            if value.single:
+                value = Color(resolved)
+            else:
+                value = tuple(Color(hex_color) for hex_color in resolved)
+        kwargs[field] = value
+    return config_class(**kwargs)
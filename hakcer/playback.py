@@ -0,0 +1,732 @@
+"""
+Frame playback for haKCer banners.
+
+Frames are plain strings produced by terminaltexteffects (rows joined by
+newlines). Playback reproduces the canvas handling of terminaltexteffects'
+own terminal output, so frames can come from a live effect or from the
+frame cache and look identical on screen. While a banner plays, a key press
+can end it early (see watch_keypress()).
+"""
+
+import contextlib
+import math
+import os
+import select
+import sys
+import threading
+import time
+from typing import Callable, Iterable, Iterator, Optional, Sequence, TextIO
+
+from .render import RESET, DiffRenderer
+
+DEFAULT_FRAME_RATE = 100
+
+# Share of each frame's time that writing may take before the frame rate drops
+WRITE_BUDGET = 0.5
+
+HIDE_CURSOR = "\x1b[?25l"
+SHOW_CURSOR = "\x1b[?25h"
+SAVE_CURSOR = "\x1b7"
+RESTORE_CURSOR = "\x1b8"
+
+
+def iter_effect_frames(effect, setup: bool = False) -> Iterator[str]:
+    """
+    Yield the frames of an effect as fast as they can be generated.
+
+    terminaltexteffects normally sleeps inside frame generation to enforce its
+    frame rate. Pacing is handled by play_frames() instead, so the effect's own
+    limiter is disabled.
+
+    Args:
+        effect: A terminaltexteffects effect instance.
+        setup: Whether to set the effect up (lay out its canvas, build its
+            characters' paths) right away, so the time it takes can be measured
+            apart from frame generation. Otherwise it happens on the first frame.
+
+    Returns:
+        Iterator over the frames of the effect.
+    """
+    effect.terminal_config.frame_rate = 0
+    if setup:
+        return iter(effect)
+    return _lazy_frames(effect)
+
+
+def _lazy_frames(effect) -> Iterator[str]:
+    """Yield an effect's frames, setting it up only once the first one is asked for."""
+    yield from effect
+
+
+def collect_frames(frames: Iterable[str], deadline: Optional[float] = None) -> list[str]:
+    """
+    Generate all frames up front so the animation length is known before playback.
+
+    Args:
+        frames: Frames to collect.
+        deadline: time.monotonic() value after which generation stops early.
+
+    Returns:
+        The collected frames. If the deadline passed, only the frames generated
+        until then.
+    """
+    collected = []
+    for frame in frames:
+        collected.append(frame)
+        if deadline is not None and time.monotonic() >= deadline:
+            close = getattr(frames, "close", None)
+            if close is not None:
+                close()
+            break
+    return collected
+
+
+def decimate_frames(frames: Sequence[str], max_frames: int) -> list[str]:
+    """
+    Evenly resample frames down to a maximum count.
+
+    The first and final frames are always kept, so a shortened animation still
+    lands on exactly the same final frame.
+
+    Args:
+        frames: Frames to resample.
+        max_frames: Maximum number of frames to keep.
+
+    Returns:
+        The resampled frames (all frames if they already fit).
+    """
+    if max_frames >= len(frames):
+        return list(frames)
+    if max_frames <= 1:
+        return list(frames[-1:])
+    step = (len(frames) - 1) / (max_frames - 1)
+    return [frames[round(index * step)] for index in range(max_frames)]
+
+
+def fit_frames_to_duration(
+    frames: Sequence[str], seconds: float, frame_rate: int = DEFAULT_FRAME_RATE
+) -> list[str]:
+    """
+    Drop intermediate frames so playback at frame_rate finishes within seconds.
+
+    Args:
+        frames: Frames to fit.
+        seconds: Time available for playback.
+        frame_rate: Playback frames per second.
+
+    Returns:
+        Frames that can be played within the time available.
+    """
+    if frame_rate <= 0:
+        return list(frames)
+    return decimate_frames(frames, int(max(0.0, seconds) * frame_rate))
+
+
+class AdaptiveFrameRate:
+    """
+    Choose how many frames to show per second from measured write times.
+
+    Effects are made to play at frame_rate. Showing every n-th frame (the
+    stride) lowers the rate to frame_rate / n while the animation keeps its
+    length. When writes block for more than half of a frame's time (a slow SSH
+    link or a busy terminal) the stride grows until they fit, and it shrinks
+    again once writes speed up, always within min_fps and max_fps.
+
+    Args:
+        frame_rate: Frames per second the effect is made for.
+        min_fps: Lowest rate to drop to.
+        max_fps: Highest rate to show. frame_rate if None.
+
+    Raises:
+        ValueError: If the rates are not positive or min_fps exceeds max_fps.
+    """
+
+    def __init__(
+        self,
+        frame_rate: int = DEFAULT_FRAME_RATE,
+        min_fps: float = 10,
+        max_fps: Optional[float] = None,
+    ) -> None:
+        if max_fps is None:
+            max_fps = frame_rate
+        if frame_rate <= 0 or min_fps <= 0 or max_fps <= 0:
+            raise ValueError(
+                f"Frame rates must be positive, got {frame_rate}, {min_fps}, {max_fps}"
+            )
+        if min_fps > max_fps:
+            raise ValueError(f"min_fps ({min_fps}) must not exceed max_fps ({max_fps})")
+        self.frame_rate = frame_rate
+        self.min_stride = max(1, math.ceil(frame_rate / max_fps))
+        self.max_stride = max(self.min_stride, math.floor(frame_rate / min_fps))
+        self.stride = self.min_stride
+        self._average: Optional[float] = None
+        self._samples = 0
+
+    @property
+    def fps(self) -> float:
+        """The frame rate currently shown."""
+        return self.frame_rate / self.stride
+
+    def record(self, write_seconds: float) -> None:
+        """
+        Adjust the stride after a frame was written.
+
+        Args:
+            write_seconds: How long writing the frame took.
+        """
+        self._samples += 1
+        if self._samples == 1:
+            # The first frame paints the whole canvas and is not representative
+            return
+        if self._average is None:
+            self._average = write_seconds
+        else:
+            self._average = 0.7 * self._average + 0.3 * write_seconds
+
+        budget = WRITE_BUDGET * self.stride / self.frame_rate
+        if self._average > budget:
+            needed = math.ceil(self._average * self.frame_rate / WRITE_BUDGET)
+            self.stride = min(self.max_stride, max(self.stride + 1, needed))
+        elif self.stride > self.min_stride:
+            # Step back down once writes would fit comfortably at the lower stride
+            if self._average < budget * (self.stride - 1) / self.stride / 2:
+                self.stride -= 1
+
+
+def _strided(frames: Iterable[str], rate: AdaptiveFrameRate) -> Iterator[str]:
+    """Yield every rate.stride-th frame, always including the final one."""
+    frames = iter(frames)
+    try:
+        skipped = None
+        to_skip = 0
+        for frame in frames:
+            if to_skip:
+                to_skip -= 1
+                skipped = frame
+                continue
+            skipped = None
+            yield frame
+            # Read after the frame was shown, so the latest measurement applies
+            to_skip = rate.stride - 1
+        if skipped is not None:
+            yield skipped
+    finally:
+        close = getattr(frames, "close", None)
+        if close is not None:
+            close()
+
+
+def _skip_ahead(frames: Iterator[str], frame: Optional[str], final: Optional[str]) -> Optional[str]:
+    """
+    Jump to the final frame.
+
+    With a precomputed final frame the remaining frames are discarded without
+    being generated; otherwise they are drained to reach the last one.
+    """
+    if final is not None:
+        close = getattr(frames, "close", None)
+        if close is not None:
+            close()
+        return final
+    for frame in frames:
+        pass
+    return frame
+
+
+@contextlib.contextmanager
+def watch_keypress(
+    enabled: bool = True, on_press: Optional[Callable[[], None]] = None
+) -> Iterator[Optional[threading.Event]]:
+    """
+    Watch the terminal for a key press while the block runs.
+
+    stdin is switched to cbreak mode, so keys arrive without Enter and are not
+    echoed over the banner, and a thread waits for them with select(). Output
+    processing and signals are left alone: newlines still return the cursor
+    and Ctrl-C still interrupts. The terminal's settings are restored on the
+    way out, whatever the reason.
+
+    Args:
+        enabled: Whether to watch at all.
+        on_press: Called from the watching thread on the first key press.
+
+    Yields:
+        Event set by the first key press, which is consumed. None if disabled
+        or stdin is not a terminal this process may change (not a TTY, in the
+        background, or a platform without termios).
+    """
+    try:
+        import termios
+        import tty
+    except ImportError:
+        yield None
+        return
+
+    try:
+        fd = sys.stdin.fileno()
+        # Changing the settings from a background job would stop the process
+        if not enabled or not os.isatty(fd) or os.tcgetpgrp(fd) != os.getpgrp():
+            raise ValueError
+        saved = termios.tcgetattr(fd)
+    except (AttributeError, OSError, ValueError, termios.error):
+        yield None
+        return
+
+    pressed = threading.Event()
+    done = threading.Event()
+
+    def watch() -> None:
+        while not done.is_set():
+            readable, _, _ = select.select([fd], [], [], 0.05)
+            if readable:
+                # A key can send several bytes (arrows, function keys)
+                os.read(fd, 64)
+                pressed.set()
+                if on_press is not None:
+                    on_press()
+                return
+
+    tty.setcbreak(fd, termios.TCSANOW)
+    watcher = threading.Thread(target=watch, name="hakcer-keypress", daemon=True)
+    try:
+        watcher.start()
+        yield pressed
+    finally:
+        done.set()
+        watcher.join()
+        termios.tcsetattr(fd, termios.TCSADRAIN, saved)
+
+
+class FrameWriter:
+    """
+    Write terminal output with one system call per frame.
+
+    Output is encoded into a reused bytearray and handed to os.write() on
+    flush(), bypassing the text and buffered layers of sys.stdout, which can
+    split a large frame into several writes. Slow PTYs and multiplexers like
+    tmux redraw more smoothly when each frame arrives in one piece.
+
+    Streams without a file descriptor (e.g. io.StringIO) and Windows consoles
+    are written to through the stream instead, with one flush per frame.
+
+    Args:
+        stream: Stream to write to. sys.stdout if None.
+        capacity: Initial buffer size in bytes. The buffer grows as needed.
+
+    Attributes:
+        syscalls: os.write() calls made (stream writes for streams without a descriptor).
+        bytes_written: Bytes written.
+        frames: flush() calls that wrote something.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None, capacity: int = 64 * 1024) -> None:
+        self.stream = stream if stream is not None else sys.stdout
+        self.encoding = getattr(self.stream, "encoding", None) or "utf-8"
+        self.syscalls = 0
+        self.bytes_written = 0
+        self.frames = 0
+        self._buffer = bytearray(capacity)
+        self._length = 0
+        self._pending: list[str] = []
+        try:
+            self.fd: Optional[int] = self.stream.fileno()
+        except (AttributeError, OSError, ValueError):
+            self.fd = None
+        if self.fd is not None and os.name == "nt" and os.isatty(self.fd):
+            # Windows consoles take text through the console API, which
+            # sys.stdout uses; raw bytes would garble non-ASCII glyphs
+            self.fd = None
+        # Anything already buffered by the stream has to go out first
+        self.stream.flush()
+
+    def write(self, text: str) -> None:
+        """Add output to the current frame."""
+        if not text:
+            return
+        if self.fd is None:
+            self._pending.append(text)
+            return
+        data = text.encode(self.encoding, errors="replace")
+        end = self._length + len(data)
+        # Overwrites in place while the buffer is large enough, grows it otherwise
+        self._buffer[self._length:end] = data
+        self._length = end
+
+    def flush(self) -> None:
+        """Write the current frame."""
+        if self.fd is None:
+            if self._pending:
+                text = "".join(self._pending)
+                self._pending.clear()
+                self.stream.write(text)
+                self.stream.flush()
+                self.syscalls += 1
+                self.bytes_written += len(text.encode(self.encoding, errors="replace"))
+                self.frames += 1
+            return
+
+        if not self._length:
+            return
+        sent = 0
+        with memoryview(self._buffer) as buffer:
+            # One write normally; partial writes to a full pipe are resumed
+            while sent < self._length:
+                with buffer[sent:self._length] as chunk:
+                    sent += os.write(self.fd, chunk)
+                self.syscalls += 1
+        self.bytes_written += self._length
+        self.frames += 1
+        self._length = 0
+
+
+class FramePlayer:
+    """
+    Turn a stream of frames into terminal output.
+
+    Handles canvas setup and teardown, frame pacing, and the conditions under
+    which playback should skip ahead to the final frame. The actual waiting and
+    writing is left to the caller so the same logic drives both play_frames()
+    and play_frames_async().
+
+    Args:
+        frame_rate: Target frames per second. 0 disables pacing.
+        renderer: Renderer to draw with. A new DiffRenderer is used if None.
+        deadline: time.monotonic() value by which playback must finish.
+        stop: Event that, once set, ends the animation early.
+        top: Blank lines to leave above the canvas.
+        left: Screen column of the canvas' left edge. Frames of trimmed art
+            are drawn there instead of being padded (see trim_art()).
+
+    Attributes:
+        frame_delay: Seconds between frames. May be changed during playback.
+    """
+
+    def __init__(
+        self,
+        frame_rate: int = DEFAULT_FRAME_RATE,
+        renderer: Optional[DiffRenderer] = None,
+        deadline: Optional[float] = None,
+        stop: Optional[threading.Event] = None,
+        top: int = 0,
+        left: int = 0,
+    ) -> None:
+        self.renderer = renderer if renderer is not None else DiffRenderer()
+        self.renderer.left = left
+        self.top = top
+        self.deadline = deadline
+        self.stop = stop
+        self.frame_delay = 1 / frame_rate if frame_rate > 0 else 0.0
+        self._shown_at = time.monotonic()
+        self._canvas_height = 0
+
+    def next_delay(self) -> float:
+        """Get the seconds to wait before drawing the next frame."""
+        now = time.monotonic()
+        if not self._canvas_height or not self.frame_delay:
+            self._shown_at = now
+            return 0.0
+        # frame_delay is read here so a rate change applies to the very next frame
+        wake_at = self._shown_at + self.frame_delay
+        if self.deadline is not None:
+            wake_at = min(wake_at, self.deadline)
+        self._shown_at = max(now, wake_at)
+        return max(0.0, wake_at - now)
+
+    def should_skip(self) -> bool:
+        """Check whether playback should jump straight to the final frame."""
+        if self.stop is not None and self.stop.is_set():
+            return True
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def draw(self, frame: str) -> str:
+        """
+        Get the terminal output that draws a frame.
+
+        Args:
+            frame: Frame to draw.
+
+        Returns:
+            Output to write, including canvas setup before the first frame.
+        """
+        prefix = ""
+        if not self._canvas_height:
+            self._canvas_height = frame.count("\n") + 1
+            prefix = HIDE_CURSOR + "\n" * (self.top + self._canvas_height) + SAVE_CURSOR
+
+        update = self.renderer.render(frame)
+        if update:
+            return f"{prefix}{RESTORE_CURSOR}{SAVE_CURSOR}\x1b[{self._canvas_height}A{update}"
+        return prefix
+
+    def close(self) -> str:
+        """Get the output that restores the terminal after the last frame."""
+        if not self._canvas_height:
+            return ""
+        # The saved position is the line below the canvas
+        return RESTORE_CURSOR + SHOW_CURSOR
+
+
+def play_frames(
+    frames: Iterable[str],
+    frame_rate: int = DEFAULT_FRAME_RATE,
+    renderer: Optional[DiffRenderer] = None,
+    deadline: Optional[float] = None,
+    stop: Optional[threading.Event] = None,
+    final: Optional[str] = None,
+    writer: Optional[FrameWriter] = None,
+    rate: Optional[AdaptiveFrameRate] = None,
+    top: int = 0,
+    left: int = 0,
+    on_frame: Optional[Callable[[float, float, int], None]] = None,
+    on_skip: Optional[Callable[[], None]] = None,
+) -> DiffRenderer:
+    """
+    Play frames to stdout at a fixed frame rate.
+
+    Only the cells that changed since the previous frame are written.
+
+    Args:
+        frames: Frames to play, in order.
+        frame_rate: Target frames per second. 0 disables pacing.
+        renderer: Renderer to draw with. A new DiffRenderer is used if None.
+        deadline: time.monotonic() value by which playback must finish. Once it
+            passes, playback skips straight to the final frame.
+        stop: Event that, once set, makes playback skip straight to the final frame.
+        final: The final frame, when known in advance (see render_final()).
+            Skipping then lands on it without generating the frames in between.
+        writer: Writer to output through. A new FrameWriter on stdout if None.
+            Its counters describe the system calls made.
+        rate: Adapts how many of the frames are shown to the measured write
+            time. Every frame is shown at frame_rate if None.
+        top: Blank lines to leave above the canvas.
+        left: Screen column of the canvas' left edge.
+        on_frame: Called after each frame is written with the seconds spent
+            generating it, the seconds spent writing it and the bytes written.
+        on_skip: Called when playback jumps to the final frame early, because
+            the deadline passed or stop was set.
+
+    Returns:
+        The renderer, whose byte counters describe the output that was written.
+    """
+    out = writer if writer is not None else FrameWriter()
+    player = FramePlayer(frame_rate, renderer, deadline, stop, top, left)
+    if rate is not None:
+        frames = _strided(frames, rate)
+
+    try:
+        frames = iter(frames)
+        generate_started = time.monotonic()
+        for frame in frames:
+            generate_seconds = time.monotonic() - generate_started
+            if rate is not None:
+                player.frame_delay = rate.stride / rate.frame_rate
+            delay = player.next_delay()
+            if delay:
+                if stop is not None:
+                    stop.wait(delay)
+                else:
+                    time.sleep(delay)
+
+            skipping = player.should_skip()
+            if skipping:
+                # Out of time or told to stop: skip straight to the final frame
+                frame = _skip_ahead(frames, frame, final)
+                if on_skip is not None:
+                    on_skip()
+
+            out.write(player.draw(frame))
+            written = out.bytes_written
+            write_started = time.monotonic()
+            out.flush()
+            write_seconds = time.monotonic() - write_started
+            if rate is not None:
+                rate.record(write_seconds)
+            if on_frame is not None:
+                on_frame(generate_seconds, write_seconds, out.bytes_written - written)
+            if skipping:
+                break
+            generate_started = time.monotonic()
+    except KeyboardInterrupt:
+        if final is not None:
+            # Redraw the final frame in full rather than leave a half-drawn one behind
+            player.renderer.reset()
+            out.write(RESET + player.draw(final))
+        raise
+    finally:
+        out.write(player.close())
+        out.flush()
+
+    return player.renderer
+
+
+def _discard_result(future) -> None:
+    """Retrieve an abandoned future's result so its errors are not reported."""
+    if not future.cancelled():
+        future.exception()
+
+
+async def _open_async_stdout():
+    """
+    Wrap stdout's file descriptor in a non-blocking asyncio StreamWriter.
+
+    The writer uses a duplicate of the fd, but a duplicate shares its file
+    description, so connect_write_pipe() sets O_NONBLOCK on stdout itself
+    (and on anything else sharing it, such as a parent shell's terminal).
+    Until the caller restores the original flag, other blocking writers to
+    the same terminal or pipe can fail with BlockingIOError.
+
+    Returns:
+        Tuple of (writer, fd, blocking), where blocking is the fd's original
+        blocking flag to restore once the writer is closed, or
+        (None, None, None) when stdout cannot be driven by the event loop
+        (not a pipe or terminal, or unsupported platform).
+    """
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    try:
+        fd = sys.stdout.fileno()
+        blocking = os.get_blocking(fd)
+        pipe = os.fdopen(os.dup(fd), "wb", buffering=0)
+    except (AttributeError, OSError, ValueError):
+        return None, None, None
+
+    try:
+        transport, protocol = await loop.connect_write_pipe(asyncio.streams.FlowControlMixin, pipe)
+    except (OSError, ValueError, NotImplementedError):
+        pipe.close()
+        os.set_blocking(fd, blocking)
+        return None, None, None
+    return asyncio.StreamWriter(transport, protocol, None, loop), fd, blocking
+
+
+async def play_frames_async(
+    frames: Iterable[str],
+    frame_rate: int = DEFAULT_FRAME_RATE,
+    renderer: Optional[DiffRenderer] = None,
+    deadline: Optional[float] = None,
+    final: Optional[str] = None,
+    rate: Optional[AdaptiveFrameRate] = None,
+    top: int = 0,
+    left: int = 0,
+    stop: Optional[threading.Event] = None,
+    on_frame: Optional[Callable[[float, float, int], None]] = None,
+    on_skip: Optional[Callable[[], None]] = None,
+) -> DiffRenderer:
+    """
+    Play frames to stdout without blocking the event loop.
+
+    Frames are generated in the loop's default executor, the loop gets control
+    back between frames via asyncio.sleep(), and output goes through a
+    non-blocking stream writer where stdout supports one. If the task is
+    cancelled, the banner snaps to its final frame and the terminal is restored
+    before CancelledError propagates.
+
+    Args:
+        frames: Frames to play, in order.
+        frame_rate: Target frames per second. 0 disables pacing.
+        renderer: Renderer to draw with. A new DiffRenderer is used if None.
+        deadline: time.monotonic() value by which playback must finish.
+        final: The final frame, when known in advance (see render_final()).
+        rate: Adapts how many of the frames are shown to the measured time
+            until each write has drained.
+        top: Blank lines to leave above the canvas.
+        left: Screen column of the canvas' left edge.
+        stop: Event that, once set, makes playback skip straight to the final
+            frame. Checked before each frame.
+        on_frame: Called after each frame is written with the seconds spent
+            generating it, the seconds until it was written and the bytes written.
+        on_skip: Called when playback jumps to the final frame early, because
+            the deadline passed or stop was set.
+
+    Returns:
+        The renderer, whose byte counters describe the output that was written.
+    """
+    # asyncio takes longer to import than the rest of the package, and only
+    # the async path needs it
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    player = FramePlayer(frame_rate, renderer, deadline, stop, top, left)
+    if rate is not None:
+        frames = _strided(frames, rate)
+    frames = iter(frames)
+
+    sys.stdout.flush()
+    writer, fd, blocking = await _open_async_stdout()
+    encoding = getattr(sys.stdout, "encoding", None) or "utf-8"
+
+    async def write(text: str) -> int:
+        if not text:
+            return 0
+        data = text.encode(encoding, errors="replace")
+        if writer is None:
+            sys.stdout.write(text)
+            sys.stdout.flush()
+        else:
+            writer.write(data)
+            await writer.drain()
+        return len(data)
+
+    # Frame generation runs in a worker thread. It is shielded so a cancelled
+    # task never leaves the generator running while it is drained below.
+    pending = None
+
+    async def in_executor(func, *args):
+        nonlocal pending
+        pending = loop.run_in_executor(None, func, *args)
+        return await asyncio.shield(pending)
+
+    frame = None
+    try:
+        while True:
+            generate_started = time.monotonic()
+            next_frame = await in_executor(next, frames, None)
+            if next_frame is None:
+                break
+            generate_seconds = time.monotonic() - generate_started
+            frame = next_frame
+            if rate is not None:
+                player.frame_delay = rate.stride / rate.frame_rate
+            await asyncio.sleep(player.next_delay())
+            skipping = player.should_skip()
+            if skipping:
+                frame = await in_executor(_skip_ahead, frames, frame, final)
+                if on_skip is not None:
+                    on_skip()
+            write_started = time.monotonic()
+            written = await write(player.draw(frame))
+            write_seconds = time.monotonic() - write_started
+            if rate is not None:
+                rate.record(write_seconds)
+            if on_frame is not None:
+                on_frame(generate_seconds, write_seconds, written)
+            if skipping:
+                break
+    except asyncio.CancelledError:
+        # Snap cleanly to the final frame before letting the cancellation through
+        if final is not None and pending is not None and not pending.done():
+            # The frame being generated is not needed; let the worker finish it unobserved
+            pending.add_done_callback(_discard_result)
+            frame = final
+        else:
+            if pending is not None:
+                in_flight = await pending
+                if in_flight is not None:
+                    frame = in_flight
+            frame = await in_executor(_skip_ahead, frames, frame, final)
+        if frame is not None:
+            await write(player.draw(frame))
+        raise
+    finally:
+        try:
+            await write(player.close())
+        finally:
+            if writer is not None:
+                # Every write was drained, so closing only releases the duplicate fd
+                writer.close()
+                # connect_write_pipe() made the shared file description
+                # non-blocking; put back whatever mode stdout was in before
+                os.set_blocking(fd, blocking)
+
+    return player.renderer
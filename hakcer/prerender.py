@@ -0,0 +1,300 @@
+"""
+Parallel pre-rendering of banners.
+
+Generating frames is CPU bound and every (effect, theme, art) combination is
+independent, so a matrix of banners can be rendered across all cores ahead of
+time. Each job writes its frames to the frame cache, where show_banner(...,
+use_cache=True) picks them up, or to an asciicast recording.
+
+Usage:
+    hakcer prerender --themes all --files custom_banners/*.txt
+    hakcer prerender --effects decrypt wipe --record-dir casts/
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional, Sequence
+
+from .banner import HAKCER_ASCII, _banner_cache_key, _banner_frames, _prepare_banner, list_effects
+from .art import load_art
+from .bench import _terminal_size
+from .cache import load_frames
+from .costs import art_metrics, estimate_seconds
+from .recording import record_banner
+from .themes import THEMES, get_current_theme_name
+
+
+@dataclass(frozen=True)
+class PrerenderJob:
+    """
+    One banner to pre-render.
+
+    Attributes:
+        effect: Effect name.
+        theme: Theme name.
+        custom_file: Path to the art file. The haKCer banner if None.
+    """
+
+    effect: str
+    theme: str
+    custom_file: Optional[str] = None
+
+
+@dataclass
+class PrerenderResult:
+    """
+    Outcome of a pre-render job.
+
+    Attributes:
+        job: The job.
+        frames: Frames rendered (or found in the cache).
+        seconds: Time the job took in its worker.
+        cached: Whether the frames were already in the cache.
+        error: Error message if the job failed, otherwise None.
+    """
+
+    job: PrerenderJob
+    frames: int = 0
+    seconds: float = 0.0
+    cached: bool = False
+    error: Optional[str] = None
+
+
+def recording_path(record_dir: str, job: PrerenderJob) -> Path:
+    """
+    Get where a job's recording is written.
+
+    Args:
+        record_dir: Directory recordings are written to.
+        job: The job.
+
+    Returns:
+        Path of the form <art>_<theme>_<effect>.cast.
+    """
+    art = Path(job.custom_file).stem if job.custom_file else "hakcer"
+    return Path(record_dir) / f"{art}_{job.theme}_{job.effect}.cast"
+
+
+def _run_job(
+    job: PrerenderJob,
+    columns: int,
+    rows: int,
+    record_dir: Optional[str],
+    hold_time: float,
+) -> PrerenderResult:
+    """Render one job in a worker process."""
+    started = time.perf_counter()
+    try:
+        if record_dir is not None:
+            record_banner(
+                str(recording_path(record_dir, job)),
+                effect_name=job.effect,
+                hold_time=hold_time,
+                theme=job.theme,
+                custom_file=job.custom_file,
+                use_cache=True,
+                columns=columns,
+                rows=rows,
+            )
+            return PrerenderResult(job, seconds=time.perf_counter() - started)
+
+        with _terminal_size(columns, rows):
+            prepared = _prepare_banner(job.effect, "any", job.theme, None, job.custom_file)
+            frames = load_frames(_banner_cache_key(prepared[0], prepared[1], prepared[3]))
+            cached = frames is not None
+            if not cached:
+                frames = _banner_frames(*prepared[:4], use_cache=True)
+            count = sum(1 for _ in frames)
+        seconds = time.perf_counter() - started
+        return PrerenderResult(job, frames=count, seconds=seconds, cached=cached)
+    except Exception as e:
+        seconds = time.perf_counter() - started
+        return PrerenderResult(job, seconds=seconds, error=f"{type(e).__name__}: {e}")
+
+
+def _estimated_cost(job: PrerenderJob, columns: int) -> float:
+    """Estimate a job's run time so the longest jobs can be started first."""
+    if job.custom_file:
+        try:
+            ascii_art = load_art(job.custom_file)
+        except OSError:
+            return 0.0
+    else:
+        ascii_art = HAKCER_ASCII
+    characters, cells = art_metrics(ascii_art, columns)
+    # Pacing does not apply here, frames are generated as fast as possible
+    return estimate_seconds(job.effect, characters, cells, frame_rate=0) or 0.0
+
+
+def prerender_jobs(
+    effects: Optional[Sequence[str]] = None,
+    themes: Optional[Sequence[str]] = None,
+    custom_files: Sequence[Optional[str]] = (None,),
+) -> list[PrerenderJob]:
+    """
+    Build the full matrix of jobs.
+
+    Args:
+        effects: Effects to render. All effects if None.
+        themes: Themes to render. The current theme if None.
+        custom_files: Art files to render. None stands for the haKCer banner.
+
+    Returns:
+        One job per (art, theme, effect) combination.
+
+    Raises:
+        ValueError: If an effect or theme is not recognized.
+    """
+    effects = list(effects) if effects is not None else list_effects()
+    themes = list(themes) if themes is not None else [get_current_theme_name()]
+    available = list_effects()
+    for effect in effects:
+        if effect not in available:
+            raise ValueError(f"Unknown effect: {effect}. Available: {', '.join(available)}")
+    for theme in themes:
+        if theme not in THEMES:
+            raise ValueError(f"Unknown theme: {theme}. Available: {', '.join(sorted(THEMES))}")
+    return [
+        PrerenderJob(effect, theme, custom_file)
+        for custom_file in custom_files
+        for theme in themes
+        for effect in effects
+    ]
+
+
+def prerender(
+    jobs: Sequence[PrerenderJob],
+    workers: Optional[int] = None,
+    columns: Optional[int] = None,
+    rows: Optional[int] = None,
+    record_dir: Optional[str] = None,
+    hold_time: float = 1.5,
+    on_result: Optional[Callable[[PrerenderResult], None]] = None,
+) -> list[PrerenderResult]:
+    """
+    Render banners in parallel across worker processes.
+
+    Frames go to the frame cache unless record_dir is given, in which case
+    each job writes an asciicast recording instead (see recording_path()).
+    Jobs are started longest first, as estimated by the cost model, so one slow
+    effect does not finish alone at the end.
+
+    Args:
+        jobs: Jobs to run, e.g. from prerender_jobs().
+        workers: Worker processes. One per CPU if None.
+        columns: Terminal width to render for. The current terminal's if None.
+        rows: Terminal height to render for. The current terminal's if None.
+        record_dir: Directory to write recordings to instead of caching frames.
+        hold_time: Hold time stored in recordings.
+        on_result: Called with each result as it completes.
+
+    Returns:
+        Results in the order of jobs.
+    """
+    size = shutil.get_terminal_size()
+    columns = columns or size.columns
+    rows = rows or size.lines
+    if record_dir is not None:
+        Path(record_dir).mkdir(parents=True, exist_ok=True)
+
+    ordered = sorted(jobs, key=lambda job: _estimated_cost(job, columns), reverse=True)
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_run_job, job, columns, rows, record_dir, hold_time) for job in ordered
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            results[result.job] = result
+            if on_result is not None:
+                on_result(result)
+    return [results[job] for job in jobs]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Command line entry point for pre-rendering.
+
+    Args:
+        argv: Arguments, without the program name. sys.argv[1:] if None.
+
+    Returns:
+        Process exit code.
+    """
+    parser = argparse.ArgumentParser(
+        prog="hakcer prerender",
+        description="Render banners across all cores into the frame cache or asciicast recordings.",
+    )
+    parser.add_argument(
+        "--effects", nargs="+", metavar="EFFECT", help="effects to render (default: all)"
+    )
+    parser.add_argument(
+        "--themes",
+        nargs="+",
+        metavar="THEME",
+        help='themes to render, or "all" (default: current theme)',
+    )
+    parser.add_argument("--files", nargs="+", metavar="FILE", help="custom art files to render")
+    parser.add_argument("--no-default", action="store_true", help="skip the default haKCer banner")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument(
+        "--columns", type=int, help="terminal columns to render for (default: current)"
+    )
+    parser.add_argument("--rows", type=int, help="terminal rows to render for (default: current)")
+    parser.add_argument(
+        "--record-dir", metavar="DIR", help="write asciicast recordings here instead of caching"
+    )
+    parser.add_argument(
+        "--hold", type=float, default=1.5, help="hold time stored in recordings (default: 1.5)"
+    )
+    args = parser.parse_args(argv)
+
+    themes = args.themes
+    if themes == ["all"]:
+        themes = sorted(THEMES.keys())
+    custom_files = ([] if args.no_default else [None]) + list(args.files or [])
+    if not custom_files:
+        parser.error("Nothing to render: --no-default needs --files")
+
+    try:
+        jobs = prerender_jobs(args.effects, themes, custom_files)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    workers = args.workers or os.cpu_count() or 1
+    print(f"Pre-rendering {len(jobs)} banners on {workers} workers...")
+    started = time.perf_counter()
+    done = 0
+
+    def report(result: PrerenderResult) -> None:
+        nonlocal done
+        done += 1
+        job = result.job
+        art = Path(job.custom_file).name if job.custom_file else "haKCer"
+        if result.error:
+            status = f"failed: {result.error}"
+        elif result.cached:
+            status = "cached"
+        else:
+            status = f"{result.seconds:.2f}s"
+        print(f"  [{done}/{len(jobs)}] {art} {job.theme} {job.effect}: {status}")
+
+    results = prerender(
+        jobs,
+        workers=workers,
+        columns=args.columns,
+        rows=args.rows,
+        record_dir=args.record_dir,
+        hold_time=args.hold,
+        on_result=report,
+    )
+    failed = sum(1 for result in results if result.error)
+    print(f"Done in {time.perf_counter() - started:.1f}s ({failed} failed)")
+    return 1 if failed else 0
@@ -0,0 +1,253 @@
+"""
+asciicast v2 recordings of haKCer banners.
+
+record_banner() renders a banner headlessly and writes its terminal output,
+with timestamps, in the asciicast v2 format used by asciinema. Recordings
+can be replayed with play_recording(), asciinema or any asciicast player
+without generating a single frame, which keeps replay CPU close to zero.
+
+Usage:
+    hakcer record banner.cast --effect decrypt --theme neon
+    hakcer play banner.cast
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Optional
+
+from .banner import _banner_frames, _prepare_banner, list_effects
+from .bench import _terminal_size
+from .colors import COLOR_DEPTHS, quantize_frames, resolve_color_depth
+from .playback import DEFAULT_FRAME_RATE, SHOW_CURSOR, FramePlayer, FrameWriter
+from .themes import list_available_themes
+
+ASCIICAST_VERSION = 2
+
+
+def _event(at: float, data: str) -> str:
+    """Format an output event as one asciicast line."""
+    return json.dumps([round(at, 6), "o", data], ensure_ascii=False) + "\n"
+
+
+def record_banner(
+    path: str,
+    effect_name: Optional[str] = None,
+    speed_preference: str = "fast",
+    hold_time: float = 1.5,
+    clear_after: bool = False,
+    theme: Optional[str] = None,
+    custom_text: Optional[str] = None,
+    custom_file: Optional[str] = None,
+    use_cache: bool = False,
+    frame_rate: int = DEFAULT_FRAME_RATE,
+    columns: Optional[int] = None,
+    rows: Optional[int] = None,
+    title: Optional[str] = None,
+    color_depth: str = "truecolor",
+) -> float:
+    """
+    Record a banner to an asciicast v2 file.
+
+    Frames are generated as fast as possible and stamped with the time they
+    would be shown at frame_rate, so the recording plays at the intended pace
+    however long it took to make. The output stream is exactly what
+    show_banner() writes to a terminal.
+
+    Args:
+        path: File to write.
+        effect_name: Specific effect to use. If None, randomly selects based on speed_preference.
+        speed_preference: Speed category for random selection ("fast", "medium", "slow", "any").
+        hold_time: Seconds the final frame stays up at the end of the recording.
+        clear_after: Whether the recording ends by clearing the terminal.
+        theme: Theme name to use. If None, uses current global theme.
+        custom_text: Custom ASCII art text to display instead of default banner.
+        custom_file: Path to file containing custom ASCII art. Overrides custom_text.
+        use_cache: Take frames from the on-disk frame cache when available.
+        frame_rate: Playback frames per second.
+        columns: Terminal width to record at. The current terminal's if None.
+        rows: Terminal height to record at. The current terminal's if None.
+        title: Title stored in the recording's header.
+        color_depth: "truecolor", "256" or "16" colors, or "auto" for the
+            current terminal's.
+
+    Returns:
+        Length of the recording in seconds.
+
+    Raises:
+        ValueError: If effect_name, theme or color_depth is not recognized, or
+            frame_rate is not positive.
+        FileNotFoundError: If custom_file is specified but not found.
+    """
+    if frame_rate <= 0:
+        raise ValueError(f"frame_rate must be positive, got {frame_rate}")
+    frame_delay = 1 / frame_rate
+    color_depth = resolve_color_depth(color_depth)
+
+    with _terminal_size(columns, rows) as (columns, rows):
+        prepared = _prepare_banner(effect_name, speed_preference, theme, custom_text, custom_file)
+        header = {
+            "version": ASCIICAST_VERSION,
+            "width": columns,
+            "height": rows,
+            "timestamp": int(time.time()),
+            "env": {"TERM": os.environ.get("TERM") or "xterm-256color"},
+            "title": title or f"haKCer {prepared[1]} ({prepared[2]})",
+        }
+
+        top, left = prepared[4]
+        player = FramePlayer(frame_rate, top=top, left=left)
+        at = 0.0
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(header, ensure_ascii=False) + "\n")
+            frames = _banner_frames(*prepared[:4], use_cache=use_cache)
+            frames = quantize_frames(frames, color_depth)
+            for index, frame in enumerate(frames):
+                at = index * frame_delay
+                output = player.draw(frame)
+                if output:
+                    f.write(_event(at, output))
+
+            f.write(_event(at, player.close()))
+            if clear_after:
+                at += hold_time
+                f.write(_event(at, "\x1b[2J\x1b[H"))
+            elif hold_time > 0:
+                # An empty event keeps players on the final frame for the hold
+                at += hold_time
+                f.write(_event(at, ""))
+
+    return at
+
+
+def play_recording(path: str, speed: float = 1.0) -> None:
+    """
+    Replay an asciicast v2 recording to stdout with its original pacing.
+
+    Args:
+        path: Recording to play.
+        speed: Playback speed multiplier. 2.0 plays twice as fast.
+
+    Raises:
+        ValueError: If speed is not positive or the file is not an asciicast v2 recording.
+        FileNotFoundError: If the recording does not exist.
+    """
+    if speed <= 0:
+        raise ValueError(f"speed must be positive, got {speed}")
+
+    with open(path, encoding="utf-8") as f:
+        try:
+            header = json.loads(f.readline())
+        except json.JSONDecodeError:
+            header = None
+        if not isinstance(header, dict) or header.get("version") != ASCIICAST_VERSION:
+            raise ValueError(f"Not an asciicast v{ASCIICAST_VERSION} recording: {path}")
+
+        out = FrameWriter()
+        started = time.monotonic()
+        try:
+            for line in f:
+                if not line.strip():
+                    continue
+                at, kind, data = json.loads(line)
+                if kind != "o":
+                    continue
+                delay = started + at / speed - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                out.write(data)
+                out.flush()
+        except BaseException:
+            # Interrupted part way: don't leave the cursor hidden
+            out.write(SHOW_CURSOR)
+            out.flush()
+            raise
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    Command line entry point for hakcer record.
+
+    Args:
+        argv: Arguments, without the program and subcommand names.
+
+    Returns:
+        Process exit code.
+    """
+    parser = argparse.ArgumentParser(
+        prog="hakcer record",
+        description="Record a banner to an asciicast v2 file.",
+    )
+    parser.add_argument("output", help="file to write, e.g. banner.cast")
+    parser.add_argument("--effect", choices=list_effects(),
+                        help="effect to record (random if omitted)")
+    parser.add_argument("--speed", default="fast", choices=["fast", "medium", "slow", "any"],
+                        help="speed category for random effect selection (default: fast)")
+    parser.add_argument("--theme", choices=list_available_themes(),
+                        help="theme (current theme if omitted)")
+    parser.add_argument("--text", help="custom ASCII art text")
+    parser.add_argument("--file", help="file containing custom ASCII art")
+    parser.add_argument("--hold", type=float, default=1.5,
+                        help="seconds to hold the final frame (default: 1.5)")
+    parser.add_argument("--clear", action="store_true", help="clear the screen at the end")
+    parser.add_argument("--fps", type=int, default=DEFAULT_FRAME_RATE,
+                        help=f"frames per second (default: {DEFAULT_FRAME_RATE})")
+    parser.add_argument("--columns", type=int, help="terminal width to record at")
+    parser.add_argument("--rows", type=int, help="terminal height to record at")
+    parser.add_argument("--cache", action="store_true", help="use the on-disk frame cache")
+    parser.add_argument("--colors", default="truecolor", choices=COLOR_DEPTHS,
+                        help="color depth to record (default: truecolor)")
+    args = parser.parse_args(argv)
+
+    try:
+        length = record_banner(
+            args.output,
+            effect_name=args.effect,
+            speed_preference=args.speed,
+            hold_time=args.hold,
+            clear_after=args.clear,
+            theme=args.theme,
+            custom_text=args.text,
+            custom_file=args.file,
+            use_cache=args.cache,
+            frame_rate=args.fps,
+            columns=args.columns,
+            rows=args.rows,
+            color_depth=args.colors,
+        )
+    except (ValueError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(f"Recorded {length:.2f}s to {args.output}")
+    return 0
+
+
+def play_main(argv: Optional[list[str]] = None) -> int:
+    """
+    Command line entry point for hakcer play.
+
+    Args:
+        argv: Arguments, without the program and subcommand names.
+
+    Returns:
+        Process exit code.
+    """
+    parser = argparse.ArgumentParser(
+        prog="hakcer play",
+        description="Replay an asciicast v2 recording.",
+    )
+    parser.add_argument("recording", help="file to play")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="playback speed multiplier (default: 1.0)")
+    args = parser.parse_args(argv)
+
+    try:
+        play_recording(args.recording, speed=args.speed)
+    except (ValueError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        return 130
+    return 0
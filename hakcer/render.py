@@ -0,0 +1,403 @@
+"""
+Frame rendering for haKCer banners.
+
+terminaltexteffects hands back every frame as a complete canvas: one string per
+row, each cell carrying its own SGR color sequence. Repainting that whole
+canvas every tick is wasteful when only a few characters moved, so frames are
+diffed against the previously drawn frame and only the changed cells are
+emitted, with cursor movement to skip over the unchanged ones. The output
+also tracks the current SGR state, so a run of cells sharing a color sets it
+once, and runs of blank cells are erased (ECH, EL) instead of written out.
+
+The final frame of an effect can also be rendered directly: final_frame()
+lays the art out on the same canvas terminaltexteffects would use and colors
+it with the effect's final gradient, without running the animation.
+"""
+
+import re
+import shutil
+from typing import Optional, Sequence
+
+from .art import char_width
+
+# A single canvas cell: optional SGR sequences, one character, optional reset
+_CELL_PATTERN = re.compile(r"(?:\x1b\[[0-9;]*m)*[^\x1b](?:\x1b\[0m)?")
+_CELL_PARTS_PATTERN = re.compile(r"((?:\x1b\[[0-9;]*m)*)([^\x1b])(?:\x1b\[0m)?")
+
+# A style that only sets the foreground color, which does not show on spaces
+_FOREGROUND_PATTERN = re.compile(r"\x1b\[(?:38;2;\d+;\d+;\d+|38;5;\d+|3[0-7]|9[0-7])m")
+
+_BLANK = ("", " ")
+RESET = "\x1b[0m"
+ERASE_LINE = "\x1b[K"
+
+
+def split_cells(row: str) -> list[str]:
+    """
+    Split a rendered row into its cells.
+
+    Args:
+        row: One row of a frame as produced by terminaltexteffects.
+
+    Returns:
+        List of cells, each a character with its own SGR sequences.
+    """
+    return _CELL_PATTERN.findall(row)
+
+
+def _plain(style: str) -> bool:
+    """Check whether a style leaves spaces looking blank (no style, or only a foreground color)."""
+    return not style or _FOREGROUND_PATTERN.fullmatch(style) is not None
+
+
+def _parse_cells(row: str) -> list[tuple[str, str]]:
+    """Split a row into (style, character) cells, with every blank space as ("", " ")."""
+    return [
+        _BLANK if char == " " and _plain(style) else (style, char)
+        for style, char in _CELL_PARTS_PATTERN.findall(row)
+    ]
+
+
+def _uneven(row: str) -> bool:
+    """Check whether a row has characters that are not one column wide (CJK, emoji, combining)."""
+    return not row.isascii() and any(char_width(char) != 1 for char in row if not char.isascii())
+
+
+def _move(
+    from_row: int, from_col: Optional[int], to_row: int, to_col: int, left: int = 0
+) -> str:
+    """
+    Build the shortest cursor movement between canvas positions.
+
+    left is the canvas' screen column. A from_col of None means the cursor's
+    column is unknown, so the column is always set absolutely.
+    """
+    sequence = ""
+    if to_row > from_row:
+        sequence += f"\x1b[{to_row - from_row}B"
+    elif to_row < from_row:
+        sequence += f"\x1b[{from_row - to_row}A"
+    if from_col is None:
+        sequence += f"\x1b[{left + to_col + 1}G"
+    elif to_col != from_col:
+        if to_col > from_col:
+            forward = f"\x1b[{to_col - from_col}C"
+            absolute = f"\x1b[{left + to_col + 1}G"
+            sequence += forward if len(forward) <= len(absolute) else absolute
+        else:
+            sequence += f"\x1b[{left + to_col + 1}G"
+    return sequence
+
+
+class _Output:
+    """
+    Terminal output for one frame that tracks the SGR state.
+
+    terminaltexteffects resets the style after every cell, so a block of
+    cells sharing a color repeats the same sequence for each one. Here a
+    sequence is only emitted when the style actually changes, and runs of
+    blank cells are erased instead of written out.
+    """
+
+    def __init__(self, style: str = "") -> None:
+        self.parts: list[str] = []
+        self.style = style
+
+    def restyle(self, style: str) -> None:
+        """Switch to a style, resetting first unless the new one simply replaces the old."""
+        if style == self.style:
+            return
+        if not style:
+            self.parts.append(RESET)
+        elif not self.style or (_plain(self.style) and _plain(style)):
+            self.parts.append(style)
+        else:
+            self.parts.append(RESET + style)
+        self.style = style
+
+    def blank(self, count: int, to_line_end: bool = False) -> None:
+        """
+        Blank count cells from the cursor.
+
+        Uses spaces or ECH and CUF, whichever is shorter. With to_line_end the
+        rest of the line is erased with EL and the cursor does not move.
+        """
+        # Spaces and erased cells take the current background color
+        if not _plain(self.style):
+            self.restyle("")
+        spaces = " " * count
+        if to_line_end:
+            erase = ERASE_LINE
+        else:
+            erase = f"\x1b[{count}X\x1b[{count}C"
+        self.parts.append(spaces if len(spaces) <= len(erase) else erase)
+
+    def cells(self, cells: Sequence[tuple[str, str]], to_line_end: bool = False) -> int:
+        """
+        Write cells from the cursor, collapsing runs of blanks.
+
+        Args:
+            cells: (style, character) cells to write.
+            to_line_end: Whether the cells run to the end of the canvas row,
+                so trailing blanks can be erased with EL.
+
+        Returns:
+            Number of columns the cursor moved, which is short of len(cells)
+            when trailing blanks were erased with EL.
+        """
+        run = 0
+        for style, char in cells:
+            if char == " " and not style:
+                run += 1
+                continue
+            if run:
+                self.blank(run)
+                run = 0
+            self.restyle(style)
+            self.parts.append(char)
+        if run:
+            self.blank(run, to_line_end)
+            if self.parts[-1] == ERASE_LINE:
+                return len(cells) - run
+        return len(cells)
+
+    def finish(self) -> str:
+        """Get the output, leaving the terminal in the default style."""
+        if self.style:
+            self.parts.append(RESET)
+        return "".join(self.parts)
+
+
+class DiffRenderer:
+    """
+    Render frames as the minimal update from the previously rendered frame.
+
+    Output for each frame assumes the cursor starts at the beginning of the
+    canvas' top row, left columns before its first cell. The first frame (and
+    any frame whose canvas size changed) is emitted in full. Either way a
+    color is only set when it differs from the previous cell's and runs of
+    blank cells are erased rather than written.
+
+    Args:
+        left: Screen column (0-based) of the canvas' left edge, for canvases
+            that are drawn indented rather than padded with spaces.
+
+    Attributes:
+        frame_bytes: Bytes emitted for each rendered frame.
+        full_frame_bytes: Bytes a full repaint of each frame would have cost.
+    """
+
+    def __init__(self, left: int = 0) -> None:
+        self.left = left
+        self._previous: Optional[list[str]] = None
+        # Parsed cells of the rows that changed in the previous frame
+        self._parsed: dict[int, list[tuple[str, str]]] = {}
+        self.frame_bytes: list[int] = []
+        self.full_frame_bytes: list[int] = []
+
+    def reset(self) -> None:
+        """Forget the previous frame so the next one is drawn in full."""
+        self._previous = None
+        self._parsed = {}
+
+    @property
+    def bytes_written(self) -> int:
+        """Total bytes emitted across all rendered frames."""
+        return sum(self.frame_bytes)
+
+    @property
+    def bytes_saved(self) -> int:
+        """Bytes avoided compared to repainting every frame in full."""
+        return sum(self.full_frame_bytes) - self.bytes_written
+
+    def render(self, frame: str) -> str:
+        """
+        Render a frame as terminal output.
+
+        Args:
+            frame: Full frame from terminaltexteffects.
+
+        Returns:
+            Escape sequences and characters that update the canvas to this frame.
+            Empty if nothing changed.
+        """
+        rows = frame.split("\n")
+        previous = self._previous
+        self._previous = rows
+
+        output = None
+        if previous is not None and len(previous) == len(rows):
+            output = self._diff(previous, rows, self._parsed)
+        if output is None:
+            self._parsed = {}
+            output = self._full(rows)
+
+        self.frame_bytes.append(len(output.encode("utf-8")))
+        self.full_frame_bytes.append(len(frame.encode("utf-8")))
+        return output
+
+    def _full(self, rows: list[str]) -> str:
+        """Draw every row of a frame over whatever the canvas held before."""
+        out = _Output()
+        indent = f"\x1b[{self.left}C" if self.left else ""
+        for row_index, row in enumerate(rows):
+            out.parts.append(f"\n{indent}" if row_index else indent)
+            out.cells(_parse_cells(row), to_line_end=True)
+        return out.finish()
+
+    def _diff(
+        self, previous: list[str], rows: list[str], parsed: dict[int, list[tuple[str, str]]]
+    ) -> Optional[str]:
+        """Build the update between two frames, or None if the canvas width changed."""
+        out = _Output()
+        cursor_row, cursor_col = 0, -self.left
+        self._parsed = {}
+        for row_index, (old_row, new_row) in enumerate(zip(previous, rows)):
+            if old_row == new_row:
+                continue
+            old_cells = parsed.get(row_index) or _parse_cells(old_row)
+            new_cells = self._parsed[row_index] = _parse_cells(new_row)
+            if len(old_cells) != len(new_cells):
+                return None
+
+            if _uneven(old_row) or _uneven(new_row):
+                # Cells no longer match screen columns once a wide character
+                # is on the row, so the whole row is redrawn from its start
+                out.parts.append(_move(cursor_row, cursor_col, row_index, 0, self.left))
+                out.cells(new_cells, to_line_end=True)
+                if out.parts[-1] != ERASE_LINE:
+                    # The old row may have reached further across the screen
+                    if not _plain(out.style):
+                        out.restyle("")
+                    out.parts.append(ERASE_LINE)
+                cursor_row, cursor_col = row_index, None
+                continue
+
+            # Changed cells grouped into runs of adjacent columns
+            runs: list[list[int]] = []
+            for col, cell in enumerate(new_cells):
+                if old_cells[col] == cell:
+                    continue
+                if runs and runs[-1][1] == col:
+                    runs[-1][1] = col + 1
+                else:
+                    runs.append([col, col + 1])
+            if not runs:
+                continue
+
+            # Changes past the last visible character can all go with one EL
+            tail = len(new_cells)
+            while tail and new_cells[tail - 1] is _BLANK:
+                tail -= 1
+            if sum(end - max(start, tail) for start, end in runs if end > tail) >= len(ERASE_LINE):
+                first = next(max(start, tail) for start, end in runs if end > tail)
+                runs = [[start, min(end, tail)] for start, end in runs if start < tail]
+                runs.append([first, len(new_cells)])
+
+            for start, end in runs:
+                move = _move(cursor_row, cursor_col, row_index, start, self.left)
+                if (
+                    row_index == cursor_row
+                    and cursor_col is not None
+                    and 0 <= cursor_col < start < cursor_col + len(move)
+                ):
+                    # Rewriting a short run of unchanged cells can be cheaper than moving
+                    gap = _Output(out.style)
+                    gap.cells(new_cells[cursor_col:start])
+                    if len("".join(gap.parts)) <= len(move):
+                        move = ""
+                        start = cursor_col
+                out.parts.append(move)
+                moved = out.cells(new_cells[start:end], to_line_end=end == len(new_cells))
+                cursor_row, cursor_col = row_index, start + moved
+        return out.finish()
+
+
+def place_frame(frame: str, top: int = 0, left: int = 0) -> str:
+    """
+    Put a frame of trimmed art back where the untrimmed art would have been.
+
+    Args:
+        frame: Frame to place.
+        top: Blank lines to add above it.
+        left: Spaces to add before each row.
+
+    Returns:
+        The frame, as one string to write as-is.
+    """
+    if left:
+        padding = " " * left
+        frame = "\n".join(padding + row for row in frame.split("\n"))
+    return "\n" * top + frame
+
+
+def final_frame(
+    ascii_art: str,
+    gradient_stops: Sequence,
+    gradient_steps=12,
+    gradient_direction=None,
+    tab_width: int = 4,
+) -> str:
+    """
+    Render the final frame of an effect straight from the art.
+
+    Reproduces the canvas layout of terminaltexteffects' default terminal
+    configuration: tabs are expanded, trailing whitespace is dropped, the
+    canvas is clipped to the terminal and the text is anchored to its bottom
+    left. Every non-space character gets the color the final gradient assigns
+    to its coordinate.
+
+    Args:
+        ascii_art: Art to render.
+        gradient_stops: terminaltexteffects Color stops of the final gradient.
+        gradient_steps: Gradient steps, as for the effect's final_gradient_steps.
+        gradient_direction: Gradient.Direction of the gradient. Vertical if None.
+        tab_width: Spaces each tab expands to.
+
+    Returns:
+        The frame, with the same rows and cells the effect would end on.
+    """
+    from terminaltexteffects.utils import colorterm
+    from terminaltexteffects.utils.geometry import Coord
+    from terminaltexteffects.utils.graphics import Gradient
+
+    lines = [line.rstrip() for line in ascii_art.replace("\t", " " * tab_width).splitlines()]
+    if not lines:
+        return ""
+    try:
+        terminal_width, terminal_height = shutil.get_terminal_size()
+    except OSError:
+        terminal_width, terminal_height = 80, 24
+    width = min(terminal_width, max(len(line) for line in lines))
+    height = min(terminal_height, len(lines))
+
+    # Canvas rows count up from the bottom; lines above the canvas are clipped
+    visible = lines[len(lines) - height:]
+    glyphs = {
+        (column, height - index): char
+        for index, line in enumerate(visible)
+        for column, char in enumerate(line[:width], start=1)
+        if char != " "
+    }
+    if not glyphs:
+        return "\n".join(" " * width for _ in range(height))
+
+    columns = [column for column, _ in glyphs]
+    rows = [row for _, row in glyphs]
+    if gradient_direction is None:
+        gradient_direction = Gradient.Direction.VERTICAL
+    gradient = Gradient(*gradient_stops, steps=gradient_steps)
+    mapping = gradient.build_coordinate_color_mapping(
+        min(rows), max(rows), min(columns), max(columns), gradient_direction
+    )
+
+    # Neighbouring cells usually share a color, so format each color once
+    sequences: dict = {}
+    grid = [[" "] * width for _ in range(height)]
+    for (column, row), char in glyphs.items():
+        color = mapping[Coord(column, row)]
+        sequence = sequences.get(color)
+        if sequence is None:
+            sequence = sequences[color] = colorterm.fg(color.rgb_color)
+        grid[height - row][column - 1] = f"{sequence}{char}\x1b[0m"
+    return "\n".join("".join(row) for row in grid)
@@ -0,0 +1,141 @@
+"""
+Timing statistics for haKCer banners.
+
+show_banner() measures where a banner's time goes: building the effect
+config, setting up the effect, generating each frame and writing it to the
+terminal. The measurements come back as a BannerStats, small enough to log
+from every run, so slow effect, theme and host combinations can be found in
+production. dataclasses.asdict() turns one into plain JSON-ready data.
+"""
+
+import bisect
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+# Upper bounds of the latency histogram buckets, in seconds; a final bucket holds anything slower
+LATENCY_BUCKETS = (0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+# Called after each frame is written with (frame index, generate seconds, write seconds)
+FrameCallback = Callable[[int, float, float], None]
+
+
+@dataclass
+class LatencyHistogram:
+    """
+    Distribution of per-frame latencies.
+
+    Attributes:
+        buckets: Upper bound in seconds of each bucket but the last.
+        counts: Samples per bucket, with one more entry than buckets for
+            samples slower than the last bound.
+        total_seconds: Sum of all samples.
+        max_seconds: Slowest sample.
+    """
+
+    buckets: tuple[float, ...] = LATENCY_BUCKETS
+    counts: list[int] = field(default_factory=list)
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def __post_init__(self) -> None:
+        if not self.counts:
+            self.counts = [0] * (len(self.buckets) + 1)
+
+    @property
+    def count(self) -> int:
+        """Number of samples."""
+        return sum(self.counts)
+
+    @property
+    def mean_seconds(self) -> float:
+        """Average sample, 0 without samples."""
+        count = self.count
+        return self.total_seconds / count if count else 0.0
+
+    def record(self, seconds: float) -> None:
+        """Add a sample."""
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Estimate a percentile from the buckets.
+
+        Args:
+            fraction: Share of samples at or below the result, e.g. 0.95.
+
+        Returns:
+            Upper bound of the bucket the percentile falls in (the slowest
+            sample for the last bucket), 0 without samples.
+        """
+        target = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= target:
+                return self.buckets[index] if index < len(self.buckets) else self.max_seconds
+        return 0.0
+
+
+@dataclass
+class BannerStats:
+    """
+    Where the time of one banner went.
+
+    Attributes:
+        effect: Effect name.
+        theme: Theme name.
+        mode: Resolved banner mode ("animate", "static" or "plain").
+        frames: Frames written. A static banner is written as one frame.
+        cached: Whether the frames came from the frame cache.
+        skipped: Whether playback jumped to the final frame early (key press,
+            max_duration or finish()).
+        config_seconds: Time spent building (or looking up) the effect config.
+        construction_seconds: Time spent importing the effect and setting it up
+            for the art, before its first frame.
+        generate: Time spent waiting for each frame to be generated.
+        write: Time spent writing each frame to the terminal.
+        bytes_written: Bytes of frame output written.
+        wall_seconds: Total time, from the call to its return, hold_time included.
+    """
+
+    effect: str
+    theme: str
+    mode: str
+    frames: int = 0
+    cached: bool = False
+    skipped: bool = False
+    config_seconds: float = 0.0
+    construction_seconds: float = 0.0
+    generate: LatencyHistogram = field(default_factory=LatencyHistogram)
+    write: LatencyHistogram = field(default_factory=LatencyHistogram)
+    bytes_written: int = 0
+    wall_seconds: float = 0.0
+
+    def record_frame(
+        self,
+        generate_seconds: float,
+        write_seconds: float,
+        output_bytes: int,
+        on_frame: Optional[FrameCallback] = None,
+    ) -> None:
+        """
+        Add a written frame's measurements.
+
+        Args:
+            generate_seconds: Time the frame took to generate.
+            write_seconds: Time the frame took to write.
+            output_bytes: Bytes written for the frame.
+            on_frame: Callback to pass the measurements on to.
+        """
+        self.generate.record(generate_seconds)
+        self.write.record(write_seconds)
+        self.bytes_written += output_bytes
+        self.frames += 1
+        if on_frame is not None:
+            on_frame(self.frames - 1, generate_seconds, write_seconds)
+
+    def record_skip(self) -> None:
+        """Note that playback jumped to the final frame early."""
+        self.skipped = True
@@ -17,6 +17,7 @@ setup(
     long_description_content_type="text/markdown",
     url="https://github.com/haKC-ai/hakcer",
     packages=find_packages(),
+    package_data={"hakcer": ["calibration.json"]},
     classifiers=[
         "Development Status :: 4 - Beta",
         "Intended Audience :: Developers",
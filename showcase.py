@@ -26,6 +26,7 @@ from rich.align import Align
 from rich import box
 
 from hakcer import show_banner, set_theme, list_themes, list_effects, get_effects_by_speed
+from hakcer.prerender import PrerenderJob, prerender
 from hakcer.themes import THEMES
 
 # Pick random theme for menu colors
@@ -99,6 +100,52 @@ def create_menu_table() -> Table:
     return table
 
 
+def prerender_combos(combos) -> bool:
+    """Offer to render every (banner file, theme, effect) combination on all cores before playback."""
+    workers = os.cpu_count() or 1
+    if not Confirm.ask(
+        f"[yellow]Pre-render all {len(combos)} combinations on {workers} cores first?[/yellow]",
+        default=True
+    ):
+        return False
+
+    jobs = [
+        PrerenderJob(effect, theme, None if banner_file is None else str(banner_file))
+        for banner_file, theme, effect in combos
+    ]
+    started = time.time()
+    done = 0
+    with console.status("[cyan]Pre-rendering...[/cyan]") as status:
+        def report(result):
+            nonlocal done
+            done += 1
+            status.update(f"[cyan]Pre-rendering {done}/{len(jobs)}...[/cyan]")
+            if result.error:
+                console.print(f"[red]Error with {result.job.effect}: {result.error}[/red]")
+
+        prerender(jobs, workers=workers, on_result=report)
+    console.print(f"[green]Pre-rendered {len(jobs)} banners in {time.time() - started:.1f}s[/green]")
+    return True
+
+
+def print_speed_options():
+    """Print the speed choices with effect counts for the current terminal.
+
+    Tiers are estimated from the cost model for the default banner at the
+    current terminal width, so the counts change with the terminal size.
+    """
+    console.print("\n[cyan]Effect Speed Options:[/cyan] (for the default banner at this width)")
+    descriptions = {
+        "fast": "quick animations",
+        "medium": "moderate speed",
+        "slow": "longer animations",
+    }
+    for speed, description in descriptions.items():
+        count = len(get_effects_by_speed(speed))
+        console.print(f"  [white]'{speed}'[/white] - {count} effects, {description}")
+    console.print(f"  [white]'all'[/white] - All {len(list_effects())} effects\n")
+
+
 def showcase_all_effects(hold_time: float = 1.5, clear_between: bool = True):
     """Showcase ALL effects with ALL themes - perfect for video recording."""
     console.print("\n")
@@ -141,11 +188,7 @@ def showcase_all_effects(hold_time: float = 1.5, clear_between: bool = True):
                 # Skip adding None later
 
                 # Ask for speed preference
-                console.print("\n[cyan]Effect Speed Options:[/cyan]")
-                console.print("  [white]'fast'[/white] - 10 effects, quick animations (~15 min for all combos)")
-                console.print("  [white]'medium'[/white] - 10 effects, moderate speed (~25 min for all combos)")
-                console.print("  [white]'slow'[/white] - 9 effects, longer animations (~40 min for all combos)")
-                console.print("  [white]'all'[/white] - All 29 effects (~90 min for all combos)\n")
+                print_speed_options()
 
                 speed_choice = Prompt.ask(
                     "[yellow]Which speed preference?[/yellow]",
@@ -176,6 +219,13 @@ def showcase_all_effects(hold_time: float = 1.5, clear_between: bool = True):
                 if not Confirm.ask("[bold]Ready to start showcase?[/bold]", default=True):
                     return
 
+                use_cache = prerender_combos([
+                    (banner_file, theme, effect)
+                    for banner_file in banners
+                    for theme in themes
+                    for effect in all_effects
+                ])
+
                 console.print("\n[bold green]Starting in 3...[/bold green]")
                 time.sleep(1)
                 console.print("[bold green]2...[/bold green]")
@@ -197,7 +247,12 @@ def showcase_all_effects(hold_time: float = 1.5, clear_between: bool = True):
 
                             set_theme(theme)
                             try:
-                                show_banner(custom_file=str(banner_file), effect_name=effect, hold_time=hold_time)
+                                show_banner(
+                                    custom_file=str(banner_file),
+                                    effect_name=effect,
+                                    hold_time=hold_time,
+                                    use_cache=use_cache
+                                )
                             except Exception as e:
                                 console.print(f"[red]Error with {effect}: {e}[/red]")
                                 continue
@@ -232,11 +287,7 @@ def showcase_all_effects(hold_time: float = 1.5, clear_between: bool = True):
     banners = [None] + custom_banners  # None = default haKCer banner
 
     # Ask for speed preference
-    console.print("\n[cyan]Effect Speed Options:[/cyan]")
-    console.print("  [white]'fast'[/white] - 10 effects, quick animations (~15 min for all combos)")
-    console.print("  [white]'medium'[/white] - 10 effects, moderate speed (~25 min for all combos)")
-    console.print("  [white]'slow'[/white] - 9 effects, longer animations (~40 min for all combos)")
-    console.print("  [white]'all'[/white] - All 29 effects (~90 min for all combos)\n")
+    print_speed_options()
 
     speed_choice = Prompt.ask(
         "[yellow]Which speed preference?[/yellow]",
@@ -268,6 +319,14 @@ def showcase_all_effects(hold_time: float = 1.5, clear_between: bool = True):
     if not Confirm.ask("[bold]Ready to start showcase?[/bold]", default=True):
         return
 
+    # Banners rotate across combinations, matching the loop below
+    use_cache = prerender_combos([
+        (banners[index % len(banners)], theme, effect)
+        for index, (theme, effect) in enumerate(
+            (theme, effect) for theme in themes for effect in all_effects
+        )
+    ])
+
     console.print("\n[bold green]Starting in 3...[/bold green]")
     time.sleep(1)
     console.print("[bold green]2...[/bold green]")
@@ -299,13 +358,14 @@ def showcase_all_effects(hold_time: float = 1.5, clear_between: bool = True):
             try:
                 if banner_file is None:
                     # Use default banner
-                    show_banner(effect_name=effect, hold_time=hold_time)
+                    show_banner(effect_name=effect, hold_time=hold_time, use_cache=use_cache)
                 else:
                     # Use custom banner
                     show_banner(
                         custom_file=str(banner_file),
                         effect_name=effect,
-                        hold_time=hold_time
+                        hold_time=hold_time,
+                        use_cache=use_cache
                     )
             except Exception as e:
                 console.print(f"[red]Error with {effect}: {e}[/red]")
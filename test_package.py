@@ -16,6 +16,8 @@ def test_imports():
     try:
         from hakcer import (
             show_banner,
+            show_banner_async,
+            start_banner,
             list_effects,
             get_effects_by_speed,
             set_theme,
@@ -30,6 +32,52 @@ def test_imports():
         return False
 
 
+def test_lazy_effect_imports():
+    """Test that listing effects and themes does not import terminaltexteffects."""
+    print("\nTesting lazy effect imports...")
+    try:
+        import subprocess
+
+        code = (
+            "import sys\n"
+            "import hakcer\n"
+            "hakcer.list_effects()\n"
+            "hakcer.get_effects_by_speed('fast')\n"
+            "hakcer.list_themes()\n"
+            "print(any(m.startswith('terminaltexteffects') for m in sys.modules))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=str(Path(__file__).parent),
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0 or result.stdout.strip() != "False":
+            print(f"✗ terminaltexteffects was imported eagerly: {result.stdout}{result.stderr}")
+            return False
+        print("✓ import hakcer does not load terminaltexteffects")
+
+        from hakcer.effects import EFFECT_REGISTRY, load_effect
+        from hakcer.banner import ALL_EFFECTS
+
+        if sorted(EFFECT_REGISTRY) != sorted(ALL_EFFECTS):
+            print("✗ Effect registry does not match effect speed lists")
+            return False
+
+        effect_class, config_class = load_effect("slide")
+        if effect_class.__name__ != "Slide" or config_class.__name__ != "SlideConfig":
+            print(f"✗ load_effect returned {effect_class}, {config_class}")
+            return False
+        print("✓ Effects load on demand from the registry")
+
+        return True
+    except Exception as e:
+        print(f"✗ Lazy import test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
 def test_themes():
     """Test theme functionality."""
     print("\nTesting themes...")
@@ -96,6 +144,250 @@ def test_effects():
         return False
 
 
+def test_cost_model():
+    """Test the calibrated cost model and the speed tiers built on it."""
+    print("\nTesting cost model...")
+    try:
+        from hakcer import list_effects, get_effects_by_speed
+        from hakcer.costs import TIER_LIMITS, art_metrics, estimate_seconds, fit_linear, load_calibration
+
+        coefficients = fit_linear([(c, e, 0.5 + 0.01 * c + 0.002 * e) for c, e in [(10, 50), (40, 90), (90, 400), (300, 310)]])
+        if any(abs(a - b) > 1e-6 for a, b in zip(coefficients, [0.5, 0.01, 0.002])):
+            print(f"✗ fit_linear() returned {coefficients}")
+            return False
+        print("✓ fit_linear() recovers known coefficients")
+
+        missing = set(list_effects()) - set(load_calibration()["effects"])
+        if missing:
+            print(f"✗ Shipped calibration is missing: {', '.join(sorted(missing))}")
+            return False
+        print("✓ Shipped calibration covers every effect")
+
+        from hakcer.banner import HAKCER_ASCII, _layout_art
+        # Measure the banner as show_banner() lays it out for this terminal
+        characters, cells = art_metrics(_layout_art(HAKCER_ASCII)[0])
+        for effect in get_effects_by_speed("fast"):
+            if estimate_seconds(effect, characters, cells) > TIER_LIMITS["fast"]:
+                print(f"✗ {effect} is estimated slower than the fast tier allows")
+                return False
+        small = get_effects_by_speed("fast", ascii_art="hi")
+        print(f"✓ Fast tier: {len(get_effects_by_speed('fast'))} effects for the banner, {len(small)} for tiny art")
+
+        from hakcer import estimate_duration, show_banner
+        from hakcer.banner import _select_effect
+
+        if estimate_duration("wipe") != estimate_seconds("wipe", characters, cells):
+            print("✗ estimate_duration() disagrees with the cost model")
+            return False
+        if not estimate_duration("wipe", "hi") < estimate_duration("wipe") < estimate_duration("swarm"):
+            print("✗ estimate_duration() does not grow with the art and the effect")
+            return False
+        budget = 2 * estimate_duration("wipe")
+        picked = {_select_effect(HAKCER_ASCII, "budget", budget) for _ in range(50)}
+        if any(estimate_duration(effect) > budget for effect in picked):
+            print(f"✗ Budget selection picked effects over {budget:.1f}s: {sorted(picked)}")
+            return False
+        try:
+            show_banner(speed_preference="budget", mode="plain")
+            print("✗ Budget selection without budget_seconds was accepted")
+            return False
+        except ValueError:
+            pass
+        print(f"✓ Budget of {budget:.1f}s picks from {len(picked)} effects")
+
+        import hakcer.bench
+        from hakcer.costs import calibrate
+
+        bench_effect = hakcer.bench.bench_effect
+
+        def flaky_bench(effect_name, art, **kwargs):
+            if kwargs["columns"] == 160:
+                raise IndexError("pop from empty list")
+            return bench_effect(effect_name, art, **kwargs)
+
+        errors = []
+        hakcer.bench.bench_effect = flaky_bench
+        try:
+            calibration = calibrate(
+                effects=["wipe"], sizes=[(12, 3)], on_error=lambda *args: errors.append(args)
+            )
+        finally:
+            hakcer.bench.bench_effect = bench_effect
+        if "wipe" not in calibration["effects"] or [e[:3] for e in errors] != [("wipe", "synthetic-12x3", 160)]:
+            print(f"✗ calibrate() did not skip the failing run: {errors}")
+            return False
+        print("✓ calibrate() skips runs that raise and fits the rest")
+
+        return True
+    except Exception as e:
+        print(f"✗ Cost model test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_static_modes():
+    """Test the static and plain output modes used outside a terminal."""
+    print("\nTesting static output modes...")
+    try:
+        import contextlib
+        import io
+        import time
+        from hakcer import show_banner
+
+        def capture(**kwargs):
+            output = io.StringIO()
+            started = time.monotonic()
+            with contextlib.redirect_stdout(output):
+                show_banner(custom_text="STATIC", effect_name="wipe", hold_time=10, clear_after=True, **kwargs)
+            return output.getvalue(), time.monotonic() - started
+
+        output, elapsed = capture(mode="plain")
+        if "\x1b" in output or "STATIC" not in output or elapsed > 1.0:
+            print(f"✗ Plain mode wrote {output!r} in {elapsed:.2f}s")
+            return False
+        print("✓ Plain mode writes uncolored art without holding")
+
+        output, elapsed = capture(mode="auto", color_depth="truecolor")
+        if "\x1b[?25l" in output or "\x1b7" in output or "\x1b[2J" in output:
+            print("✗ Auto mode wrote cursor control to a non-terminal stdout")
+            return False
+        if "\x1b[38;2;" not in output or elapsed > 5.0:
+            print(f"✗ Auto mode did not write a colored final frame promptly ({elapsed:.2f}s)")
+            return False
+        print(f"✓ Auto mode writes the final frame once when stdout is not a terminal ({elapsed:.2f}s)")
+
+        try:
+            show_banner(mode="sideways")
+            print("✗ Should have raised ValueError for invalid mode")
+            return False
+        except ValueError:
+            print("✓ Invalid mode raises ValueError")
+
+        return True
+    except Exception as e:
+        print(f"✗ Static mode test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_render_final():
+    """Test rendering the final frame without running the effect."""
+    print("\nTesting final frame rendering...")
+    try:
+        import time
+        from hakcer import render_final
+        from hakcer.art import center_art, terminal_size
+        from hakcer.banner import _effect_config_object
+        from hakcer.effects import load_effect
+        from hakcer.playback import iter_effect_frames
+
+        art = "FINAL FRAME\n  ~ render ~"
+        for effect_name in ("wipe", "slide", "pour"):
+            effect_class, _ = load_effect(effect_name)
+            effect = effect_class(center_art(art, terminal_size().columns))
+            effect.effect_config = _effect_config_object(effect_name, "neon")
+            for last_frame in iter_effect_frames(effect):
+                pass
+            if render_final(art, theme="neon", effect_name=effect_name) != last_frame:
+                print(f"✗ render_final differs from the last frame of {effect_name}")
+                return False
+        print("✓ render_final matches the effects' last frames")
+
+        started = time.perf_counter()
+        output = render_final(theme="cyberpunk")
+        elapsed = time.perf_counter() - started
+        if "\x1b[38;2;" not in output or elapsed > 0.5:
+            print(f"✗ render_final of the default banner took {elapsed:.3f}s")
+            return False
+        print(f"✓ Default banner rendered in {elapsed * 1000:.1f}ms")
+
+        for kwargs in ({"theme": "nope"}, {"effect_name": "nope"}):
+            try:
+                render_final(art, **kwargs)
+                print(f"✗ Should have raised ValueError for {kwargs}")
+                return False
+            except ValueError:
+                pass
+        print("✓ Unknown theme or effect raises ValueError")
+
+        return True
+    except Exception as e:
+        print(f"✗ Final frame test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_color_depth():
+    """Test color depth detection and quantization."""
+    print("\nTesting color depth...")
+    try:
+        import io
+        import contextlib
+        from hakcer import render_final, show_banner
+        from hakcer.colors import ansi_16_index, detect_color_depth, quantize_frame, xterm_256_index
+
+        cases = [
+            ({"COLORTERM": "truecolor", "TERM": "xterm"}, "truecolor"),
+            ({"TERM": "xterm-direct"}, "truecolor"),
+            ({"TERM": "screen-256color"}, "256"),
+            ({"TERM": "linux"}, "16"),
+        ]
+        for environ, expected in cases:
+            if detect_color_depth(environ) != expected:
+                print(f"✗ {environ} detected as {detect_color_depth(environ)}, expected {expected}")
+                return False
+        print("✓ Color depth detected from COLORTERM and TERM")
+
+        if (xterm_256_index((255, 0, 0)), xterm_256_index((128, 128, 128))) != (196, 244):
+            print("✗ Wrong xterm-256 colors")
+            return False
+        if (ansi_16_index((255, 0, 0)), ansi_16_index((10, 10, 10))) != (9, 0):
+            print("✗ Wrong ANSI colors")
+            return False
+        frame = "\x1b[38;2;255;0;0mA\x1b[0m \x1b[48;2;0;0;0mB\x1b[0m"
+        expected = {
+            "256": "\x1b[38;5;196mA\x1b[0m \x1b[48;5;16mB\x1b[0m",
+            "16": "\x1b[91mA\x1b[0m \x1b[40mB\x1b[0m",
+            "truecolor": frame,
+        }
+        for depth, output in expected.items():
+            if quantize_frame(frame, depth) != output:
+                print(f"✗ Wrong {depth} output: {quantize_frame(frame, depth)!r}")
+                return False
+        print("✓ Colors mapped to the nearest palette colors")
+
+        full = render_final(theme="neon")
+        reduced = render_final(theme="neon", color_depth="256")
+        if "38;2;" in reduced or len(reduced) >= len(full):
+            print("✗ 256-color banner still uses 24-bit colors")
+            return False
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            show_banner(theme="neon", mode="static", color_depth="16")
+        if "38;2;" in output.getvalue() or "\x1b[9" not in output.getvalue():
+            print("✗ 16-color static banner still uses 24-bit colors")
+            return False
+        print(f"✓ 256-color banner is {len(reduced) / len(full):.0%} of the 24-bit size")
+
+        try:
+            show_banner(color_depth="65k", mode="plain")
+            print("✗ Should have raised ValueError for an unknown color depth")
+            return False
+        except ValueError:
+            pass
+        print("✓ Unknown color depth raises ValueError")
+
+        return True
+    except Exception as e:
+        print(f"✗ Color depth test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
 def test_banner_display():
     """Test banner display (quick test only)."""
     print("\nTesting banner display...")
@@ -104,7 +396,7 @@ def test_banner_display():
 
         print("Testing Tokyo Night theme with fast effect...")
         set_theme("tokyo_night")
-        show_banner(effect_name="slide", hold_time=0.5)
+        show_banner(effect_name="slide", hold_time=0.5, mode="animate")
 
         print("✓ Banner displayed successfully")
         return True
@@ -115,6 +407,1023 @@ def test_banner_display():
         return False
 
 
+def test_effect_config_cache():
+    """Test that effect configs are compiled once and can be invalidated."""
+    print("\nTesting effect config cache...")
+    try:
+        from hakcer import THEMES, invalidate_effect_configs
+        from hakcer.banner import _effect_config_object
+
+        compiled = _effect_config_object("wipe", "neon")
+        if _effect_config_object("wipe", "neon") is not compiled:
+            print("✗ Effect config was rebuilt for the same theme and effect")
+            return False
+        print("✓ Effect config compiled once per theme and effect")
+
+        original = THEMES["neon"]["colors"]["primary"]
+        THEMES["neon"]["colors"]["primary"] = ["123456", "abcdef", "fedcba"]
+        try:
+            invalidate_effect_configs("neon")
+            compiled = _effect_config_object("wipe", "neon")
+            if "123456" not in repr(compiled.final_gradient_stops):
+                print("✗ invalidate_effect_configs() did not pick up the new theme colors")
+                return False
+        finally:
+            THEMES["neon"]["colors"]["primary"] = original
+            invalidate_effect_configs()
+        print("✓ invalidate_effect_configs() picks up runtime theme changes")
+
+        return True
+    except Exception as e:
+        print(f"✗ Effect config cache test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_effect_specs():
+    """Test that every effect spec builds its config and bad specs are rejected."""
+    print("\nTesting effect specs...")
+    try:
+        from hakcer import list_effects
+        from hakcer.effects import EFFECT_REGISTRY, build_effect_config, palette, register_effect
+        from hakcer.themes import THEMES
+
+        for theme_name, theme in THEMES.items():
+            for effect_name in list_effects():
+                build_effect_config(effect_name, theme["colors"])
+        print(f"✓ All {len(list_effects())} effect specs build for all {len(THEMES)} themes")
+
+        bad_specs = [
+            {"final_gradient_stops": palette("nonexistent_role")},
+            {"final_gradient_stops": ["00ff00"]},
+            {"typing_speed": None},
+        ]
+        for settings in bad_specs:
+            try:
+                register_effect("bad_effect", "terminaltexteffects.effects.effect_wipe", "Wipe", **settings)
+                EFFECT_REGISTRY.pop("bad_effect", None)
+                print(f"✗ Invalid spec was accepted: {settings}")
+                return False
+            except ValueError:
+                pass
+        print("✓ Invalid specs are rejected at registration")
+
+        return True
+    except Exception as e:
+        print(f"✗ Effect spec test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_art_cache():
+    """Test the in-memory cache of custom art files."""
+    print("\nTesting art cache...")
+    try:
+        import contextlib
+        import io
+        import os
+        import tempfile
+        from hakcer import preload_banners, show_banner
+        from hakcer import art
+        from hakcer.art import MMAP_THRESHOLD, _art_cache, load_art
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "logo.txt")
+            with open(path, "w", encoding="utf-8", newline="") as f:
+                f.write("LOGO  \r\n v1\r\n")
+            first = load_art(path)
+            if first != "LOGO\n v1\n" or load_art(path) is not first:
+                print(f"✗ Second load was not served from memory: {first!r}")
+                return False
+
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("LOGO v2\n")
+            if load_art(path) != "LOGO v2\n":
+                print("✗ Changed file was not re-read")
+                return False
+            print("✓ Art is cached until the file's mtime or size changes")
+
+            big = os.path.join(tmp, "big.txt")
+            with open(big, "w", encoding="utf-8") as f:
+                f.write(("▒█" * 40 + "\n") * (MMAP_THRESHOLD // 80))
+            if load_art(big).count("\n") != MMAP_THRESHOLD // 80:
+                print("✗ Large file read through mmap is incomplete")
+                return False
+
+            _art_cache.clear()
+            loaded = preload_banners(tmp)
+            if [os.path.basename(p) for p in loaded] != ["big.txt", "logo.txt"] or len(_art_cache) != 2:
+                print(f"✗ preload_banners() loaded {loaded}")
+                return False
+
+            def no_read(*args):
+                raise AssertionError("art file was read again")
+
+            output = io.StringIO()
+            original_read, art._read = art._read, no_read
+            try:
+                with contextlib.redirect_stdout(output):
+                    show_banner(custom_file=path, mode="plain")
+            finally:
+                art._read = original_read
+            if "LOGO v2" not in output.getvalue():
+                print("✗ show_banner() did not use the preloaded art")
+                return False
+            print(f"✓ preload_banners() warmed {len(loaded)} files for show_banner()")
+
+        return True
+    except Exception as e:
+        print(f"✗ Art cache test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_centering():
+    """Test centering by display width."""
+    print("\nTesting centering...")
+    try:
+        import os
+        from hakcer.art import center_art, display_width, terminal_size
+
+        widths = [display_width(text) for text in ("haKCer", "▒█", "漢字", "😀!", "é")]
+        if widths != [6, 2, 4, 3, 1]:
+            print(f"✗ display_width() returned {widths}")
+            return False
+        print("✓ Wide and combining characters are measured in cells")
+
+        if center_art("漢字漢字\nab  ", 20) != "      漢字漢字\n      ab":
+            print(f"✗ CJK art centered as {center_art('漢字漢字', 20)!r}")
+            return False
+        if center_art("漢字漢字\nab", 20) is not center_art("漢字漢字\nab", 20):
+            print("✗ Centered art was not cached")
+            return False
+        print("✓ CJK art is centered by its display width")
+
+        saved = os.environ.get("COLUMNS")
+        os.environ["COLUMNS"] = "40"
+        try:
+            if terminal_size().columns != 40 or center_art("ab", terminal_size().columns) != " " * 19 + "ab":
+                print("✗ COLUMNS override was not honored")
+                return False
+        finally:
+            if saved is None:
+                os.environ.pop("COLUMNS")
+            else:
+                os.environ["COLUMNS"] = saved
+        print("✓ Terminal size follows COLUMNS")
+
+        return True
+    except Exception as e:
+        print(f"✗ Centering test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_art_trimming():
+    """Test that effects get the art's bounding box and it is drawn in place."""
+    print("\nTesting art trimming...")
+    try:
+        import os
+        from hakcer.art import trim_art
+        from hakcer.banner import _banner_frames, _prepare_banner
+        from hakcer.render import DiffRenderer, split_cells
+
+        art = "\n\n    ab\n     c  \n\n"
+        if trim_art(art) != ("ab\n c", 2, 4) or trim_art(" \n") != ("", 0, 0):
+            print(f"✗ trim_art() returned {trim_art(art)}")
+            return False
+        print("✓ Blank lines and shared indentation are trimmed off")
+
+        saved = os.environ.get("COLUMNS")
+        os.environ["COLUMNS"] = "40"
+        try:
+            prepared = _prepare_banner("wipe", "fast", "neon", art, None)
+        finally:
+            if saved is None:
+                os.environ.pop("COLUMNS")
+            else:
+                os.environ["COLUMNS"] = saved
+        # Centering the untrimmed art would pad it by 17, plus its indentation of 4
+        if prepared[0] != "ab\n c" or prepared[4] != (2, 21):
+            print(f"✗ Banner laid out as {prepared[0]!r} at {prepared[4]}")
+            return False
+        frame = next(iter(_banner_frames(*prepared[:4], use_cache=False)))
+        if [len(split_cells(row)) for row in frame.split("\n")] != [2, 2]:
+            print(f"✗ Effect canvas is not the art's bounding box: {frame!r}")
+            return False
+        print("✓ Effects draw on the bounding box and keep the art's position")
+
+        renderer = DiffRenderer(left=3)
+        if renderer.render("AB\nCD") != "\x1b[3CAB\n\x1b[3CCD":
+            print("✗ Full frame was not drawn at the canvas offset")
+            return False
+        update = renderer.render("AB\nCX")
+        if update != "\x1b[1B\x1b[4CX":
+            print(f"✗ Unexpected update at the canvas offset: {update!r}")
+            return False
+        print("✓ Frames are drawn at the canvas offset")
+
+        return True
+    except Exception as e:
+        print(f"✗ Art trimming test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_art_fitting():
+    """Test cropping and downsampling of oversized art."""
+    print("\nTesting art fitting...")
+    try:
+        import contextlib
+        import io
+        import os
+        from hakcer import show_banner
+        from hakcer.art import fit_art
+        from hakcer.banner import HAKCER_ASCII
+
+        if fit_art(HAKCER_ASCII, 100, 40) is not HAKCER_ASCII:
+            print("✗ Art that fits was changed")
+            return False
+
+        wide = "\n".join("█▒" * 150 for _ in range(30))
+        for mode in ("downsample", "crop"):
+            fitted = fit_art(wide, 100, 20, mode=mode)
+            lines = fitted.split("\n")
+            if max(map(len, lines)) > 100 or len(lines) > 20:
+                print(f"✗ {mode} left {max(map(len, lines))}x{len(lines)} art")
+                return False
+        if set(fit_art(wide, 100, 20, mode="downsample")) - set(" ░▒▓█\n"):
+            print("✗ Downsampled art is not made of shades")
+            return False
+        print("✓ 300-column art is cropped or downsampled to the terminal")
+
+        if "P R E S E N T S" not in fit_art(HAKCER_ASCII, 80, 23):
+            print("✗ The banner was not cropped to an 80-column terminal")
+            return False
+        cropped = fit_art("漢字漢字\nab漢字cd", 5)
+        if cropped != " 字漢\nb漢字":
+            print(f"✗ Wide characters cropped as {cropped!r}")
+            return False
+        print("✓ Crop is the default and cuts by display cells")
+
+        fitted = fit_art(HAKCER_ASCII, 100, 40, max_characters=200)
+        if sum(1 for char in fitted if not char.isspace()) > 200:
+            print("✗ Character budget was exceeded")
+            return False
+        print("✓ Character budget is respected")
+
+        output = io.StringIO()
+        saved = {name: os.environ.get(name) for name in ("COLUMNS", "LINES")}
+        os.environ.update(COLUMNS="100", LINES="40")
+        try:
+            with contextlib.redirect_stdout(output):
+                show_banner(custom_file="custom_banners/curious_max.txt", mode="plain")
+        finally:
+            for name, value in saved.items():
+                if value is None:
+                    os.environ.pop(name)
+                else:
+                    os.environ[name] = value
+        if max(len(line) for line in output.getvalue().split("\n")) > 100:
+            print("✗ show_banner() did not fit a wide custom banner")
+            return False
+        for kwargs in ({"fit": "squash"}, {"max_characters": 0}):
+            try:
+                show_banner(mode="plain", **kwargs)
+                print(f"✗ Should have raised ValueError for {kwargs}")
+                return False
+            except ValueError:
+                pass
+        print("✓ show_banner() fits custom banners and validates fit options")
+
+        return True
+    except Exception as e:
+        print(f"✗ Art fitting test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_frame_cache():
+    """Test the on-disk frame cache."""
+    print("\nTesting frame cache...")
+    import os
+    import tempfile
+
+    old_cache_dir = os.environ.get("HAKCER_CACHE_DIR")
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            os.environ["HAKCER_CACHE_DIR"] = cache_dir
+            from hakcer import show_banner
+            from hakcer.cache import clear_frame_cache, frame_cache_key, load_frames, store_frames
+
+            key = frame_cache_key("art", "slide", {"primary": ["ffffff"]}, ["--gap", "1"])
+            if load_frames(key) is not None:
+                print("✗ Empty cache reported a hit")
+                return False
+
+            frames = ["\x1b[38;2;1;2;3mA\x1b[0m", "B\nC"]
+            if list(store_frames(key, iter(frames))) != frames:
+                print("✗ store_frames() altered the frames")
+                return False
+            if list(load_frames(key)) != frames:
+                print("✗ Cached frames did not round-trip")
+                return False
+            print("✓ Frames round-trip through the cache")
+
+            # An abandoned store must not leave a partial entry behind
+            other_key = frame_cache_key("art", "wipe", {"primary": ["ffffff"]}, [])
+            partial = store_frames(other_key, iter(frames))
+            next(partial)
+            partial.close()
+            if load_frames(other_key) is not None:
+                print("✗ Interrupted store left a cache entry")
+                return False
+            print("✓ Interrupted stores are discarded")
+
+            show_banner(custom_text="CACHE", effect_name="expand", hold_time=0, use_cache=True, mode="animate")
+            show_banner(custom_text="CACHE", effect_name="expand", hold_time=0, use_cache=True, mode="animate")
+            if clear_frame_cache() != 2:
+                print("✗ show_banner(use_cache=True) did not populate the cache")
+                return False
+            print("✓ show_banner(use_cache=True) stores and replays frames")
+
+        return True
+    except Exception as e:
+        print(f"✗ Frame cache test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        if old_cache_dir is None:
+            os.environ.pop("HAKCER_CACHE_DIR", None)
+        else:
+            os.environ["HAKCER_CACHE_DIR"] = old_cache_dir
+
+
+def test_prerender():
+    """Test pre-rendering banners in worker processes."""
+    print("\nTesting parallel pre-rendering...")
+    import os
+    import tempfile
+
+    old_cache_dir = os.environ.get("HAKCER_CACHE_DIR")
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            os.environ["HAKCER_CACHE_DIR"] = os.path.join(tmp, "cache")
+            from pathlib import Path
+            from hakcer.prerender import prerender, prerender_jobs, recording_path
+
+            art_file = Path(tmp) / "art.txt"
+            art_file.write_text("PRE\nRENDER\n", encoding="utf-8")
+            jobs = prerender_jobs(["wipe", "slide"], ["neon", "nord"], [str(art_file)])
+            if len(jobs) != 4:
+                print(f"✗ Expected 4 jobs, got {len(jobs)}")
+                return False
+
+            results = prerender(jobs, workers=2, columns=40, rows=10)
+            if [result.job for result in results] != jobs:
+                print("✗ Results are not in job order")
+                return False
+            if any(result.error or result.cached or not result.frames for result in results):
+                print(f"✗ Unexpected first run results: {results}")
+                return False
+            print("✓ Jobs render in worker processes")
+
+            results = prerender(jobs, workers=2, columns=40, rows=10)
+            if not all(result.cached for result in results):
+                print("✗ Second run did not find the cached frames")
+                return False
+            print("✓ Rendered frames land in the frame cache")
+
+            record_dir = Path(tmp) / "casts"
+            prerender(jobs[:1], workers=1, columns=40, rows=10, record_dir=str(record_dir))
+            if not recording_path(str(record_dir), jobs[0]).exists():
+                print("✗ No recording was written")
+                return False
+            print("✓ Jobs can write recordings instead")
+
+            try:
+                prerender_jobs(["nope"])
+                print("✗ Should have raised ValueError for unknown effect")
+                return False
+            except ValueError:
+                print("✓ Unknown effects raise ValueError")
+
+        return True
+    except Exception as e:
+        print(f"✗ Pre-render test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        if old_cache_dir is None:
+            os.environ.pop("HAKCER_CACHE_DIR", None)
+        else:
+            os.environ["HAKCER_CACHE_DIR"] = old_cache_dir
+
+
+def test_diff_renderer():
+    """Test that the diff renderer only emits changed cells."""
+    print("\nTesting diff renderer...")
+    try:
+        from hakcer.render import DiffRenderer, split_cells
+
+        red = "\x1b[38;2;255;0;0m"
+        reset = "\x1b[0m"
+        row = f"{red}A{reset}B C"
+        if split_cells(row) != [f"{red}A{reset}", "B", " ", "C"]:
+            print(f"✗ split_cells() returned {split_cells(row)}")
+            return False
+
+        renderer = DiffRenderer()
+        first = f"{red}A{reset}BC\nDEF"
+        if renderer.render(first) != first:
+            print("✗ First frame was not drawn in full")
+            return False
+        if renderer.render(first) != "":
+            print("✗ Unchanged frame produced output")
+            return False
+
+        update = renderer.render(f"{red}A{reset}BC\nDEX")
+        if update != "\x1b[1B\x1b[2CX":
+            print(f"✗ Unexpected update for one changed cell: {update!r}")
+            return False
+        if renderer.frame_bytes[1] != 0 or renderer.bytes_saved <= 0:
+            print("✗ Byte counters do not reflect the savings")
+            return False
+        print(f"✓ Diff renderer emits only changed cells ({renderer.bytes_saved} bytes saved)")
+
+        blue = "\x1b[38;2;0;0;255m"
+        row = f"{red}█{reset}{red}█{reset}{blue}▒{reset}" + " " * 12 + f"{blue}▒{reset}" + " " * 5
+        output = DiffRenderer().render(row)
+        if output != f"{red}██{blue}▒\x1b[12X\x1b[12C▒\x1b[K{reset}":
+            print(f"✗ Unexpected output for a full row: {output!r}")
+            return False
+        renderer = DiffRenderer()
+        renderer.render(f"{red}A{reset}{red}B{reset}{red}C{reset}{red}D{reset}\nEF")
+        update = renderer.render("    \nEF")
+        if update != "\x1b[K":
+            print(f"✗ Cleared row was not erased with EL: {update!r}")
+            return False
+        print(f"✓ Colors are set once per run and blank runs are erased ({len(output)} of {len(row)} bytes)")
+
+        # Wide characters take two columns, so rows holding them are redrawn whole
+        renderer = DiffRenderer(left=2)
+        renderer.render("漢字AB\nCD")
+        update = renderer.render("漢字AX\nCD")
+        if update != "\x1b[2C漢字AX\x1b[K":
+            print(f"✗ Row with wide characters was not redrawn: {update!r}")
+            return False
+        update = renderer.render("漢字AY\nCE")
+        if update != "\x1b[2C漢字AY\x1b[K\x1b[1B\x1b[4GE":
+            print(f"✗ Cursor was not placed absolutely after a wide row: {update!r}")
+            return False
+        print("✓ Rows with wide characters are redrawn from their start")
+
+        return True
+    except Exception as e:
+        print(f"✗ Diff renderer test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_banner_stats():
+    """Test the timing report and instrumentation callbacks."""
+    print("\nTesting banner stats...")
+    try:
+        import contextlib
+        import dataclasses
+        import io
+        import json
+        from hakcer import BannerStats, LatencyHistogram, show_banner
+
+        histogram = LatencyHistogram()
+        for seconds in (0.0001, 0.003, 0.003, 0.004, 2.0):
+            histogram.record(seconds)
+        if histogram.count != 5 or histogram.percentile(0.5) != 0.005 or histogram.percentile(1.0) != 2.0:
+            print(f"✗ Unexpected histogram: {histogram}")
+            return False
+        print("✓ Latency histogram buckets and percentiles")
+
+        events = []
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            stats = show_banner(
+                effect_name="wipe",
+                custom_text="STATS",
+                hold_time=0,
+                theme="neon",
+                mode="animate",
+                color_depth="truecolor",
+                on_start=lambda stats: events.append(("start", stats.effect)),
+                on_frame=lambda index, generate, write: events.append(("frame", index)),
+                on_finish=lambda stats: events.append(("finish", stats.frames)),
+            )
+        frames = [event for event in events if event[0] == "frame"]
+        if (
+            not isinstance(stats, BannerStats)
+            or (stats.effect, stats.theme, stats.mode) != ("wipe", "neon", "animate")
+            or events[0] != ("start", "wipe")
+            or events[-1] != ("finish", stats.frames)
+            or frames != [("frame", index) for index in range(stats.frames)]
+        ):
+            print(f"✗ Callbacks or stats do not line up: {events[:3]}, {events[-1]}")
+            return False
+        if (
+            stats.generate.count != stats.frames
+            or stats.write.count != stats.frames
+            or stats.construction_seconds <= 0
+            or stats.bytes_written > len(output.getvalue().encode())
+            or stats.wall_seconds < stats.construction_seconds
+        ):
+            print(f"✗ Inconsistent stats: {stats}")
+            return False
+        if stats.skipped:
+            print("✗ A banner that played out was reported as skipped")
+            return False
+        json.dumps(dataclasses.asdict(stats))
+        print(f"✓ {stats.frames} frames, {stats.bytes_written} bytes, setup {stats.construction_seconds * 1000:.0f}ms")
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            stats = show_banner(custom_text="STATS", effect_name="wipe", mode="static", color_depth="16")
+        if stats.frames != 1 or stats.bytes_written != len(output.getvalue().encode()):
+            print(f"✗ Static banner stats: {stats}")
+            return False
+        print("✓ Static banners report one frame")
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            # The banner takes far longer than this to generate with decrypt
+            stats = show_banner(effect_name="decrypt", hold_time=0, mode="animate", max_duration=0.1)
+        if not stats.skipped:
+            print(f"✗ Running out of max_duration was not reported as a skip: {stats}")
+            return False
+        print("✓ Skipping to the final frame at the deadline is reported")
+
+        return True
+    except Exception as e:
+        print(f"✗ Banner stats test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_keypress_skip():
+    """Test that a key press or Ctrl-C lands on the final frame and restores the terminal."""
+    print("\nTesting key press skipping...")
+    try:
+        import contextlib
+        import io
+        import os
+        import select
+        import sys
+        import time
+        from hakcer.playback import FrameWriter, play_frames, watch_keypress
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            saved, sys.stdin = sys.stdin, io.StringIO()
+            try:
+                with watch_keypress() as pressed:
+                    if pressed is not None:
+                        print("✗ Watched a stdin that is not a terminal")
+                        return False
+            finally:
+                sys.stdin = saved
+
+        def interrupted():
+            yield "AB\nCD"
+            yield "AX\nCD"
+            raise KeyboardInterrupt
+
+        output = io.StringIO()
+        try:
+            play_frames(interrupted(), frame_rate=0, final="XY\nZW", writer=FrameWriter(output))
+            print("✗ KeyboardInterrupt was swallowed")
+            return False
+        except KeyboardInterrupt:
+            pass
+        if not output.getvalue().endswith("XY\nZW\x1b8\x1b[?25h"):
+            print(f"✗ Ctrl-C did not land on the final frame: {output.getvalue()!r}")
+            return False
+        print("✓ Ctrl-C redraws the final frame and restores the cursor")
+
+        try:
+            import pty
+            import termios  # noqa: F401
+        except ImportError:
+            print("✓ No termios on this platform; key presses are not watched")
+            return True
+
+        code = (
+            "import termios, time\n"
+            "from hakcer.playback import watch_keypress\n"
+            "before = termios.tcgetattr(0)\n"
+            "with watch_keypress() as pressed:\n"
+            "    print('READY', flush=True)\n"
+            "    print('PRESSED', pressed.wait(5), flush=True)\n"
+            "print('RESTORED', termios.tcgetattr(0) == before, flush=True)\n"
+        )
+        pid, fd = pty.fork()
+        if pid == 0:
+            os.execv(sys.executable, [sys.executable, "-c", code])
+        output = b""
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            if select.select([fd], [], [], 0.1)[0]:
+                try:
+                    data = os.read(fd, 1024)
+                except OSError:
+                    break
+                if not data:
+                    break
+                if b"READY" in data:
+                    os.write(fd, b"q")
+                output += data
+        os.waitpid(pid, 0)
+        if b"PRESSED True" not in output or b"RESTORED True" not in output or b"q" in output.split(b"READY")[-1]:
+            print(f"✗ Key press was not caught cleanly: {output!r}")
+            return False
+        print("✓ A key press is caught without echo and the terminal is restored")
+
+        return True
+    except Exception as e:
+        print(f"✗ Key press test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_frame_writer():
+    """Test the one-write-per-frame output path."""
+    print("\nTesting frame writer...")
+    try:
+        import io
+        import tempfile
+        from hakcer.playback import FrameWriter, play_frames
+
+        frames = [f"\x1b[38;2;255;0;0m{char * 60}\x1b[0m\n" * 200 + "end" for char in "abc"]
+        expected = io.StringIO()
+        play_frames(frames, frame_rate=0, writer=FrameWriter(expected))
+
+        with tempfile.TemporaryFile("w+", encoding="utf-8") as f:
+            writer = FrameWriter(f)
+            play_frames(frames, frame_rate=0, writer=writer)
+            f.seek(0)
+            written = f.read()
+        if written != expected.getvalue():
+            print("✗ Descriptor output differs from stream output")
+            return False
+        # Three frames plus the cursor restore, each well over a stream buffer in size
+        if writer.syscalls != 4 or writer.frames != 4:
+            print(f"✗ Expected 4 writes, made {writer.syscalls} for {writer.frames} frames")
+            return False
+        if writer.bytes_written != len(written.encode("utf-8")):
+            print(f"✗ Counted {writer.bytes_written} bytes, wrote {len(written.encode('utf-8'))}")
+            return False
+        print(f"✓ One write per frame ({writer.bytes_written} bytes in {writer.syscalls} writes)")
+
+        return True
+    except Exception as e:
+        print(f"✗ Frame writer test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_adaptive_frame_rate():
+    """Test lowering the frame rate when terminal writes are slow."""
+    print("\nTesting adaptive frame rate...")
+    try:
+        import io
+        import random
+        import time
+        from hakcer import show_banner
+        from hakcer.playback import AdaptiveFrameRate, FrameWriter, play_frames
+        from hakcer.render import DiffRenderer
+
+        class SlowWriter(FrameWriter):
+            """Writer that takes as long as a 20 kB/s link would."""
+
+            def flush(self):
+                size = sum(len(text) for text in self._pending)
+                super().flush()
+                time.sleep(size / 20000)
+
+        rng = random.Random(7)
+        frames = [
+            "\n".join("".join(rng.choice("abcdef") for _ in range(40)) for _ in range(10))
+            for _ in range(100)
+        ]
+        class LastFrameRenderer(DiffRenderer):
+            def render(self, frame):
+                self.last_frame = frame
+                return super().render(frame)
+
+        renderer = LastFrameRenderer()
+        rate = AdaptiveFrameRate()
+        started = time.monotonic()
+        play_frames(frames, renderer=renderer, writer=SlowWriter(io.StringIO()), rate=rate)
+        elapsed = time.monotonic() - started
+        # At 100fps every write would take twice the frame time, about 2s in total
+        if elapsed > 1.5 or rate.fps >= 100:
+            print(f"✗ Took {elapsed:.2f}s at {rate.fps:.0f}fps for a 1s animation")
+            return False
+        if renderer.last_frame != frames[-1]:
+            print("✗ Adaptive playback did not end on the final frame")
+            return False
+        print(f"✓ Slow writes drop the rate to {rate.fps:.0f}fps and keep the length ({elapsed:.2f}s)")
+
+        capped = AdaptiveFrameRate(min_fps=20, max_fps=50)
+        if capped.fps != 50 or capped.max_stride != 5:
+            print(f"✗ Caps not applied: {capped.fps}fps, max stride {capped.max_stride}")
+            return False
+        print("✓ min_fps and max_fps bound the rate")
+
+        for fps in (0, "fast"):
+            try:
+                show_banner(custom_text="FPS", effect_name="wipe", hold_time=0, fps=fps)
+                print(f"✗ Should have raised ValueError for fps={fps!r}")
+                return False
+            except ValueError:
+                pass
+        print("✓ Invalid fps raises ValueError")
+
+        return True
+    except Exception as e:
+        print(f"✗ Adaptive frame rate test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_time_budget():
+    """Test frame decimation for show_banner(max_duration=...)."""
+    print("\nTesting animation time budget...")
+    try:
+        import time
+        from hakcer import show_banner
+        from hakcer.playback import decimate_frames, fit_frames_to_duration
+
+        frames = [str(i) for i in range(1000)]
+        thinned = decimate_frames(frames, 10)
+        if len(thinned) != 10 or thinned[0] != "0" or thinned[-1] != "999":
+            print(f"✗ decimate_frames() returned {thinned}")
+            return False
+        if fit_frames_to_duration(frames, 0) != ["999"]:
+            print("✗ A zero budget should keep only the final frame")
+            return False
+        if len(fit_frames_to_duration(frames, 0.5, frame_rate=100)) != 50:
+            print("✗ fit_frames_to_duration() did not fit the budget")
+            return False
+        print("✓ Frames are thinned out evenly and keep the final frame")
+
+        started = time.monotonic()
+        show_banner(custom_text="BUDGET", effect_name="print", hold_time=0, max_duration=0.5, mode="animate")
+        elapsed = time.monotonic() - started
+        if elapsed > 1.0:
+            print(f"✗ Banner took {elapsed:.2f}s with a 0.5s budget")
+            return False
+        print(f"✓ Banner with a 0.5s budget finished in {elapsed:.2f}s")
+
+        try:
+            show_banner(max_duration=0)
+            print("✗ max_duration=0 should raise ValueError")
+            return False
+        except ValueError:
+            pass
+
+        return True
+    except Exception as e:
+        print(f"✗ Time budget test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_background_banner():
+    """Test start_banner() and its handle."""
+    print("\nTesting background banner...")
+    try:
+        import time
+        from hakcer import start_banner
+
+        handle = start_banner(custom_text="BACKGROUND", effect_name="print", hold_time=30, mode="animate")
+        time.sleep(0.2)
+        if handle.done():
+            print("✗ Banner finished before its hold time")
+            return False
+        started = time.monotonic()
+        if not handle.finish(fast_forward=True, timeout=10) or not handle.done():
+            print("✗ finish() did not end the banner")
+            return False
+        print(f"✓ finish() snapped to the final frame in {time.monotonic() - started:.2f}s")
+
+        handle = start_banner(custom_text="WAIT", effect_name="wipe", hold_time=0, mode="animate")
+        if not handle.wait(timeout=30):
+            print("✗ wait() timed out")
+            return False
+        print("✓ wait() returns once the banner completes")
+
+        try:
+            start_banner(effect_name="nonexistent_effect")
+            print("✗ start_banner() should validate the effect name up front")
+            return False
+        except ValueError:
+            print("✓ start_banner() validates arguments before starting")
+
+        return True
+    except Exception as e:
+        print(f"✗ Background banner test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_async_banner():
+    """Test show_banner_async() and cancellation."""
+    print("\nTesting async banner...")
+    try:
+        import asyncio
+        import time
+        from hakcer import show_banner_async
+
+        async def run_and_cancel():
+            task = asyncio.create_task(
+                show_banner_async(custom_text="ASYNC", effect_name="print", hold_time=30, mode="animate")
+            )
+            ticks = 0
+            while ticks < 20:
+                await asyncio.sleep(0.01)
+                ticks += 1
+            task.cancel()
+            started = time.monotonic()
+            try:
+                await task
+            except asyncio.CancelledError:
+                return time.monotonic() - started
+            return None
+
+        elapsed = asyncio.run(run_and_cancel())
+        if elapsed is None:
+            print("✗ Cancelled banner did not raise CancelledError")
+            return False
+        print(f"✓ Event loop kept running; cancel snapped to the final frame in {elapsed:.2f}s")
+
+        asyncio.run(show_banner_async(custom_text="DONE", effect_name="wipe", hold_time=0, mode="animate"))
+        print("✓ show_banner_async() runs to completion")
+
+        try:
+            asyncio.run(show_banner_async(effect_name="nonexistent_effect"))
+            print("✗ Should have raised ValueError for invalid effect")
+            return False
+        except ValueError:
+            print("✓ show_banner_async() validates the effect name")
+
+        import os
+        from hakcer.playback import play_frames_async
+
+        read_fd, write_fd = os.pipe()
+        saved_stdout = sys.stdout
+        try:
+            sys.stdout = os.fdopen(write_fd, "w", encoding="utf-8", closefd=False)
+            for blocking in (True, False):
+                os.set_blocking(write_fd, blocking)
+                asyncio.run(play_frames_async(["a", "b"], frame_rate=0))
+                if os.get_blocking(write_fd) != blocking:
+                    print(f"✗ stdout blocking flag changed from {blocking}")
+                    return False
+        finally:
+            sys.stdout = saved_stdout
+            os.close(read_fd)
+            os.close(write_fd)
+        print("✓ Async playback restores stdout's original blocking mode")
+
+        return True
+    except Exception as e:
+        print(f"✗ Async banner test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_recording():
+    """Test recording banners to asciicast files and replaying them."""
+    print("\nTesting recordings...")
+    try:
+        import contextlib
+        import io
+        import json
+        import tempfile
+        import time
+        from pathlib import Path
+        from hakcer import play_recording, record_banner
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "banner.cast"
+            length = record_banner(
+                str(path), effect_name="wipe", theme="neon", custom_text="REC", hold_time=0.5,
+                columns=40, rows=10,
+            )
+            lines = path.read_text(encoding="utf-8").splitlines()
+            header = json.loads(lines[0])
+            events = [json.loads(line) for line in lines[1:]]
+            if header["version"] != 2 or (header["width"], header["height"]) != (40, 10):
+                print(f"✗ Unexpected header: {header}")
+                return False
+            times = [event[0] for event in events]
+            if times != sorted(times) or abs(times[-1] - length) > 1e-6 or length < 0.5:
+                print(f"✗ Event times are not a paced stream ending at {length}")
+                return False
+            print(f"✓ Recorded {len(events)} events over {length:.2f}s")
+
+            output = io.StringIO()
+            started = time.monotonic()
+            with contextlib.redirect_stdout(output):
+                play_recording(str(path), speed=4.0)
+            elapsed = time.monotonic() - started
+            if output.getvalue() != "".join(event[2] for event in events):
+                print("✗ Replay output differs from the recorded stream")
+                return False
+            if not length / 4 - 0.05 <= elapsed <= length / 4 + 1.0:
+                print(f"✗ Replay took {elapsed:.2f}s for a {length / 4:.2f}s recording")
+                return False
+            print(f"✓ Replay reproduces the stream with its pacing ({elapsed:.2f}s)")
+
+            path.write_text("not a recording\n")
+            try:
+                play_recording(str(path))
+                print("✗ Should have raised ValueError for a non-asciicast file")
+                return False
+            except ValueError:
+                print("✓ Non-asciicast files raise ValueError")
+
+        return True
+    except Exception as e:
+        print(f"✗ Recording test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def test_bench():
+    """Test the headless benchmark and its reports."""
+    print("\nTesting benchmarks...")
+    try:
+        import csv
+        import json
+        import tempfile
+        from pathlib import Path
+        from hakcer.bench import run_benchmarks, synthetic_art, write_csv, write_json
+
+        results = run_benchmarks(
+            effects=["wipe"], arts={"tiny": synthetic_art(12, 3)}, columns=40, rows=10
+        )
+        result = results[0]
+        if result.frames <= 0 or result.output_bytes <= 0 or not result.peak_memory_bytes:
+            print(f"✗ Benchmark recorded no work: {result}")
+            return False
+        print(f"✓ Benchmarked wipe: {result.frames} frames, {result.output_bytes} bytes")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            write_json(results, str(Path(tmp) / "bench.json"))
+            write_csv(results, str(Path(tmp) / "bench.csv"))
+            report = json.loads((Path(tmp) / "bench.json").read_text())
+            with open(Path(tmp) / "bench.csv", newline="") as f:
+                rows = list(csv.DictReader(f))
+        if report["results"][0]["frames"] != result.frames or rows[0]["effect"] != "wipe":
+            print("✗ Reports do not match the results")
+            return False
+        print("✓ JSON and CSV reports written")
+
+        import contextlib
+        import io
+        from hakcer.bench import main
+
+        for value in ("20", "20x0", "20x5x3"):
+            try:
+                with contextlib.redirect_stderr(io.StringIO()):
+                    main(["--sizes", value])
+                print(f"✗ --sizes {value} was accepted")
+                return False
+            except SystemExit:
+                pass
+        print("✓ --sizes rejects values that are not COLSxROWS")
+
+        return True
+    except Exception as e:
+        print(f"✗ Benchmark test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
 def test_api_functions():
     """Test all API functions."""
     print("\nTesting API functions...")
@@ -159,9 +1468,32 @@ def run_all_tests():
 
     tests = [
         ("Imports", test_imports),
+        ("Lazy Effect Imports", test_lazy_effect_imports),
         ("Themes", test_themes),
         ("Effects", test_effects),
         ("API Functions", test_api_functions),
+        ("Effect Config Cache", test_effect_config_cache),
+        ("Effect Specs", test_effect_specs),
+        ("Cost Model", test_cost_model),
+        ("Static Modes", test_static_modes),
+        ("Render Final", test_render_final),
+        ("Color Depth", test_color_depth),
+        ("Art Cache", test_art_cache),
+        ("Centering", test_centering),
+        ("Art Trimming", test_art_trimming),
+        ("Art Fitting", test_art_fitting),
+        ("Frame Cache", test_frame_cache),
+        ("Pre-render", test_prerender),
+        ("Diff Renderer", test_diff_renderer),
+        ("Frame Writer", test_frame_writer),
+        ("Keypress Skip", test_keypress_skip),
+        ("Banner Stats", test_banner_stats),
+        ("Adaptive Frame Rate", test_adaptive_frame_rate),
+        ("Time Budget", test_time_budget),
+        ("Background Banner", test_background_banner),
+        ("Async Banner", test_async_banner),
+        ("Recordings", test_recording),
+        ("Benchmarks", test_bench),
         ("Banner Display", test_banner_display),
     ]
 